@@ -0,0 +1,140 @@
+"""
+Benchmarks and cross-checks the hand evaluators.
+
+Times every evaluator over all 17,550 four-card combos and over random 2 + 2
+hand/board splits, reports evaluations per second, and fails if any two
+evaluators disagree on any score.
+
+Run from the repository root:
+    python -m benchmarks.evaluate_benchmark [--samples N] [--json results.json]
+"""
+
+import importlib.util
+import json
+import os
+import sys
+import time
+from argparse import ArgumentParser
+from itertools import combinations
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from engine import evaluate as engine_evaluate
+
+SKELETON_EVALUATE_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "python_skeleton", "skeleton", "evaluate.py"
+)
+
+
+def load_skeleton_evaluate():
+    """
+    Imports python_skeleton/skeleton/evaluate.py under its own name, so it cannot
+    shadow or be shadowed by the engine copy.
+    """
+    spec = importlib.util.spec_from_file_location("skeleton_evaluate", SKELETON_EVALUATE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def scalar(evaluate: Callable) -> Callable[[np.ndarray], np.ndarray]:
+    def run(deals: np.ndarray) -> np.ndarray:
+        return np.array([evaluate(deal[:2], deal[2:]) for deal in deals.tolist()])
+
+    return run
+
+
+def batched(evaluate_many: Callable) -> Callable[[np.ndarray], np.ndarray]:
+    def run(deals: np.ndarray) -> np.ndarray:
+        return evaluate_many(deals[:, :2], deals[:, 2:])
+
+    return run
+
+
+def get_evaluators() -> Dict[str, Callable[[np.ndarray], np.ndarray]]:
+    skeleton_evaluate = load_skeleton_evaluate()
+    evaluators = {
+        "engine.evaluate_reference": scalar(engine_evaluate.evaluate_reference),
+        "engine.evaluate": scalar(engine_evaluate.evaluate),
+        "engine.evaluate_many": batched(engine_evaluate.evaluate_many),
+        "skeleton.evaluate": scalar(skeleton_evaluate.evaluate),
+    }
+    # older skeleton copies only have the predicate evaluator
+    if hasattr(skeleton_evaluate, "evaluate_reference"):
+        evaluators["skeleton.evaluate_reference"] = scalar(skeleton_evaluate.evaluate_reference)
+    if hasattr(skeleton_evaluate, "evaluate_many"):
+        evaluators["skeleton.evaluate_many"] = batched(skeleton_evaluate.evaluate_many)
+    return evaluators
+
+
+def get_workloads(samples: int, seed: int) -> Dict[str, np.ndarray]:
+    all_combos = np.array(list(combinations(range(engine_evaluate.NUM_CARDS), 4)))
+    rng = np.random.default_rng(seed)
+    random_splits = np.array(
+        [rng.choice(engine_evaluate.NUM_CARDS, 4, replace=False) for _ in range(samples)]
+    )
+    return {"all 4-card combos": all_combos, "random 2+2 splits": random_splits}
+
+
+def run_benchmark(samples: int, seed: int, repeat: int) -> List[dict]:
+    """
+    Times each evaluator on each workload (best of `repeat` runs) and cross-checks
+    every evaluator's scores against the first one's.
+
+    Returns:
+        List[dict]: One result per (workload, evaluator) pair.
+    """
+    evaluators = get_evaluators()
+    results = []
+    for workload, deals in get_workloads(samples, seed).items():
+        expected = None
+        for name, evaluator in evaluators.items():
+            best = float("inf")
+            for _ in range(repeat):
+                start = time.perf_counter()
+                scores = evaluator(deals)
+                best = min(best, time.perf_counter() - start)
+            if expected is None:
+                expected = scores
+            mismatches = int(np.count_nonzero(scores != expected))
+            results.append({
+                "workload": workload,
+                "evaluator": name,
+                "evaluations": len(deals),
+                "seconds": best,
+                "evals_per_sec": len(deals) / best,
+                "mismatches": mismatches,
+            })
+    return results
+
+
+def print_results(results: List[dict]) -> None:
+    workload = None
+    for result in results:
+        if result["workload"] != workload:
+            workload = result["workload"]
+            print(f"\n{workload} ({result['evaluations']} evaluations)")
+        status = "ok" if result["mismatches"] == 0 else f"{result['mismatches']} MISMATCHES"
+        print(f"  {result['evaluator']:<30} {result['evals_per_sec']:>14,.0f} evals/sec  {status}")
+
+
+def parse_args():
+    parser = ArgumentParser()
+    parser.add_argument("--samples", type=int, default=100000, help="Random 2+2 splits to evaluate")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the random splits")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per evaluator (best is kept)")
+    parser.add_argument("--json", help="Also write the results to this file")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    results = run_benchmark(args.samples, args.seed, args.repeat)
+    print_results(results)
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(results, file, indent=2)
+    if any(result["mismatches"] for result in results):
+        print("\nEvaluators disagree.")
+        sys.exit(1)
@@ -0,0 +1,178 @@
+"""
+asyncio variant of the engine's client, on a grpc.aio channel.
+
+AsyncClient keeps Client's state, game clock, latency accounting and message
+conversion, but its RPCs are coroutines, so AsyncGame can wait on both bots at
+once. Create clients inside the running event loop and await connect() first.
+"""
+
+import asyncio
+import time
+from typing import Deque, List, Optional, Tuple
+
+import grpc
+import grpc.aio
+
+from .actions import Action
+from .client import (
+    Client,
+    MatchStreamError,
+    MessageCall,
+    channel_options,
+)
+from .config import CONNECT_RETRIES, CONNECT_TIMEOUT, END_ROUND_TIMEOUT, ENFORCE_GAME_CLOCK
+from shared.pokerbot_pb2 import (
+    ActionRequest,
+    ActionResponse,
+    BotMessage,
+    EngineMessage,
+    ReadyCheckRequest,
+)
+from shared.pokerbot_pb2_grpc import PokerBotStub
+
+
+class CallMetadata:
+    """
+    The metadata of a finished grpc.aio call, readable like a grpc.Call's.
+    """
+
+    def __init__(self, initial_metadata, trailing_metadata) -> None:
+        self._initial_metadata = initial_metadata
+        self._trailing_metadata = trailing_metadata
+
+    def initial_metadata(self):
+        return self._initial_metadata
+
+    def trailing_metadata(self):
+        return self._trailing_metadata
+
+
+class AsyncClient(Client):
+    """
+    A Client whose RPCs are coroutines.
+    """
+
+    def _connect_with_retries(self) -> None:
+        self.channel = grpc.aio.insecure_channel(self.service_dns_name, options=channel_options())
+        self.stub = PokerBotStub(self.channel)
+
+    async def connect(self) -> None:
+        """
+        Waits until the channel to the pokerbot is ready, giving each of
+        CONNECT_RETRIES attempts CONNECT_TIMEOUT seconds.
+        """
+        for _ in range(CONNECT_RETRIES):
+            try:
+                await asyncio.wait_for(self.channel.channel_ready(), CONNECT_TIMEOUT)
+                print(f"Connected to {self.service_dns_name}")
+                return
+            except asyncio.TimeoutError:
+                pass
+        raise RuntimeError(
+            f"Failed to connect to {self.service_dns_name}: not ready after "
+            f"{CONNECT_RETRIES} attempts of {CONNECT_TIMEOUT}s"
+        )
+
+    async def close(self) -> None:
+        """
+        Ends the match stream, if open, and closes the channel.
+        """
+        if self._stream is not None:
+            await self._stream.done_writing()
+            self._stream = None
+        await self.channel.close()
+
+    async def check_ready(self, player_names: List[str]) -> bool:
+        request = ReadyCheckRequest(player_names=player_names)
+        try:
+            return (await self.stub.ReadyCheck(request, timeout=CONNECT_TIMEOUT)).ready
+        except grpc.RpcError as e:
+            print(f"Bot {self.name} is not ready: {e}")
+            return False
+
+    async def request_action(
+        self, player_hand: List[int], board_cards: List[int], new_actions: Deque[Action]
+    ) -> Optional[Action]:
+        """
+        Requests an action from the pokerbot, as Client.request_action does.
+        """
+        request = self._make_action_request(player_hand, board_cards, new_actions)
+        start_time = time.perf_counter()
+
+        try:
+            action, retries = self._read_action_response(*await self._send_action_request(request))
+        except grpc.RpcError as e:
+            action, retries = self._action_request_failed(e), 0
+
+        return self._charge_action_request(board_cards, action, start_time, retries)
+
+    async def _send_action_request(self, request: ActionRequest) -> Tuple[ActionResponse, CallMetadata]:
+        # the bot can never take longer than its remaining game clock
+        timeout = max(self.game_clock, 0.0) if ENFORCE_GAME_CLOCK else None
+        if self.streaming:
+            reply = await self._exchange(EngineMessage(action_request=request), "action_response", timeout)
+            if reply is not None:
+                return reply.action_response, MessageCall(reply.bot_time_us / 1e6)
+        call = self.stub.RequestAction(request, timeout=timeout)
+        response = await call
+        return response, CallMetadata(await call.initial_metadata(), await call.trailing_metadata())
+
+    async def _exchange(
+        self, message: EngineMessage, reply_field: str, timeout: Optional[float]
+    ) -> Optional[BotMessage]:
+        """
+        Sends a message over the match stream and waits for the reply, as Client._exchange does.
+        """
+        if self._stream is None:
+            self._stream = self.stub.PlayMatch()
+        try:
+            await self._stream.write(message)
+            reply = await asyncio.wait_for(self._stream.read(), timeout)
+        except asyncio.TimeoutError:
+            reply = MatchStreamError("Deadline exceeded on the match stream", grpc.StatusCode.DEADLINE_EXCEEDED)
+        except grpc.RpcError as e:
+            code = e.code() if hasattr(e, "code") else grpc.StatusCode.UNKNOWN
+            reply = MatchStreamError(f"Match stream failed: {e}", code)
+        if reply is grpc.aio.EOF:
+            reply = MatchStreamError("The bot closed the match stream", grpc.StatusCode.UNAVAILABLE)
+        if isinstance(reply, BotMessage) and reply.WhichOneof("message") != reply_field:
+            reply = MatchStreamError(f"Expected {reply_field} on the match stream", grpc.StatusCode.INTERNAL)
+        if isinstance(reply, BotMessage):
+            return reply
+        self.streaming = False
+        self._stream.cancel()
+        self._stream = None
+        if reply.code() == grpc.StatusCode.UNIMPLEMENTED:
+            print(f"Bot {self.name} does not support PlayMatch, using unary RPCs")
+            return None
+        raise reply
+
+    async def end_round(
+        self,
+        player_hand: List[int],
+        opponent_hand: List[int],
+        board_cards: List[int],
+        new_actions: Deque[Action],
+        delta: int,
+        is_match_over: bool,
+    ) -> None:
+        """
+        Signals the end of a round to the pokerbot, as Client.end_round does.
+        """
+        end_round_message = self._make_end_round_message(
+            player_hand, opponent_hand, board_cards, new_actions, delta, is_match_over
+        )
+
+        try:
+            reply = None
+            if self.streaming:
+                reply = await self._exchange(
+                    EngineMessage(end_round=end_round_message), "end_round_response", END_ROUND_TIMEOUT
+                )
+            if reply is not None:
+                response = reply.end_round_response
+            else:
+                response = await self.stub.EndRound(end_round_message, timeout=END_ROUND_TIMEOUT)
+            self._store_logs(response)
+        except grpc.RpcError as e:
+            print(f"An error occurred: {e}")
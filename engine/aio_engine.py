@@ -0,0 +1,108 @@
+"""
+asyncio game loop, for AsyncClients.
+
+AsyncGame plays exactly the same match as Game, but does not wait for EndRound
+replies at the end of a round. Both bots' EndRound calls run concurrently with
+each other and with the next round, and a bot's pending EndRound is only awaited
+right before the engine next needs that bot.
+"""
+
+import asyncio
+from typing import Dict
+
+from .actions import FoldAction, TerminalState
+from .aio_client import AsyncClient
+from .client import Client
+from .config import NUM_ROUNDS, PLAYER_1_DNS, PLAYER_1_NAME, PLAYER_2_DNS, PLAYER_2_NAME
+from .engine import Game
+
+
+class AsyncGame(Game):
+    """
+    A Game whose players are AsyncClients. Run it with asyncio.run(game.run_match()).
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.pending_end_rounds: Dict[Client, asyncio.Future] = {}
+
+    async def _end_round_done(self, player: AsyncClient) -> None:
+        """
+        Waits for the player's last EndRound call, if it is still running.
+        """
+        pending = self.pending_end_rounds.pop(player, None)
+        if pending is not None:
+            start = self.profiler.start()
+            await pending
+            self.profiler.stop("end_round", start)
+
+    async def run_round(self, last_round: bool) -> None:
+        """
+        Runs one round of poker (1 hand), leaving the EndRound calls running.
+        """
+        profiler = self.profiler
+        round_state, hands = self._deal_round()
+
+        while not isinstance(round_state, TerminalState):
+            active, player = self._next_player(round_state)
+
+            if player.game_clock <= 0:
+                self.log.append(f"{player.name} ran out of time.")
+                action = FoldAction()
+            else:
+                # the bot must hear how the last round ended before it acts again
+                await self._end_round_done(player)
+                start = profiler.start()
+                try:
+                    action = await player.request_action(
+                        hands[active], round_state.board, self.new_actions[active]
+                    )
+                except Exception as e:
+                    action = self._action_failed(player, e)
+                profiler.stop_request(start, player.last_bot_time)
+
+            round_state = self._apply_action(round_state, active, player, action)
+
+        board = round_state.previous_state.board
+        for index, player in enumerate(self.players):
+            await self._end_round_done(player)
+            self.pending_end_rounds[player] = asyncio.ensure_future(
+                player.end_round(
+                    hands[index],
+                    hands[1 - index],
+                    board,
+                    self.new_actions[index],
+                    round_state.deltas[index],
+                    last_round,
+                )
+            )
+        self._record_round(round_state, hands)
+
+    async def run_match(self) -> None:
+        """
+        Runs one match of poker.
+        """
+        print("Starting the Poker Game...")
+        if not self.players:
+            self.players = [
+                AsyncClient(PLAYER_1_NAME, PLAYER_1_DNS),
+                AsyncClient(PLAYER_2_NAME, PLAYER_2_DNS),
+            ]
+        await asyncio.gather(*(player.connect() for player in self.players))
+        player_names = self._prepare_match()
+
+        print("Checking ready...")
+        ready = list(await asyncio.gather(*(player.check_ready(player_names) for player in self.players)))
+        if not all(ready):
+            self._forfeit(ready, player_names)
+        else:
+            stopper = self._start_match()
+            for self.round_num in range(1, NUM_ROUNDS + 1):
+                self._start_round()
+                await self.run_round((self.round_num == self.last_round))
+                if self._end_round(stopper):
+                    break
+            await asyncio.gather(*(self._end_round_done(player) for player in self.players))
+
+        await asyncio.gather(*(player.close() for player in self.players))
+        self._finish_match()
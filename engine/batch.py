@@ -0,0 +1,203 @@
+"""
+Struct-of-arrays version of the RoundState state machine, for simulating many
+independent hands at once.
+
+Every field is a NumPy array with one row per hand, and step() applies one action
+to every live hand with the same transitions as RoundState.proceed. Hands that
+have already ended are masked out and keep their deltas.
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .actions import CALL, CALL_BIT, CHECK, CHECK_BIT, FOLD, FOLD_BIT, RAISE, RAISE_BIT
+from .config import BIG_BLIND, SMALL_BLIND, STARTING_STACK
+from .equity import all_in_equity
+from .evaluate import NUM_CARDS, evaluate_many
+
+
+class BatchRoundState:
+    """
+    N hands of poker advanced in lockstep.
+
+    Attributes:
+        button (np.ndarray): (N,) actions taken this street, as in RoundState.button.
+        street (np.ndarray): (N,) street of each hand.
+        pips (np.ndarray): (N, 2) chips each player has put in this street.
+        stacks (np.ndarray): (N, 2) chips each player has left.
+        hands (np.ndarray): (N, 2, 2) hole cards of both players.
+        runout (np.ndarray): (N, 2) board cards, in the order they are revealed.
+        num_board (np.ndarray): (N,) number of runout cards on the board.
+        deltas (np.ndarray): (N, 2) payoffs, filled in once a hand is terminal.
+        terminal (np.ndarray): (N,) whether each hand has ended.
+    """
+
+    def __init__(self, hands: np.ndarray, runout: np.ndarray) -> None:
+        """
+        Starts N hands with the blinds posted.
+
+        Args:
+            hands (np.ndarray): (N, 2, 2) hole cards of both players.
+            runout (np.ndarray): (N, 2) board cards, in the order they are revealed.
+        """
+        self.hands = np.asarray(hands, dtype=np.intp)
+        self.runout = np.asarray(runout, dtype=np.intp)
+        n = len(self.hands)
+        self.button = np.zeros(n, dtype=np.int32)
+        self.street = np.zeros(n, dtype=np.int32)
+        self.pips = np.tile(np.array([SMALL_BLIND, BIG_BLIND], dtype=np.int32), (n, 1))
+        self.stacks = STARTING_STACK - self.pips
+        self.num_board = np.zeros(n, dtype=np.int32)
+        self.deltas = np.zeros((n, 2), dtype=np.int32)
+        self.terminal = np.zeros(n, dtype=bool)
+        self._rows = np.arange(n)
+
+    @classmethod
+    def from_orders(cls, orders: np.ndarray) -> "BatchRoundState":
+        """
+        Deals each hand from a deck order (e.g. a deal_stream row), exactly as
+        Game.run_round deals from ShortDeck.
+        """
+        orders = np.asarray(orders)
+        # ShortDeck.deal takes cards from the end of the order
+        cards = orders[:, ::-1][:, :6]
+        return cls(cards[:, :4].reshape(-1, 2, 2), cards[:, 4:])
+
+    @classmethod
+    def deal(cls, n: int, rng: Optional[np.random.Generator] = None) -> "BatchRoundState":
+        """
+        Deals n hands from independently shuffled decks.
+        """
+        rng = np.random.default_rng() if rng is None else rng
+        cards = np.argsort(rng.random((n, NUM_CARDS)), axis=1)[:, :6]
+        return cls(cards[:, :4].reshape(-1, 2, 2), cards[:, 4:])
+
+    def __len__(self) -> int:
+        return len(self.button)
+
+    @property
+    def active(self) -> np.ndarray:
+        return self.button % 2
+
+    def is_done(self) -> bool:
+        return bool(self.terminal.all())
+
+    def _continue_cost(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        active = self.active
+        my_pip = self.pips[self._rows, active]
+        return active, my_pip, self.pips[self._rows, 1 - active] - my_pip
+
+    def legal_masks(self) -> np.ndarray:
+        """
+        Returns each hand's legal moves as a bitmask of FOLD_BIT, CALL_BIT, CHECK_BIT
+        and RAISE_BIT (0 for terminal hands).
+        """
+        active, _, continue_cost = self._continue_cost()
+        my_stack = self.stacks[self._rows, active]
+        opp_stack = self.stacks[self._rows, 1 - active]
+        bets_forbidden = (self.stacks == 0).any(axis=1)
+        raises_forbidden = (continue_cost >= my_stack) | (opp_stack == 0)
+        masks = np.where(
+            continue_cost == 0,
+            np.where(bets_forbidden, CHECK_BIT, CHECK_BIT | RAISE_BIT),
+            np.where(raises_forbidden, FOLD_BIT | CALL_BIT, FOLD_BIT | CALL_BIT | RAISE_BIT),
+        )
+        return np.where(self.terminal, 0, masks)
+
+    def raise_bounds(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the minimum and maximum legal raise of each hand.
+        """
+        active, my_pip, continue_cost = self._continue_cost()
+        max_contribution = np.minimum(
+            self.stacks[self._rows, active], self.stacks[self._rows, 1 - active] + continue_cost
+        )
+        min_contribution = np.minimum(
+            max_contribution, continue_cost + np.maximum(continue_cost, BIG_BLIND)
+        )
+        return my_pip + min_contribution, my_pip + max_contribution
+
+    def step(self, actions: np.ndarray, amounts: Optional[np.ndarray] = None) -> None:
+        """
+        Applies one action to every live hand. Actions must be legal (see legal_masks
+        and raise_bounds); entries for terminal hands are ignored.
+
+        Args:
+            actions (np.ndarray): (N,) action kinds (FOLD, CALL, CHECK or RAISE).
+            amounts (np.ndarray, optional): (N,) raise-to amounts, read where actions == RAISE.
+        """
+        actions = np.asarray(actions)
+        live = ~self.terminal
+        active, my_pip, continue_cost = self._continue_cost()
+        call = live & (actions == CALL)
+        check = live & (actions == CHECK)
+        sb_call = np.flatnonzero(call & (self.button == 0))  # sb calls bb preflop
+        call = np.flatnonzero(call & (self.button > 0))
+        both_acted = ((self.street == 0) & (self.button > 0)) | (self.button > 1)
+        next_street = np.union1d(call, np.flatnonzero(check & both_acted))
+        raise_ = np.flatnonzero(live & (actions == RAISE))
+        fold = np.flatnonzero(live & (actions == FOLD))
+
+        if len(fold):
+            delta = np.where(
+                active[fold] == 0,
+                self.stacks[fold, 0] - STARTING_STACK,
+                STARTING_STACK - self.stacks[fold, 1],
+            )
+            self._finish(fold, delta)
+
+        self.pips[sb_call] = BIG_BLIND
+        self.stacks[sb_call] = STARTING_STACK - BIG_BLIND
+        self.button[sb_call] = 1
+
+        self._contribute(call, active[call], continue_cost[call])
+        self.button[check & ~both_acted] += 1
+        if len(raise_):
+            self._contribute(raise_, active[raise_], np.asarray(amounts)[raise_] - my_pip[raise_])
+
+        self._proceed_street(next_street)
+
+    def _contribute(self, rows: np.ndarray, active: np.ndarray, contribution: np.ndarray) -> None:
+        self.stacks[rows, active] -= contribution
+        self.pips[rows, active] += contribution
+        self.button[rows] += 1
+
+    def _proceed_street(self, rows: np.ndarray) -> None:
+        showdown = (self.street[rows] >= 2) | (self.stacks[rows].sum(axis=1) == 0)
+        self._showdown(rows[showdown])
+        rows = rows[~showdown]
+        self.street[rows] += 1
+        self.num_board[rows] += 1
+        self.button[rows] = 1
+        self.pips[rows] = 0
+
+    def _showdown(self, rows: np.ndarray) -> None:
+        if not len(rows):
+            return
+        stacks = self.stacks[rows]
+        delta = np.empty(len(rows), dtype=np.int32)
+
+        full = self.num_board[rows] == 2
+        full_rows = rows[full]
+        score0 = evaluate_many(self.hands[full_rows, 0], self.runout[full_rows])
+        score1 = evaluate_many(self.hands[full_rows, 1], self.runout[full_rows])
+        delta[full] = np.select(
+            [score0 > score1, score0 < score1],
+            [STARTING_STACK - stacks[full, 1], stacks[full, 0] - STARTING_STACK],
+            (stacks[full, 0] - stacks[full, 1]) // 2,  # split the pot
+        )
+
+        # equity chop when the players went all-in before the board was complete
+        for i in np.flatnonzero(~full):
+            row = rows[i]
+            board = self.runout[row, : self.num_board[row]].tolist()
+            p0Eq, comb = all_in_equity(self.hands[row, 0].tolist(), self.hands[row, 1].tolist(), board)
+            delta[i] = round(2 * STARTING_STACK * p0Eq / comb) - STARTING_STACK
+
+        self._finish(rows, delta)
+
+    def _finish(self, rows: np.ndarray, delta: np.ndarray) -> None:
+        self.deltas[rows, 0] = delta
+        self.deltas[rows, 1] = -delta
+        self.terminal[rows] = True
@@ -2,9 +2,12 @@ from collections import deque
 import json
 import grpc
 import os
+import queue
 import sys
+import threading
 import time
-from typing import Deque, List, Optional
+import zlib
+from typing import Deque, List, Optional, Tuple
 
 from .actions import Action, CallAction, CheckAction, FoldAction, RaiseAction
 from .config import (
@@ -14,10 +17,14 @@ from .config import (
     READY_CHECK_RETRIES,
     ACTION_REQUEST_TIMEOUT,
     ACTION_REQUEST_RETRIES,
+    END_ROUND_TIMEOUT,
     ENFORCE_GAME_CLOCK,
     STARTING_GAME_CLOCK,
     PLAYER_LOG_SIZE_LIMIT,
+    PLAY_MATCH_STREAMING,
 )
+from .evaluate import cards_to_str
+from .latency import LatencyStats
 
 shared_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "shared"))
 sys.path.append(shared_path)
@@ -26,11 +33,121 @@ from shared.pokerbot_pb2_grpc import PokerBotStub  # noqa: E402
 from shared.pokerbot_pb2 import (  # noqa: E402
     ReadyCheckRequest,
     ActionRequest,
+    ActionResponse,
     EndRoundMessage,
+    EndRoundResponse,
     ActionType,
     Action as ProtoAction,
+    BotMessage,
+    EngineMessage,
 )
 
+_ACTION_NAMES = {FoldAction: "Fold", CallAction: "Call", CheckAction: "Check", RaiseAction: "Raise"}
+
+
+# Trailing metadata in which the skeleton's Runner reports how long it spent on a request
+BOT_TIME_METADATA_KEY = "bot-time-us"
+# Trailing metadata in which the skeleton's Runner echoes how many times a request was retried
+PREVIOUS_ATTEMPTS_METADATA_KEY = "previous-rpc-attempts"
+
+LOG_LIMIT_MESSAGE = "Log size limit reached. No further entries will be added."
+
+
+def _retry_policy(max_attempts: int, backoff: float) -> dict:
+    return {
+        "maxAttempts": max_attempts,
+        "initialBackoff": f"{max(backoff, 0.001):g}s",
+        "maxBackoff": f"{max(backoff, 0.001):g}s",
+        "backoffMultiplier": 1,
+        "retryableStatusCodes": ["UNAVAILABLE"],
+    }
+
+
+def _service_config() -> dict:
+    """
+    Returns the service config of a pokerbot channel, with one retry policy per method.
+    gRPC only accepts policies of at least two attempts, so methods configured with a
+    single attempt are not retried. EndRound is never retried, as a bot could see the
+    same round end twice.
+    """
+    method_configs = []
+    for method, attempts, backoff in [
+        ("ReadyCheck", READY_CHECK_RETRIES, READY_CHECK_TIMEOUT),
+        ("RequestAction", ACTION_REQUEST_RETRIES, ACTION_REQUEST_TIMEOUT),
+    ]:
+        if attempts > 1:
+            method_configs.append(
+                {
+                    "name": [{"service": "poker.PokerBot", "method": method}],
+                    "retryPolicy": _retry_policy(attempts, backoff),
+                }
+            )
+    return {"methodConfig": method_configs}
+
+
+class MessageCall:
+    """
+    Stands in for the grpc.Call of a request answered without an RPC of its own, over
+    the match stream or in process, with the bot's time as trailing metadata.
+    """
+
+    def __init__(self, bot_time: float) -> None:
+        self.bot_time = bot_time
+
+    def initial_metadata(self):
+        return ()
+
+    def trailing_metadata(self):
+        return ((BOT_TIME_METADATA_KEY, str(int(self.bot_time * 1e6))),)
+
+
+class MatchStreamError(grpc.RpcError):
+    """
+    The match stream failed, or a reply on it missed its deadline.
+    """
+
+    def __init__(self, message: str, code: grpc.StatusCode) -> None:
+        super().__init__(message)
+        self._code = code
+
+    def code(self) -> grpc.StatusCode:
+        return self._code
+
+
+def channel_options() -> List[Tuple[str, object]]:
+    """
+    Returns the options of a pokerbot channel.
+    """
+    return [
+        ("grpc.enable_retries", 1),
+        ("grpc.max_receive_message_length", -1),
+        ("grpc.max_send_message_length", -1),
+        ("grpc.lb_policy_name", "round_robin"),
+        ("grpc.service_config", json.dumps(_service_config())),
+    ]
+
+
+def _previous_attempts(call: grpc.Call) -> int:
+    """
+    Returns how many attempts gRPC made before the one that completed a call. gRPC only
+    tells the server, in the grpc-previous-rpc-attempts request header, so this relies
+    on the bot echoing it back in trailing metadata; bots that do not count as 0.
+    """
+    for key, value in call.trailing_metadata() or ():
+        if key == PREVIOUS_ATTEMPTS_METADATA_KEY:
+            return int(value)
+    return 0
+
+
+def _bot_time(call: grpc.Call) -> Optional[float]:
+    """
+    Returns the time in seconds the pokerbot reported spending on a call, if it did.
+    """
+    for key, value in call.trailing_metadata() or ():
+        if key == BOT_TIME_METADATA_KEY:
+            return int(value) / 1e6
+    return None
+
 
 class Client:
     """
@@ -58,38 +175,41 @@ class Client:
         self.stub = None
         self.log = deque()
         self.log_size = 0
+        self.latency = LatencyStats()
+        self.last_bot_time: Optional[float] = None
+        self.streaming = PLAY_MATCH_STREAMING
+        self._stream = None
+        self._stream_requests: Optional[queue.SimpleQueue] = None
+        self._stream_replies: Optional[queue.SimpleQueue] = None
 
         self._connect_with_retries()
 
     def _connect_with_retries(self) -> None:
         """
         Establishes a connection to the gRPC server with retries.
+
+        Waits up to CONNECT_TIMEOUT seconds for the channel to become ready, up to
+        CONNECT_RETRIES times, before giving up. The channel is kept for the whole
+        match and every RPC goes through it. Its service config gives each method
+        its own retry policy.
         """
-        retry_options = {
-            "initial_backoff_ms": CONNECT_TIMEOUT * 1000,
-            "max_backoff_ms": CONNECT_TIMEOUT * 1000,
-            "max_attempts": CONNECT_RETRIES,
-            "retry_codes": [grpc.StatusCode.UNAVAILABLE.value],
-        }
-        channel_options = [
-            ("grpc.enable_retries", 1),
-            ("grpc.max_receive_message_length", -1),
-            ("grpc.max_send_message_length", -1),
-            ("grpc.lb_policy_name", "round_robin"),
-            ("grpc.service_config", json.dumps({"retryPolicy": retry_options})),
-        ]
         self.channel = grpc.insecure_channel(
-            self.service_dns_name, options=channel_options
+            self.service_dns_name, options=channel_options()
         )
         self.stub = PokerBotStub(self.channel)
 
-        try:
-            grpc.channel_ready_future(self.channel).result()
-            print(f"Connected to {self.service_dns_name}")
-        except grpc.FutureTimeoutError:
-            raise RuntimeError(
-                f"Failed to connect to {self.service_dns_name} after {CONNECT_RETRIES} attempts"
-            )
+        for _ in range(CONNECT_RETRIES):
+            ready = grpc.channel_ready_future(self.channel)
+            try:
+                ready.result(timeout=CONNECT_TIMEOUT)
+                print(f"Connected to {self.service_dns_name}")
+                return
+            except grpc.FutureTimeoutError:
+                ready.cancel()
+        raise RuntimeError(
+            f"Failed to connect to {self.service_dns_name}: not ready after "
+            f"{CONNECT_RETRIES} attempts of {CONNECT_TIMEOUT}s"
+        )
 
     def check_ready(self, player_names: List[str]) -> bool:
         """
@@ -101,96 +221,184 @@ class Client:
         Returns:
             bool: True if the bot is ready, False otherwise.
         """
-        retry_options = {
-            "initial_backoff_ms": READY_CHECK_TIMEOUT * 1000,
-            "max_backoff_ms": READY_CHECK_TIMEOUT * 1000,
-            "max_attempts": READY_CHECK_RETRIES,
-            "retry_codes": [grpc.StatusCode.UNAVAILABLE.value],
-        }
-        channel_options = [
-            ("grpc.enable_retries", 1),
-            ("grpc.max_receive_message_length", -1),
-            ("grpc.max_send_message_length", -1),
-            ("grpc.lb_policy_name", "round_robin"),
-            ("grpc.service_config", json.dumps({"retryPolicy": retry_options})),
-        ]
-        with grpc.insecure_channel(
-            self.service_dns_name, options=channel_options
-        ) as channel:
-            stub = PokerBotStub(channel)
-            request = ReadyCheckRequest(player_names=player_names)
-            try:
-                response = stub.ReadyCheck(request)
-                return response.ready
-            except grpc.RpcError as e:
-                print(f"Bot {self.name} is not ready: {e}")
-                return False
+        request = ReadyCheckRequest(player_names=player_names)
+        try:
+            return self.stub.ReadyCheck(request, timeout=CONNECT_TIMEOUT).ready
+        except grpc.RpcError as e:
+            print(f"Bot {self.name} is not ready: {e}")
+            return False
 
     def request_action(
-        self, player_hand: List[str], board_cards: List[str], new_actions: Deque[Action]
+        self, player_hand: List[int], board_cards: List[int], new_actions: Deque[Action]
     ) -> Optional[Action]:
         """
         Requests an action from the pokerbot based on the current game state, including the player's hand,
         visible board cards, and new actions.
 
         Args:
-            player_hand (List[str]): The cards currently held by the player.
-            board_cards (List[str]): The cards visible on the board.
+            player_hand (List[int]): The cards currently held by the player.
+            board_cards (List[int]): The cards visible on the board.
             new_actions (Deque[Action]): A deque of actions taken since the last request.
 
         Returns:
             Optional[Action]: The action decided by the pokerbot, or None if an error occurred.
         """
-        retry_options = {
-            "initial_backoff_ms": ACTION_REQUEST_TIMEOUT * 1000,
-            "max_backoff_ms": ACTION_REQUEST_TIMEOUT * 1000,
-            "max_attempts": ACTION_REQUEST_RETRIES,
-            "retry_codes": [grpc.StatusCode.UNAVAILABLE.value],
-        }
-        channel_options = [
-            ("grpc.enable_retries", 1),
-            ("grpc.max_receive_message_length", -1),
-            ("grpc.max_send_message_length", -1),
-            ("grpc.lb_policy_name", "round_robin"),
-            ("grpc.service_config", json.dumps({"retryPolicy": retry_options})),
-        ]
-        with grpc.insecure_channel(
-            self.service_dns_name, options=channel_options
-        ) as channel:
-            stub = PokerBotStub(channel)
-            proto_actions = self._convert_actions_to_proto(new_actions)
-
-            request = ActionRequest(
-                game_clock=self.game_clock,
-                player_hand=player_hand,
-                board_cards=board_cards,
-                new_actions=proto_actions,
-            )
+        request = self._make_action_request(player_hand, board_cards, new_actions)
+        start_time = time.perf_counter()
 
-            start_time = time.perf_counter()
+        try:
+            action, retries = self._read_action_response(*self._send_action_request(request))
+        except grpc.RpcError as e:
+            action, retries = self._action_request_failed(e), 0
+
+        return self._charge_action_request(board_cards, action, start_time, retries)
+
+    def _make_action_request(
+        self, player_hand: List[int], board_cards: List[int], new_actions: Deque[Action]
+    ) -> ActionRequest:
+        return ActionRequest(
+            game_clock=self.game_clock,
+            player_hand=cards_to_str(player_hand),
+            board_cards=cards_to_str(board_cards),
+            new_actions=self._convert_actions_to_proto(new_actions),
+        )
 
-            try:
-                response = stub.RequestAction(request)
-                action = self._convert_proto_to_action(response.action)
-            except grpc.RpcError as e:
-                print(f"An error occurred: {e}")
-                action = None
+    def _read_action_response(self, response: ActionResponse, call: grpc.Call) -> Tuple[Optional[Action], int]:
+        """
+        Returns the action in a response and how many times its request was retried,
+        and notes how long the bot reported spending on it.
+        """
+        self.last_bot_time = _bot_time(call)
+        return self._convert_proto_to_action(response.action), _previous_attempts(call)
 
-            end_time = time.perf_counter()
-            duration = end_time - start_time
+    def _action_request_failed(self, error: grpc.RpcError) -> Optional[Action]:
+        """
+        Records a failed action request. A missed deadline is not an error: the deadline
+        is the bot's remaining game clock, so _charge_action_request records the timeout.
+
+        Returns:
+            Optional[Action]: None, as the bot gave no action.
+        """
+        print(f"An error occurred: {error}")
+        self.last_bot_time = None
+        if not (hasattr(error, "code") and error.code() == grpc.StatusCode.DEADLINE_EXCEEDED):
+            self.latency.record_error()
+        return None
+
+    def _charge_action_request(
+        self, board_cards: List[int], action: Optional[Action], start_time: float, retries: int
+    ) -> Optional[Action]:
+        """
+        Records the latency of an action request and charges it to the game clock.
+
+        Returns:
+            Optional[Action]: The action, passed through.
+
+        Raises:
+            TimeoutError: If the game clock has run out.
+        """
+        duration = time.perf_counter() - start_time
+        self.latency.record(len(board_cards), _ACTION_NAMES.get(type(action), "Error"), duration, retries)
+
+        if ENFORCE_GAME_CLOCK:
+            self.game_clock -= duration
+        if self.game_clock <= 0:
+            self.latency.record_timeout()
+            raise TimeoutError("Game clock has run out")
+
+        return action
+
+    def _send_action_request(self, request: ActionRequest) -> Tuple[ActionResponse, grpc.Call]:
+        """
+        Sends an action request to the pokerbot.
+
+        Args:
+            request (ActionRequest): The request to send.
 
-            if ENFORCE_GAME_CLOCK:
-                self.game_clock -= duration
-            if self.game_clock <= 0:
-                raise TimeoutError("Game clock has run out")
+        Returns:
+            Tuple[ActionResponse, grpc.Call]: The pokerbot's response and the call, whose
+            metadata reports retries and the bot's own time.
 
-            return action
+        Raises:
+            grpc.RpcError: If the request fails.
+        """
+        # the bot can never take longer than its remaining game clock
+        timeout = max(self.game_clock, 0.0) if ENFORCE_GAME_CLOCK else None
+        if self.streaming:
+            reply = self._exchange(EngineMessage(action_request=request), "action_response", timeout)
+            if reply is not None:
+                return reply.action_response, MessageCall(reply.bot_time_us / 1e6)
+        return self.stub.RequestAction.with_call(request, timeout=timeout)
+
+    def _open_stream(self) -> None:
+        """
+        Starts the PlayMatch stream, with a thread that queues the bot's replies so they
+        can be awaited with a deadline.
+        """
+        self._stream_requests = queue.SimpleQueue()
+        self._stream_replies = queue.SimpleQueue()
+        self._stream = self.stub.PlayMatch(iter(self._stream_requests.get, None))
+        threading.Thread(target=self._read_stream, args=(self._stream, self._stream_replies), daemon=True).start()
+
+    @staticmethod
+    def _read_stream(stream, replies: queue.SimpleQueue) -> None:
+        try:
+            for reply in stream:
+                replies.put(reply)
+            replies.put(MatchStreamError("The bot closed the match stream", grpc.StatusCode.UNAVAILABLE))
+        except grpc.RpcError as e:
+            code = e.code() if hasattr(e, "code") else grpc.StatusCode.UNKNOWN
+            replies.put(MatchStreamError(f"Match stream failed: {e}", code))
+
+    def _close_stream(self) -> None:
+        if self._stream is not None:
+            self._stream_requests.put(None)
+            self._stream = None
+
+    def _exchange(self, message: EngineMessage, reply_field: str, timeout: Optional[float]) -> Optional[BotMessage]:
+        """
+        Sends a message over the match stream and waits for the bot's reply. If the bot
+        does not implement PlayMatch, streaming is turned off for the rest of the match.
+
+        Args:
+            message (EngineMessage): The message to send.
+            reply_field (str): The field the reply must set.
+            timeout (Optional[float]): Seconds to wait for the reply.
+
+        Returns:
+            Optional[BotMessage]: The reply, or None if the message must be sent as a
+            unary RPC instead.
+
+        Raises:
+            MatchStreamError: If the stream failed or the reply missed its deadline.
+                Streaming is then turned off, since later replies could be out of step.
+        """
+        if self._stream is None:
+            self._open_stream()
+        self._stream_requests.put(message)
+        try:
+            reply = self._stream_replies.get(timeout=timeout)
+        except queue.Empty:
+            reply = MatchStreamError("Deadline exceeded on the match stream", grpc.StatusCode.DEADLINE_EXCEEDED)
+        if isinstance(reply, BotMessage) and reply.WhichOneof("message") != reply_field:
+            reply = MatchStreamError(f"Expected {reply_field} on the match stream", grpc.StatusCode.INTERNAL)
+        if isinstance(reply, BotMessage):
+            return reply
+        self.streaming = False
+        # cancel the call too, so the bot's server stops serving it before any unary RPC
+        stream = self._stream
+        self._close_stream()
+        stream.cancel()
+        if reply.code() == grpc.StatusCode.UNIMPLEMENTED:
+            print(f"Bot {self.name} does not support PlayMatch, using unary RPCs")
+            return None
+        raise reply
 
     def end_round(
         self,
-        player_hand: List[str],
-        opponent_hand: List[str],
-        board_cards: List[str],
+        player_hand: List[int],
+        opponent_hand: List[int],
+        board_cards: List[int],
         new_actions: Deque[Action],
         delta: int,
         is_match_over: bool,
@@ -199,42 +407,98 @@ class Client:
         Signals the end of a round to the pokerbot, including the final state of the game and whether the match is over.
 
         Args:
-            player_hand (List[str]): The final hand of the player.
-            opponent_hand (List[str]): The final hand of the opponent.
-            board_cards (List[str]): The cards visible on the board.
+            player_hand (List[int]): The final hand of the player.
+            opponent_hand (List[int]): The final hand of the opponent.
+            board_cards (List[int]): The cards visible on the board.
             new_actions (Deque[Action]): Any actions that occurred after the last action request.
             delta (int): The change in the player's bankroll after the round.
             is_match_over (bool): Indicates whether the match has concluded.
         """
-        proto_actions = self._convert_actions_to_proto(new_actions)
+        end_round_message = self._make_end_round_message(
+            player_hand, opponent_hand, board_cards, new_actions, delta, is_match_over
+        )
 
-        end_round_message = EndRoundMessage(
-            player_hand=player_hand,
-            opponent_hand=opponent_hand,
-            board_cards=board_cards,
-            new_actions=proto_actions,
+        try:
+            reply = None
+            if self.streaming:
+                reply = self._exchange(
+                    EngineMessage(end_round=end_round_message), "end_round_response", END_ROUND_TIMEOUT
+                )
+            if reply is not None:
+                response = reply.end_round_response
+            else:
+                response = self.stub.EndRound(end_round_message, timeout=END_ROUND_TIMEOUT)
+            if is_match_over:
+                self._close_stream()
+            self._store_logs(response)
+        except grpc.RpcError as e:
+            print(f"An error occurred: {e}")
+
+    def _make_end_round_message(
+        self,
+        player_hand: List[int],
+        opponent_hand: List[int],
+        board_cards: List[int],
+        new_actions: Deque[Action],
+        delta: int,
+        is_match_over: bool,
+    ) -> EndRoundMessage:
+        return EndRoundMessage(
+            player_hand=cards_to_str(player_hand),
+            opponent_hand=cards_to_str(opponent_hand),
+            board_cards=cards_to_str(board_cards),
+            new_actions=self._convert_actions_to_proto(new_actions),
             delta=delta,
             is_match_over=is_match_over,
         )
 
+    def _store_logs(self, response: EndRoundResponse) -> None:
+        """
+        Appends the bot's new log entries to its log, up to PLAYER_LOG_SIZE_LIMIT bytes.
+
+        Bots send their entries as one compressed log_chunk, already capped, which is
+        written as it is; older bots send a list of entries.
+        """
+        if response.log_chunk:
+            self._store_log_chunk(response.log_chunk)
+            return
+        for log_entry in response.logs:
+            entry_bytes = log_entry.encode("utf-8")
+            entry_size = len(entry_bytes)
+
+            if self.log_size + entry_size <= PLAYER_LOG_SIZE_LIMIT:
+                self.log.append(log_entry)
+                self.log_size += entry_size
+            else:
+                if self.log_size < PLAYER_LOG_SIZE_LIMIT:
+                    self.log.append(LOG_LIMIT_MESSAGE)
+                    self.log_size = PLAYER_LOG_SIZE_LIMIT
+                break
+
+    def _store_log_chunk(self, chunk: bytes) -> None:
+        """
+        Decompresses a log chunk into the bot's log, never inflating more than the bytes
+        the bot has left. A chunk counts with the newline that separates it, as the bot
+        counts each entry. If it does not fit, the lines that do are kept and followed by
+        the limit message.
+        """
+        remaining = PLAYER_LOG_SIZE_LIMIT - self.log_size
+        if remaining <= 0:
+            return
         try:
-            new_logs = self.stub.EndRound(end_round_message).logs
-            for log_entry in new_logs:
-                entry_bytes = log_entry.encode("utf-8")
-                entry_size = len(entry_bytes)
-
-                if self.log_size + entry_size <= PLAYER_LOG_SIZE_LIMIT:
-                    self.log.append(log_entry)
-                    self.log_size += entry_size
-                else:
-                    if self.log_size < PLAYER_LOG_SIZE_LIMIT:
-                        self.log.append(
-                            "Log size limit reached. No further entries will be added."
-                        )
-                        self.log_size = PLAYER_LOG_SIZE_LIMIT
-                    break
-        except grpc.RpcError as e:
-            print(f"An error occurred: {e}")
+            text = zlib.decompressobj().decompress(chunk, remaining)
+        except zlib.error as e:
+            print(f"Bot {self.name} sent an unreadable log chunk: {e}")
+            return
+        if len(text) < remaining:
+            self.log.append(text.decode("utf-8", errors="replace"))
+            self.log_size += len(text) + 1
+            return
+        end = text.rfind(b"\n", 0, max(remaining - len(LOG_LIMIT_MESSAGE) - 1, 0))
+        if end > 0:
+            self.log.append(text[:end].decode("utf-8", errors="replace"))
+        self.log.append(LOG_LIMIT_MESSAGE)
+        self.log_size = PLAYER_LOG_SIZE_LIMIT
 
     def _convert_actions_to_proto(self, actions: Deque[Action]) -> List[ProtoAction]:
         """
@@ -1,8 +1,5 @@
-import csv
 import os
 from datetime import datetime
-from io import StringIO
-from typing import List, Union
 
 from google.auth import default
 from google.auth.exceptions import DefaultCredentialsError
@@ -24,6 +21,33 @@ MATCH_ID = os.getenv("MATCH_ID", 0)
 LOGS_DIRECTORY = "logs"
 GAME_LOG_FILENAME = "engine_log"
 BOT_LOG_FILENAME = "debug_log"
+REPLAY_LOG_FILENAME = "replay_log"
+HAND_HISTORY_FILENAME = "hand_history"
+LATENCY_SUMMARY_FILENAME = "latency_summary"
+PROFILE_FILENAME = "phase_profile"
+
+# Seed for the match's deal stream; a random one is drawn (and logged) if unset
+MATCH_SEED = os.getenv("MATCH_SEED")
+
+# Duplicate matches play each deal twice with the seats swapped ("1" to enable)
+DUPLICATE_MATCH = os.getenv("DUPLICATE_MATCH") == "1"
+
+# Sequential early stopping ("1" to enable): a match ends once its result is significant
+# at EARLY_STOP_CONFIDENCE, tested every EARLY_STOP_CHECK_EVERY rounds from
+# EARLY_STOP_MIN_ROUNDS on, or once the remaining rounds can no longer change the winner
+EARLY_STOP = os.getenv("EARLY_STOP") == "1"
+EARLY_STOP_CONFIDENCE = float(os.getenv("EARLY_STOP_CONFIDENCE", "0.99"))
+EARLY_STOP_CHECK_EVERY = int(os.getenv("EARLY_STOP_CHECK_EVERY", "50"))
+EARLY_STOP_MIN_ROUNDS = int(os.getenv("EARLY_STOP_MIN_ROUNDS", "200"))
+
+# Time each phase of every round and write a phase profile ("1" to enable)
+PROFILE_PHASES = os.getenv("PROFILE_PHASES") == "1"
+
+# Saved all-in equity table (.npz), loaded before and updated after each match (optional)
+ALL_IN_EQUITY_TABLE = os.getenv("ALL_IN_EQUITY_TABLE")
+
+# Characters a log buffers before it is written out; logs are also flushed after every round
+LOG_BUFFER_SIZE = 64 * 1024
 
 # PLAYER_LOG_SIZE_LIMIT IS IN BYTES
 PLAYER_LOG_SIZE_LIMIT = 1000000  # 1 MB
@@ -35,9 +59,14 @@ READY_CHECK_TIMEOUT = 0
 READY_CHECK_RETRIES = 1
 ACTION_REQUEST_TIMEOUT = 2
 ACTION_REQUEST_RETRIES = 2
+END_ROUND_TIMEOUT = 10
 ENFORCE_GAME_CLOCK = True
 STARTING_GAME_CLOCK = 300.0
 
+# Play the match over one PlayMatch stream per bot, falling back to unary RPCs for
+# bots that do not implement it ("0" to always use unary RPCs)
+PLAY_MATCH_STREAMING = os.getenv("PLAY_MATCH_STREAMING", "1") == "1"
+
 # THE GAME VARIANT FIXES THE PARAMETERS BELOW
 NUM_ROUNDS = 1000
 STARTING_STACK = 400
@@ -56,16 +85,23 @@ def get_credentials():
         return None
 
 
-def upload_logs(log: Union[List[str], List[List[str]]], log_filename: str) -> bool:
+LOG_CONTENT_TYPES = {
+    ".csv": "text/csv",
+    ".json": "application/json",
+    ".bin": "application/octet-stream",
+}
+
+
+def upload_log_file(path: str, log_filename: str) -> bool:
     """
-    Uploads the logs to a Google Cloud Storage bucket.
+    Uploads a finished log file to a Google Cloud Storage bucket.
 
     Args:
-        log (Union[List[str], List[List[str]]]): The list of log messages or CSV rows to upload.
+        path (str): The local log file.
         log_filename (str): The filename to use for the uploaded log file.
 
     Returns:
-        bool: True if the logs were uploaded successfully, False otherwise.
+        bool: True if the log was uploaded successfully, False otherwise.
     """
     credentials = get_credentials()
     BUCKET_NAME = os.getenv("BUCKET_NAME")
@@ -77,15 +113,8 @@ def upload_logs(log: Union[List[str], List[List[str]]], log_filename: str) -> bo
 
     log_path = f"match_{MATCH_ID}/{log_filename}"
     blob = bucket.blob(log_path)
-
-    if isinstance(log[0], str):
-        log_content = "\n".join(log)
-        blob.upload_from_string(log_content)
-    else:
-        csv_buffer = StringIO()
-        csv_writer = csv.writer(csv_buffer)
-        csv_writer.writerows(log)
-        blob.upload_from_string(csv_buffer.getvalue(), content_type="text/csv")
+    content_type = LOG_CONTENT_TYPES.get(os.path.splitext(log_filename)[1], "text/plain")
+    blob.upload_from_filename(path, content_type=content_type)
 
     print(f"Logs uploaded to {BUCKET_NAME}/{log_path}")
     return True
@@ -3,13 +3,20 @@ CMU Poker Bot Competition Game Engine 2024
 """
 
 from collections import deque
+import json
 import os
-from typing import Deque, List
-import csv
+import secrets
+from typing import Callable, Deque, List, Optional, Sequence, Tuple, Union
 
 from .actions import (
+    ACTION_BITS,
+    CALL_BIT,
+    CHECK_BIT,
+    FOLD_BIT,
+    RAISE_BIT,
     STREET_NAMES,
     Action,
+    ActionHistory,
     CallAction,
     CheckAction,
     FoldAction,
@@ -17,23 +24,42 @@ from .actions import (
     TerminalState,
 )
 from .config import (
+    ALL_IN_EQUITY_TABLE,
     BIG_BLIND,
     BOT_LOG_FILENAME,
+    DUPLICATE_MATCH,
+    EARLY_STOP,
+    EARLY_STOP_CHECK_EVERY,
+    EARLY_STOP_CONFIDENCE,
+    EARLY_STOP_MIN_ROUNDS,
     GAME_LOG_FILENAME,
+    HAND_HISTORY_FILENAME,
+    LATENCY_SUMMARY_FILENAME,
     LOGS_DIRECTORY,
+    LOG_BUFFER_SIZE,
+    MATCH_SEED,
     NUM_ROUNDS,
     PLAYER_1_DNS,
     PLAYER_1_NAME,
     PLAYER_2_DNS,
     PLAYER_2_NAME,
+    PROFILE_FILENAME,
+    PROFILE_PHASES,
+    REPLAY_LOG_FILENAME,
     SMALL_BLIND,
     STARTING_STACK,
-    upload_logs,
+    upload_log_file,
     add_match_entry,
 )
-from .evaluate import ShortDeck
+from .equity import load_equity_table, save_equity_table
+from .evaluate import ShortDeck, cards_to_str, deal_number, deal_stream
+from .hand_history import HandHistoryWriter, history_files
+from .log_writer import FileSink, LogSink, StreamingCSVLog, StreamingLog
+from .profiler import NullProfiler, PhaseProfiler
+from .replay import ReplayRecord, format_replay_header, format_replay_record
 from .client import Client
 from .roundstate import RoundState
+from .stopping import SequentialStopper
 
 
 class Game:
@@ -41,26 +67,91 @@ class Game:
     Manages logging and the high-level game procedure.
     """
 
-    def __init__(self) -> None:
-        self.players: List[Client] = []
-        self.log: List[str] = [
-            f"CMU Poker Bot Game - {PLAYER_1_NAME} vs {PLAYER_2_NAME}"
-        ]
-        self.csvlog: List[str] = [
+    def __init__(
+        self,
+        players: Optional[List[Client]] = None,
+        seed: Optional[int] = None,
+        logs_directory: str = LOGS_DIRECTORY,
+        publish: bool = True,
+        sink_factory: Optional[Callable[[str], LogSink]] = None,
+        duplicate: bool = DUPLICATE_MATCH,
+        early_stop: bool = EARLY_STOP,
+        profile: bool = PROFILE_PHASES,
+    ) -> None:
+        """
+        Args:
+            players (Optional[List[Client]]): The two players, e.g. LocalClients for an
+                in-process match. By default, gRPC clients for PLAYER_1 and PLAYER_2 are
+                connected when the match starts.
+            seed (Optional[int]): The match seed. Defaults to MATCH_SEED, or a random seed.
+            logs_directory (str): Where logs are written.
+            publish (bool): Whether to upload the finished logs and record the result in
+                the database when they are configured. Off for local tournaments.
+            sink_factory (Optional[Callable[[str], LogSink]]): Opens the sink of each log
+                from its filename. Defaults to local files in logs_directory.
+            duplicate (bool): Whether to play each deal twice with the seats swapped, so
+                both players hold both hands of every deal, and score the match per pair.
+            early_stop (bool): Whether the match may end before NUM_ROUNDS once its result is
+                settled (see engine.stopping).
+            profile (bool): Whether to time each phase of every round (see engine.profiler).
+        """
+        self.players: List[Client] = players or []
+        player_names = (
+            [player.name for player in players] if players else [PLAYER_1_NAME, PLAYER_2_NAME]
+        )
+        if seed is None:
+            seed = int(MATCH_SEED) if MATCH_SEED else secrets.randbits(64)
+        self.seed = seed
+        self.duplicate = duplicate
+        self.early_stop = early_stop
+        self.profiler = PhaseProfiler() if profile else NullProfiler()
+        self.logs_directory = logs_directory
+        self.publish = publish
+        self.sink_factory = sink_factory or (
+            lambda filename: FileSink(os.path.join(self.logs_directory, filename))
+        )
+        self.sinks: List[Tuple[str, LogSink]] = []
+        self.log = StreamingLog(
+            self._open_sink(f"{GAME_LOG_FILENAME}.txt"),
+            LOG_BUFFER_SIZE,
             [
-                "Round",
-                "Street",
-                "Team",
-                "Action",
-                "ActionAmt",
-                "Team1Cards",
-                "Team2Cards",
-                "AllCards",
-                "Bankroll",
-            ]
-        ]
+                f"CMU Poker Bot Game - {player_names[0]} vs {player_names[1]}",
+                f"Match seed: {self.seed}" + (" (duplicate)" if duplicate else ""),
+            ],
+        )
+        self.csvlog = StreamingCSVLog(
+            self._open_sink(f"{GAME_LOG_FILENAME}.csv"),
+            LOG_BUFFER_SIZE,
+            [
+                [
+                    "Round",
+                    "Street",
+                    "Team",
+                    "Action",
+                    "ActionAmt",
+                    "Team1Cards",
+                    "Team2Cards",
+                    "AllCards",
+                    "Bankroll",
+                ]
+            ],
+        )
+        self.replay_log = StreamingLog(
+            self._open_sink(f"{REPLAY_LOG_FILENAME}.txt"),
+            LOG_BUFFER_SIZE,
+            [format_replay_header(self.seed, duplicate)],
+        )
+        self.hand_history = HandHistoryWriter(
+            [self._add_sink(filename) for filename in self._get_unique_files(HAND_HISTORY_FILENAME, history_files)],
+            self.seed,
+            player_names,
+            duplicate,
+        )
+        self.pair_scores: List[int] = []
         self.new_actions: List[Deque[Action]] = [deque(), deque()]
         self.round_num = 0
+        self.last_round = NUM_ROUNDS
+        self.deals = None
 
     def log_round_state(self, round_state: RoundState):
         """
@@ -70,8 +161,8 @@ class Game:
         if round_state.street == 0 and round_state.button == 0:
             self.log.append(f"{self.players[0].name} posts the blind of {SMALL_BLIND}")
             self.log.append(f"{self.players[1].name} posts the blind of {BIG_BLIND}")
-            self.log.append(f"{self.players[0].name} dealt {round_state.hands[0]}")
-            self.log.append(f"{self.players[1].name} dealt {round_state.hands[1]}")
+            self.log.append(f"{self.players[0].name} dealt {cards_to_str(round_state.hands[0])}")
+            self.log.append(f"{self.players[1].name} dealt {cards_to_str(round_state.hands[1])}")
 
             self._create_csv_row(round_state, self.players[0].name, "posts blind", SMALL_BLIND)
             self._create_csv_row(round_state, self.players[1].name, "posts blind", BIG_BLIND)
@@ -79,7 +170,7 @@ class Game:
         elif round_state.street > 0 and round_state.button == 1:
             # log the pot every street
             pot = STARTING_STACK - round_state.stacks[0] + STARTING_STACK - round_state.stacks[1]
-            self.log.append(f"{STREET_NAMES[round_state.street]} Board: {round_state.board} Pot: {pot}")
+            self.log.append(f"{STREET_NAMES[round_state.street]} Board: {cards_to_str(round_state.board)} Pot: {pot}")
 
     def log_action(
         self, player_name: str, action: Action, round_state: RoundState
@@ -105,149 +196,370 @@ class Game:
         Logs the terminal state of a round, including outcomes.
         """
         previous_state = round_state.previous_state
-        if FoldAction not in previous_state.legal_actions():  # idk why this is needed
-            self.log.append(f"{self.players[0].name} shows {previous_state.hands[0]}")
-            self.log.append(f"{self.players[1].name} shows {previous_state.hands[1]}")
+        if not previous_state.legal_mask & FOLD_BIT:  # nobody folded, so hands are shown
+            self.log.append(f"{self.players[0].name} shows {cards_to_str(previous_state.hands[0])}")
+            self.log.append(f"{self.players[1].name} shows {cards_to_str(previous_state.hands[1])}")
         self.log.append(f"{self.players[0].name} awarded {round_state.deltas[0]}")
         self.log.append(f"{self.players[1].name} awarded {round_state.deltas[1]}")
         self.log.append(f"{self.players[0].name} Bankroll: {self.players[0].bankroll}")
         self.log.append(f"{self.players[1].name} Bankroll: {self.players[1].bankroll}")
 
+    def log_pair(self) -> None:
+        """
+        Scores the deal just played from both seats of a duplicate match.
+        """
+        player = self.original_players[0]
+        # the bankroll only changes by the deals played so far
+        score = player.bankroll - sum(self.pair_scores)
+        self.pair_scores.append(score)
+        self.log.append(f"Deal #{len(self.pair_scores)}: {player.name} nets {score}")
+
+    def log_duplicate_summary(self) -> None:
+        """
+        Logs the per-deal results of a duplicate match.
+        """
+        names = [player.name for player in self.original_players]
+        num_pairs = len(self.pair_scores)
+        wins = sum(score > 0 for score in self.pair_scores)
+        losses = sum(score < 0 for score in self.pair_scores)
+        mean = sum(self.pair_scores) / num_pairs
+        variance = sum((score - mean) ** 2 for score in self.pair_scores) / max(num_pairs - 1, 1)
+        self.log.append(
+            f"Duplicate deals: {names[0]} won {wins}, {names[1]} won {losses}, "
+            f"{num_pairs - wins - losses} tied"
+        )
+        self.log.append(
+            f"{names[0]} nets {mean:.2f} per deal (standard error {(variance / num_pairs) ** 0.5:.2f})"
+        )
+
+    def log_latency(self) -> None:
+        """
+        Logs each bot's action latencies and writes them to a JSON summary.
+        """
+        for player in self.original_players:
+            for line in player.latency.report(player.name):
+                self.log.append(line)
+        sink = self._open_sink(f"{LATENCY_SUMMARY_FILENAME}.json")
+        sink.write(json.dumps({player.name: player.latency.summary() for player in self.original_players}, indent=2))
+        sink.close()
+
+    def log_profile(self) -> None:
+        """
+        Logs the time spent in each phase of the match and writes it to a JSON profile.
+        """
+        for line in self.profiler.report():
+            self.log.append(line)
+        sink = self._open_sink(f"{PROFILE_FILENAME}.json")
+        sink.write(json.dumps(self.profiler.summary(), indent=2))
+        sink.close()
+
+    def _new_stopper(self) -> SequentialStopper:
+        """
+        Returns the stopping rule, which follows the first player's results per round,
+        or per deal in a duplicate match.
+        """
+        unit = 2 if self.duplicate else 1
+        return SequentialStopper(
+            NUM_ROUNDS // unit,
+            unit * STARTING_STACK,
+            EARLY_STOP_CONFIDENCE,
+            EARLY_STOP_CHECK_EVERY // unit,
+            EARLY_STOP_MIN_ROUNDS // unit,
+        )
+
+    def _check_early_stop(self, stopper: SequentialStopper) -> None:
+        """
+        Feeds the stopping rule and, once it fires, makes the next round the last one,
+        so the bots are still told which round ends the match. A duplicate match is
+        checked after the first round of each deal, so stopping finishes that deal.
+        """
+        if not self.duplicate:
+            # the bankroll only changes by the rounds played so far
+            stopper.add(self.original_players[0].bankroll - stopper.total)
+        elif self.round_num % 2 == 0:
+            stopper.add(self.pair_scores[-1])
+            return
+        reason = stopper.check()
+        if reason:
+            self.last_round = self.round_num + 1
+            print(f"Stopping early after round {self.last_round}: {reason}")
+            self.log.append(f"Stopping early after round {self.last_round}: {reason}")
+
     def run_round(self, last_round: bool) -> None:
         """
         Runs one round of poker (1 hand).
         """
-        pips = [SMALL_BLIND, BIG_BLIND]
-        stacks = [STARTING_STACK - SMALL_BLIND, STARTING_STACK - BIG_BLIND]
-        deck = ShortDeck()
-        deck.shuffle()
-        hands = [deck.deal(2), deck.deal(2)]
-
-        round_state = RoundState(0, 0, pips, stacks, hands, [], deck, None)
-        self.new_actions = [deque(), deque()]
+        profiler = self.profiler
+        round_state, hands = self._deal_round()
 
         while not isinstance(round_state, TerminalState):
-            self.log_round_state(round_state)
-
-            active = round_state.button % 2
-            player = self.players[active]
+            active, player = self._next_player(round_state)
 
             if player.game_clock <= 0:
                 self.log.append(f"{player.name} ran out of time.")
                 action = FoldAction()
             else:
+                start = profiler.start()
                 try:
                     action = player.request_action(
                         hands[active], round_state.board, self.new_actions[active]
                     )
-                except TimeoutError:
-                    self.log.append(f"{player.name} timed out.")
-                    action = FoldAction()
                 except Exception as e:
-                    player.log.append(f"{[player.name]} raised an exception: {e}")
-                    self.log.append(f"{player.name} raised an exception.")
-                    action = FoldAction()
+                    action = self._action_failed(player, e)
+                profiler.stop_request(start, player.last_bot_time)
 
-            action = self._validate_action(action, round_state, player.name)
-            self.log_action(player.name, action, round_state)
-
-            self.new_actions[1 - active].append(action)
-            round_state = round_state.proceed(action)
+            round_state = self._apply_action(round_state, active, player, action)
 
+        start = profiler.start()
         board = round_state.previous_state.board
-        for index, (player, delta) in enumerate(zip(self.players, round_state.deltas)):
+        for index, player in enumerate(self.players):
             player.end_round(
                 hands[index],
                 hands[1 - index],
                 board,
                 self.new_actions[index],
-                delta,
+                round_state.deltas[index],
                 last_round,
             )
+        profiler.stop("end_round", start)
+        self._record_round(round_state, hands)
+
+    def _deal_round(self) -> Tuple[RoundState, List[List[int]]]:
+        """
+        Deals the current round and returns its initial state and the players' hands.
+        """
+        start = self.profiler.start()
+        pips = [SMALL_BLIND, BIG_BLIND]
+        stacks = [STARTING_STACK - SMALL_BLIND, STARTING_STACK - BIG_BLIND]
+        deck = ShortDeck(self.deals[deal_number(self.round_num, self.duplicate) - 1])
+        hands = [deck.deal(2), deck.deal(2)]
+
+        round_state = RoundState(0, 0, pips, stacks, hands, [], deck, ActionHistory())
+        self.new_actions = [deque(), deque()]
+        self.profiler.stop("deal", start)
+        return round_state, hands
+
+    def _next_player(self, round_state: RoundState) -> Tuple[int, Client]:
+        """
+        Logs the state of the round and returns the seat and player to act next.
+        """
+        start = self.profiler.start()
+        self.log_round_state(round_state)
+        self.profiler.stop("log_round_state", start)
+        active = round_state.button % 2
+        return active, self.players[active]
+
+    def _action_failed(self, player: Client, error: Exception) -> Action:
+        """
+        Logs a failed action request and folds for the player.
+        """
+        if isinstance(error, TimeoutError):
+            self.log.append(f"{player.name} timed out.")
+        else:
+            player.log.append(f"{[player.name]} raised an exception: {error}")
+            self.log.append(f"{player.name} raised an exception.")
+        return FoldAction()
+
+    def _apply_action(
+        self, round_state: RoundState, active: int, player: Client, action: Optional[Action]
+    ) -> Union[RoundState, TerminalState]:
+        """
+        Validates and logs a player's action and returns the state it leads to.
+        """
+        profiler = self.profiler
+        start = profiler.start()
+        action = self._validate_action(action, round_state, player.name)
+        profiler.stop("validate_action", start)
+        start = profiler.start()
+        self.log_action(player.name, action, round_state)
+        profiler.stop("log_action", start)
+
+        self.new_actions[1 - active].append(action)
+        start = profiler.start()
+        next_state = round_state.proceed(action)
+        # the transition that ends a round without a fold includes the showdown
+        ended = isinstance(next_state, TerminalState) and not isinstance(action, FoldAction)
+        profiler.stop("showdown" if ended else "proceed", start)
+        return next_state
+
+    def _record_round(self, round_state: TerminalState, hands: List[List[int]]) -> None:
+        """
+        Settles the bankrolls of a finished round and records it in the logs.
+        """
+        start = self.profiler.start()
+        for player, delta in zip(self.players, round_state.deltas):
             player.bankroll += delta
+        board = round_state.previous_state.board
         self.log_terminal_state(round_state)
+        self.replay_log.append(format_replay_record(ReplayRecord(
+            self.round_num, self.players[0].name, round_state.deltas[0], round_state.previous_state.history
+        )))
+        self.hand_history.add_round(
+            self.round_num,
+            self.original_players.index(self.players[0]),
+            hands,
+            board,
+            round_state.deltas,
+            round_state.previous_state.history,
+        )
+        self.profiler.stop("record_round", start)
+        self.profiler.end_round()
 
     def run_match(self) -> None:
         """
         Runs one match of poker.
         """
         print("Starting the Poker Game...")
-        self.players = [
-            Client(PLAYER_1_NAME, PLAYER_1_DNS),
-            Client(PLAYER_2_NAME, PLAYER_2_DNS),
-        ]
-        player_names = [PLAYER_1_NAME, PLAYER_2_NAME]
+        if not self.players:
+            self.players = [
+                Client(PLAYER_1_NAME, PLAYER_1_DNS),
+                Client(PLAYER_2_NAME, PLAYER_2_DNS),
+            ]
+        player_names = self._prepare_match()
 
         print("Checking ready...")
         ready = [player.check_ready(player_names) for player in self.players]
         if not all(ready):
-            print("One or more bots are not ready. Aborting the match.")
-            self.log.append("One or more bots are not ready. Aborting the match.")
-            if not any(ready):
-                self.log.append("Both players forfeited the match.")
-            else:
-                forfeiter = ready.index(False)
-                self.log.append("Player {} forfeited the match.".format(player_names[forfeiter]))
-                # Fold 1000 rounds = 1*500 small blind + 2*500 big blind = 1500
-                self.players[1 - forfeiter].bankroll += 1500
-                self.players[forfeiter].bankroll -= 1500
+            self._forfeit(ready, player_names)
         else:
-            print("Starting match...")
-            self.original_players = self.players.copy()
+            stopper = self._start_match()
             for self.round_num in range(1, NUM_ROUNDS + 1):
-                if self.round_num % 50 == 0:
-                    print(f"Starting round {self.round_num}...")
-                    print(f"{self.players[0].name} remaining time: {self.players[0].game_clock}")
-                    print(f"{self.players[1].name} remaining time: {self.players[1].game_clock}")
-                self.log.append(f"\nRound #{self.round_num}")
+                self._start_round()
+                self.run_round((self.round_num == self.last_round))
+                if self._end_round(stopper):
+                    break
+
+        self._finish_match()
 
-                self.run_round((self.round_num == NUM_ROUNDS))
-                self.players = self.players[::-1]  # Alternate the dealer
+    def _prepare_match(self) -> List[str]:
+        """
+        Loads the equity table and opens the players' logs.
+
+        Returns:
+            List[str]: The player names.
+        """
+        if ALL_IN_EQUITY_TABLE:
+            load_equity_table(ALL_IN_EQUITY_TABLE)
+        player_names = [player.name for player in self.players]
+        for player in self.players:
+            player.log = StreamingLog(
+                self._open_sink(os.path.join(player.name, f"{BOT_LOG_FILENAME}.txt")),
+                LOG_BUFFER_SIZE,
+            )
+        return player_names
 
+    def _forfeit(self, ready: List[bool], player_names: List[str]) -> None:
+        """
+        Scores a match that cannot start because a bot is not ready.
+        """
+        print("One or more bots are not ready. Aborting the match.")
+        self.log.append("One or more bots are not ready. Aborting the match.")
+        if not any(ready):
+            self.log.append("Both players forfeited the match.")
+        else:
+            forfeiter = ready.index(False)
+            self.log.append("Player {} forfeited the match.".format(player_names[forfeiter]))
+            # Fold 1000 rounds = 1*500 small blind + 2*500 big blind = 1500
+            self.players[1 - forfeiter].bankroll += 1500
+            self.players[forfeiter].bankroll -= 1500
+
+    def _start_match(self) -> Optional[SequentialStopper]:
+        """
+        Deals the match and returns its stopping rule, if early stopping is on.
+        """
+        print("Starting match...")
+        self.original_players = self.players.copy()
+        self.deals = deal_stream(self.seed, deal_number(NUM_ROUNDS, self.duplicate))
+        return self._new_stopper() if self.early_stop else None
+
+    def _start_round(self) -> None:
+        if self.round_num % 50 == 0:
+            print(f"Starting round {self.round_num}...")
+            print(f"{self.players[0].name} remaining time: {self.players[0].game_clock}")
+            print(f"{self.players[1].name} remaining time: {self.players[1].game_clock}")
+        self.log.append(f"\nRound #{self.round_num}")
+
+    def _end_round(self, stopper: Optional[SequentialStopper]) -> bool:
+        """
+        Scores duplicate deals, checks the stopping rule, swaps the seats and flushes the logs.
+
+        Returns:
+            bool: Whether the round just played was the last one.
+        """
+        if self.duplicate and self.round_num % 2 == 0:
+            self.log_pair()
+        if stopper is not None and self.round_num < self.last_round:
+            self._check_early_stop(stopper)
+        self.players = self.players[::-1]  # Alternate the dealer
+        start = self.profiler.start()
+        self._flush_logs()
+        self.profiler.stop("flush_logs", start)
+        return self.round_num == self.last_round
+
+    def _finish_match(self) -> None:
+        """
+        Logs the results, closes and publishes the logs, and records the match.
+        """
         self.log.append(f"{self.original_players[0].name} Bankroll: {self.original_players[0].bankroll}")
         self.log.append(f"{self.original_players[1].name} Bankroll: {self.original_players[1].bankroll}")
+        if self.pair_scores:
+            self.log_duplicate_summary()
+        if self.round_num:
+            self.log_latency()
+        if isinstance(self.profiler, PhaseProfiler):
+            self.log_profile()
 
         self._finalize_log()
-        add_match_entry(self.original_players[0].bankroll, self.original_players[1].bankroll)
+        if ALL_IN_EQUITY_TABLE:
+            save_equity_table(ALL_IN_EQUITY_TABLE)
+        if self.publish:
+            add_match_entry(self.original_players[0].bankroll, self.original_players[1].bankroll)
 
-    def _finalize_log(self) -> None:
+    def _open_sink(self, base_filename: str) -> LogSink:
+        return self._add_sink(self._get_unique_filename(base_filename))
+
+    def _add_sink(self, filename: str) -> LogSink:
+        sink = self.sink_factory(filename)
+        self.sinks.append((filename, sink))
+        return sink
+
+    def _flush_logs(self) -> None:
         """
-        Finalizes the game log, writing it to a file and uploading it.
+        Writes out everything logged so far.
         """
-        csv_filename = f"{GAME_LOG_FILENAME}.csv"
-        self._upload_or_write_file(self.csvlog, csv_filename, is_csv=True)
+        for log in [self.log, self.csvlog, self.replay_log, self.hand_history] + [player.log for player in self.players]:
+            log.flush()
 
-        log_filename = f"{GAME_LOG_FILENAME}.txt"
-        self._upload_or_write_file(self.log, log_filename)
+    def _finalize_log(self) -> None:
+        """
+        Finalizes the game logs, closing them and uploading the finished files.
+        """
+        for log in [self.csvlog, self.log, self.replay_log, self.hand_history] + [player.log for player in self.players]:
+            log.close()
+        if self.publish:
+            for filename, sink in self.sinks:
+                if isinstance(sink, FileSink) and os.path.exists(sink.path):
+                    upload_log_file(sink.path, filename)
+
+    def _get_unique_filename(self, base_filename: str) -> str:
+        filename, ext = os.path.splitext(base_filename)
+        return self._get_unique_files(filename, lambda prefix: [prefix + ext])[0]
 
-        for player in self.players:
-            log_filename = os.path.join(player.name, f"{BOT_LOG_FILENAME}.txt")
-            self._upload_or_write_file(player.log, log_filename)
-
-    def _upload_or_write_file(self, content, base_filename, is_csv=False):
-        filename = self._get_unique_filename(base_filename)
-        if not upload_logs(content, filename):
-            filename = os.path.join(LOGS_DIRECTORY, filename)
-            os.makedirs(os.path.dirname(filename), exist_ok=True)
-            print(f"Writing {filename}")
-            mode = "w"
-            newline = "" if is_csv else None
-            with open(filename, mode, newline=newline) as file:
-                if is_csv:
-                    writer = csv.writer(file)
-                    writer.writerows(content)
-                else:
-                    file.write("\n".join(content))
-
-    @staticmethod
-    def _get_unique_filename(base_filename):
+    def _get_unique_files(self, base_prefix: str, files: Callable[[str], Sequence[str]]) -> Sequence[str]:
+        """
+        Numbers the prefix of a group of log files, such as the hand history's, until
+        none of them is already in logs_directory or open in this game.
+        """
+        taken = {filename for filename, _ in self.sinks}
+        prefix = base_prefix
         file_idx = 1
-        filename, ext = os.path.splitext(base_filename)
-        unique_filename = base_filename
-        while os.path.exists(unique_filename):
-            unique_filename = f"{filename}_{file_idx}{ext}"
+        while any(
+            filename in taken or os.path.exists(os.path.join(self.logs_directory, filename))
+            for filename in files(prefix)
+        ):
+            prefix = f"{base_prefix}_{file_idx}"
             file_idx += 1
-        return unique_filename
+        return files(prefix)
 
     def _validate_action(
         self, action: Action, round_state: RoundState, player_name: str
@@ -264,29 +576,29 @@ class Game:
         Returns:
             Action: The validated (or corrected) action.
         """
-        legal_actions = (
-            round_state.legal_actions()
+        legal_mask = (
+            round_state.legal_mask
             if isinstance(round_state, RoundState)
-            else {CheckAction}
+            else CHECK_BIT
         )
         if isinstance(action, RaiseAction):
             amount = int(action.amount)
             min_raise, max_raise = round_state.raise_bounds()
             active = round_state.button % 2
             continue_cost = round_state.pips[1 - active] - round_state.pips[active]
-            if RaiseAction in legal_actions and min_raise <= amount <= max_raise:
+            if legal_mask & RAISE_BIT and min_raise <= amount <= max_raise:
                 return action
-            elif CallAction in legal_actions and amount > continue_cost:
+            elif legal_mask & CALL_BIT and amount > continue_cost:
                 self.log.append(f"{player_name} attempted illegal RaiseAction with amount {amount}")
                 return CallAction()
             else:
                 self.log.append(f"{player_name} attempted illegal RaiseAction with amount {amount}")
-        elif type(action) in legal_actions:
+        elif legal_mask & ACTION_BITS.get(type(action), 0):
             return action
         else:
             self.log.append(f"{player_name} attempted illegal {type(action).__name__}")
 
-        return CheckAction() if CheckAction in legal_actions else FoldAction()
+        return CheckAction() if legal_mask & CHECK_BIT else FoldAction()
 
     def _create_csv_row(
         self, round_state: RoundState, player_name: str, action: str, action_amt: int
@@ -297,9 +609,9 @@ class Game:
             player_name,
             action,
             action_amt if action_amt else "",
-            " ".join(round_state.hands[0] if self.round_num % 2 == 1 else round_state.hands[1]),
-            " ".join(round_state.hands[1] if self.round_num % 2 == 1 else round_state.hands[0]),
-            " ".join(round_state.board),
+            " ".join(cards_to_str(round_state.hands[0] if self.round_num % 2 == 1 else round_state.hands[1])),
+            " ".join(cards_to_str(round_state.hands[1] if self.round_num % 2 == 1 else round_state.hands[0])),
+            " ".join(cards_to_str(round_state.board)),
             self.original_players[0].bankroll,
         ])
 
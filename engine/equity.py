@@ -0,0 +1,156 @@
+"""
+Exact all-in equity between two known hands, used for the equity chop when a hand
+goes all-in before the board is complete.
+
+Results are memoized under a canonical key, so every suit relabelling and seat swap
+of the same matchup costs a single lookup. The table is a fixed array indexed by
+the canonical key; it fills lazily and can be saved, loaded or fully precomputed
+ahead of a match.
+"""
+
+import os
+from itertools import combinations, permutations
+from math import comb
+from typing import List, Tuple
+
+import numpy as np
+
+from .evaluate import NUM_CARDS, evaluate_many
+
+EquityKey = Tuple[Tuple[int, ...], Tuple[int, ...], Tuple[int, ...]]
+
+# card -> card with its suit relabelled, one table per permutation of the 3 suits
+_SUIT_PERMUTATIONS = [
+    tuple(card - card % 3 + perm[card % 3] for card in range(NUM_CARDS))
+    for perm in permutations(range(3))
+]
+
+NUM_HANDS = comb(NUM_CARDS, 2)
+
+# (low card, high card) -> index of the two-card hand
+_HAND_INDEX = np.full((NUM_CARDS, NUM_CARDS), -1, dtype=np.int32)
+_HAND_INDEX[np.triu_indices(NUM_CARDS, 1)] = np.arange(NUM_HANDS)
+
+UNKNOWN_SHARE = -1
+
+# [hand0, hand1, board card + 1, or 0 with no board] of a canonical key -> runouts won
+# by its first hand, counting 2 per win and 1 per chop
+_EQUITY_TABLE = np.full((NUM_HANDS, NUM_HANDS, NUM_CARDS + 1), UNKNOWN_SHARE, dtype=np.int16)
+
+
+def num_runouts(board: List[int]) -> int:
+    """
+    Returns the number of ways to complete a board when both hands are known.
+    """
+    return comb(NUM_CARDS - 4 - len(board), 2 - len(board))
+
+
+def canonical_key(hand0: List[int], hand1: List[int], board: List[int]) -> Tuple[EquityKey, bool]:
+    """
+    Maps a matchup to the smallest of its suit-relabelled, seat-swapped equivalents.
+
+    Returns:
+        Tuple[EquityKey, bool]: The canonical key, and whether its first hand is hand1.
+    """
+    best = None
+    for perm in _SUIT_PERMUTATIONS:
+        h0 = tuple(sorted(perm[card] for card in hand0))
+        h1 = tuple(sorted(perm[card] for card in hand1))
+        b = tuple(sorted(perm[card] for card in board))
+        for candidate in ((h0, h1, b), False), ((h1, h0, b), True):
+            if best is None or candidate[0] < best[0]:
+                best = candidate
+    return best
+
+
+def _table_index(key: EquityKey) -> Tuple[int, int, int]:
+    hand0, hand1, board = key
+    return _HAND_INDEX[hand0], _HAND_INDEX[hand1], board[0] + 1 if board else 0
+
+
+def _compute_share(hand0: Tuple[int, ...], hand1: Tuple[int, ...], board: Tuple[int, ...]) -> int:
+    dead = set(hand0) | set(hand1) | set(board)
+    live = [card for card in range(NUM_CARDS) if card not in dead]
+    runouts = list(combinations(live, 2 - len(board)))
+    boards = np.array([board + runout for runout in runouts])
+    score0 = evaluate_many(np.broadcast_to(hand0, (len(runouts), 2)), boards)
+    score1 = evaluate_many(np.broadcast_to(hand1, (len(runouts), 2)), boards)
+    return 2 * int(np.count_nonzero(score0 > score1)) + int(np.count_nonzero(score0 == score1))
+
+
+def _lookup_share(key: EquityKey) -> int:
+    index = _table_index(key)
+    share = int(_EQUITY_TABLE[index])
+    if share == UNKNOWN_SHARE:
+        share = _EQUITY_TABLE[index] = _compute_share(*key)
+    return share
+
+
+def all_in_equity(hand0: List[int], hand1: List[int], board: List[int]) -> Tuple[int, int]:
+    """
+    Computes hand0's share of the pot over every runout of an incomplete board.
+
+    Returns:
+        Tuple[int, int]: hand0's share, counting 2 per runout won and 1 per chop,
+        and the total, which is twice the number of runouts.
+    """
+    key, swapped = canonical_key(hand0, hand1, board)
+    share = _lookup_share(key)
+    total = 2 * num_runouts(board)
+    return (total - share if swapped else share), total
+
+
+def precompute_equity_table(board_sizes: Tuple[int, ...] = (0, 1)) -> None:
+    """
+    Fills the table for every matchup with the given numbers of board cards.
+    """
+    for hand0 in combinations(range(NUM_CARDS), 2):
+        rest = [card for card in range(NUM_CARDS) if card not in hand0]
+        for hand1 in combinations(rest, 2):
+            if hand1 < hand0:  # the seat-swapped matchup covers it
+                continue
+            live = [card for card in rest if card not in hand1]
+            for board_size in board_sizes:
+                for board in combinations(live, board_size):
+                    _lookup_share(canonical_key(hand0, hand1, board)[0])
+
+
+def load_equity_table(path: str) -> bool:
+    """
+    Merges a table saved by save_equity_table into the in-memory one. Returns False
+    if the file does not exist or does not hold a table for this deck.
+    """
+    if not os.path.exists(path):
+        return False
+    try:
+        with np.load(path, allow_pickle=False) as saved:
+            shares = saved["shares"]
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Not loading the equity table {path}: {e}")
+        return False
+    if shares.shape != _EQUITY_TABLE.shape:
+        print(f"Not loading the equity table {path}: it has shape {shares.shape}")
+        return False
+    known = shares != UNKNOWN_SHARE
+    _EQUITY_TABLE[known] = shares[known]
+    return True
+
+
+def save_equity_table(path: str) -> None:
+    """
+    Writes the in-memory table to path as a compressed .npz archive.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    # a file object keeps numpy from adding .npz to a path without it
+    with open(path, "wb") as file:
+        np.savez_compressed(file, shares=_EQUITY_TABLE)
+
+
+if __name__ == "__main__":
+    import sys
+
+    precompute_equity_table()
+    save_equity_table(sys.argv[1] if len(sys.argv) > 1 else "all_in_equity.npz")
+    print(f"Saved {np.count_nonzero(_EQUITY_TABLE != UNKNOWN_SHARE)} matchups")
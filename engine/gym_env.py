@@ -6,7 +6,11 @@ import gymnasium as gym
 from gymnasium import spaces
 from collections import deque
 from .actions import (
+    ACTION_BITS,
+    CHECK_BIT,
+    RAISE_BIT,
     Action,
+    ActionHistory,
     CallAction,
     CheckAction,
     FoldAction,
@@ -19,13 +23,19 @@ from .config import (
     SMALL_BLIND,
     STARTING_STACK,
 )
-from .evaluate import ShortDeck
+from .evaluate import NUM_CARDS, ShortDeck, card_rank, card_suit
 from .roundstate import RoundState
 
-def card_to_int(card: str):
-    rank, suit = card[0], card[1]
-    suit = {"s": 0, "h": 1, "d": 2}[suit]
-    return (suit * 10 + int(rank))
+# Observation code of each card: suit * 10 + rank, with s=0, h=1, d=2 (0 means no card)
+OBS_CARD_CODES = tuple(card_suit(card) * 10 + card_rank(card) for card in range(NUM_CARDS))
+
+# legal action mask -> the observation's legal_actions vector (fold, call, check, raise)
+LEGAL_ACTION_VECTORS = np.array(
+    [[(mask >> bit) & 1 for bit in range(4)] for mask in range(16)], dtype=np.int8
+)
+
+def card_to_int(card: int):
+    return OBS_CARD_CODES[card]
 
 class PokerEnv(gym.Env):
     """
@@ -72,6 +82,7 @@ class PokerEnv(gym.Env):
 
         self.curr_round_state = None
         self.curr_round_num = 1
+        self.match_seed = None
         self.player_last_actions = [None, None]
         self.opp_bot = opp_bot
 
@@ -80,7 +91,7 @@ class PokerEnv(gym.Env):
         Returns the observation for the player_num player.
         """ 
         round_state = self.curr_round_state
-        legal_actions = round_state.legal_actions()
+        legal_mask = round_state.legal_mask
         my_pip = round_state.pips[player_num]
         opp_pip = round_state.pips[1 - player_num]
         my_stack = round_state.stacks[player_num]
@@ -98,7 +109,7 @@ class PokerEnv(gym.Env):
 
         obs = {
             "is_my_turn": int(round_state.button % 2 == player_num),
-            "legal_actions": np.array([int(action in legal_actions) for action in [FoldAction, CallAction, CheckAction, RaiseAction]]).astype(np.int8),
+            "legal_actions": LEGAL_ACTION_VECTORS[legal_mask].copy(),
             "street": round_state.street,
             "my_cards": np.array([card_to_int(card) for card in round_state.hands[player_num]]),
             "board_cards": np.array(board_cards),
@@ -123,15 +134,16 @@ class PokerEnv(gym.Env):
         for index, delta in enumerate(round_state.deltas):
             self.bankrolls[index] += delta
         was_last_round = self.curr_round_num >= self.num_rounds
-        self._reset_round()
         self.curr_round_num += 1
+        self._reset_round()
 
         opp_shown_cards = []
         for player_num in range(2):
             if self.player_last_actions[player_num] != FoldAction:
                 opp_shown_cards.append(round_state.previous_state.hands[1 - player_num])
 
-        return (self._get_observation(0, opp_shown_cards[0]), self._get_observation(1, opp_shown_cards[1])), tuple(round_state.deltas), was_last_round, False, {"mode": self.game_mode}
+        info = {"mode": self.game_mode, "history": round_state.previous_state.history}
+        return (self._get_observation(0, opp_shown_cards[0]), self._get_observation(1, opp_shown_cards[1])), tuple(round_state.deltas), was_last_round, False, info
 
     def _step_without_opp(self, action):
         """
@@ -177,11 +189,10 @@ class PokerEnv(gym.Env):
         # Shuffle the deck and deal the hands
         pips = [SMALL_BLIND, BIG_BLIND]
         stacks = [STARTING_STACK - SMALL_BLIND, STARTING_STACK - BIG_BLIND]
-        deck = ShortDeck()
-        deck.shuffle()
+        deck = ShortDeck.from_seed(self.match_seed, self.curr_round_num)
         hands = [deck.deal(2), deck.deal(2)]
 
-        self.curr_round_state = RoundState(0, 0, pips, stacks, hands, [], deck, None)
+        self.curr_round_state = RoundState(0, 0, pips, stacks, hands, [], deck, ActionHistory())
         self.new_actions = [deque(), deque()]  
 
         return (self._get_observation(0), self._get_observation(1))
@@ -189,7 +200,10 @@ class PokerEnv(gym.Env):
     def reset(self, seed=None, options=None):
         """
         Resets the entire game.
+        Passing a seed makes the deals of the whole game reproducible.
         """
+        super().reset(seed=seed)
+        self.match_seed = int(self.np_random.integers(2**63))
         self.bankrolls = [0, 0]
         self.curr_round_num = 1
         obs1, obs2 = self._reset_round()
@@ -213,23 +227,23 @@ class PokerEnv(gym.Env):
         Returns:
             Action: The validated (or corrected) action.
         """
-        legal_actions = (
-            round_state.legal_actions()
+        legal_mask = (
+            round_state.legal_mask
             if isinstance(round_state, RoundState)
-            else {CheckAction}
+            else CHECK_BIT
         )
         if isinstance(action, RaiseAction):
             amount = int(action.amount)
             min_raise, max_raise = round_state.raise_bounds()
-            if RaiseAction in legal_actions and min_raise <= amount <= max_raise:
+            if legal_mask & RAISE_BIT and min_raise <= amount <= max_raise:
                 return action
             else:
                 print(
                     f"Player {player_name} attempted illegal RaiseAction with amount {amount}"
                 )
-        elif type(action) in legal_actions:
+        elif legal_mask & ACTION_BITS.get(type(action), 0):
             return action
         else:
             print(f"Player {player_name} attempted illegal {type(action).__name__}")
 
-        return CheckAction() if CheckAction in legal_actions else FoldAction()
+        return CheckAction() if legal_mask & CHECK_BIT else FoldAction()
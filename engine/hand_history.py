@@ -0,0 +1,194 @@
+"""
+Columnar binary hand history, written alongside the text and CSV logs.
+
+A match is stored as two flat files of fixed-width NumPy records, one record per
+round and one per action, plus a small JSON header. The record files can be
+memory-mapped, so a match is analysed with vectorized NumPy queries instead of
+parsing CSV. Players are numbered in match order (0 is the first player named
+in the header), so columns stay per player as seats alternate.
+"""
+
+import json
+import os
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from .actions import ActionHistory
+from .log_writer import LogSink
+
+ROUND_DTYPE = np.dtype(
+    [
+        ("round", "<u2"),
+        ("small_blind", "u1"),  # player in the small blind
+        ("hands", "u1", (2, 2)),  # per player
+        ("board", "u1", (2,)),  # NO_CARD where not dealt
+        ("deltas", "<i2", (2,)),  # per player
+        ("first_action", "<u4"),  # index of the round's first record in the actions file
+        ("num_actions", "u1"),
+    ]
+)
+
+ACTION_DTYPE = np.dtype(
+    [
+        ("round", "<u2"),
+        ("street", "u1"),
+        ("player", "u1"),
+        ("kind", "u1"),  # FOLD, CALL, CHECK or RAISE
+        ("amount", "<u2"),  # raise-to amount, 0 for other actions
+    ]
+)
+
+NO_CARD = 255
+FORMAT_VERSION = 1
+
+
+def history_files(prefix: str) -> Tuple[str, str, str]:
+    """
+    Returns the header, round and action file names of the hand history at prefix.
+    """
+    return f"{prefix}.json", f"{prefix}_rounds.bin", f"{prefix}_actions.bin"
+
+
+class HandHistoryWriter:
+    """
+    Appends rounds to a hand history, writing buffered records out on flush().
+    """
+
+    def __init__(
+        self, sinks: Sequence[LogSink], seed: int, player_names: List[str], duplicate: bool = False
+    ) -> None:
+        """
+        Args:
+            sinks (Sequence[LogSink]): Where the header, round and action files are
+                written, in the order of history_files.
+            seed (int): The match seed.
+            player_names (List[str]): The players, in match order.
+            duplicate (bool): Whether the match is played in duplicate.
+        """
+        self.sinks = sinks
+        self.header = {
+            "version": FORMAT_VERSION,
+            "seed": seed,
+            "players": player_names,
+            "duplicate": duplicate,
+            "round_dtype": ROUND_DTYPE.descr,
+            "action_dtype": ACTION_DTYPE.descr,
+        }
+        self.rounds: List[tuple] = []
+        self.actions: List[tuple] = []
+        self.num_actions = 0
+        self.started = False
+
+    def add_round(
+        self,
+        round_num: int,
+        small_blind: int,
+        hands: List[List[int]],
+        board: List[int],
+        deltas: List[int],
+        history: ActionHistory,
+    ) -> None:
+        """
+        Records a finished round. hands and deltas are in seat order, as in RoundState,
+        and small_blind is the player in seat 0.
+        """
+        seats = [small_blind, 1 - small_blind]
+        player_hands = [None, None]
+        player_deltas = [0, 0]
+        for seat, player in enumerate(seats):
+            player_hands[player] = hands[seat]
+            player_deltas[player] = deltas[seat]
+        self.rounds.append((
+            round_num,
+            small_blind,
+            player_hands,
+            list(board) + [NO_CARD] * (2 - len(board)),
+            player_deltas,
+            self.num_actions,
+            len(history),
+        ))
+        kinds = history.kinds
+        amounts = history.amounts
+        for street in range(history.num_streets):
+            # the small blind acts first preflop, the big blind on later streets
+            first_seat = 0 if street == 0 else 1
+            for offset, index in enumerate(history.street_range(street)):
+                player = seats[(first_seat + offset) % 2]
+                self.actions.append((round_num, street, player, kinds[index], amounts[index]))
+        self.num_actions += len(history)
+
+    def flush(self) -> None:
+        header_sink, rounds_sink, actions_sink = self.sinks
+        if not self.started:
+            header_sink.write(json.dumps(self.header))
+            # create the record files even if the match has no rounds
+            rounds_sink.write(b"")
+            actions_sink.write(b"")
+            self.started = True
+        for sink, records, dtype in zip(
+            (rounds_sink, actions_sink), (self.rounds, self.actions), (ROUND_DTYPE, ACTION_DTYPE)
+        ):
+            if records:
+                sink.write(np.array(records, dtype=dtype).tobytes())
+                records.clear()
+
+    def close(self) -> None:
+        self.flush()
+        for sink in self.sinks:
+            sink.close()
+
+
+class HandHistory:
+    """
+    A memory-mapped hand history.
+
+    Attributes:
+        seed (int): The match seed.
+        players (List[str]): The players, in match order.
+        duplicate (bool): Whether each deal was played twice with the seats swapped.
+        rounds (np.ndarray): One ROUND_DTYPE record per round.
+        actions (np.ndarray): One ACTION_DTYPE record per action, grouped by round.
+    """
+
+    def __init__(self, prefix: str) -> None:
+        header_path, rounds_path, actions_path = history_files(prefix)
+        with open(header_path) as file:
+            header = json.load(file)
+        if header["version"] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported hand history version {header['version']}")
+        self.seed: int = header["seed"]
+        self.players: List[str] = header["players"]
+        self.duplicate: bool = header.get("duplicate", False)
+        self.rounds = _memmap(rounds_path, ROUND_DTYPE)
+        self.actions = _memmap(actions_path, ACTION_DTYPE)
+
+    def __len__(self) -> int:
+        return len(self.rounds)
+
+    def round_actions(self, index: int) -> np.ndarray:
+        """
+        Returns the action records of the index-th round.
+        """
+        first = int(self.rounds["first_action"][index])
+        return self.actions[first : first + int(self.rounds["num_actions"][index])]
+
+    def bankrolls(self) -> np.ndarray:
+        """
+        Returns each player's cumulative bankroll after every round, as a (rounds, 2) array.
+        """
+        return np.cumsum(self.rounds["deltas"], axis=0, dtype=np.int64)
+
+    def pair_scores(self) -> np.ndarray:
+        """
+        Returns player 0's net result on each deal of a duplicate match, i.e. over each
+        pair of rounds that share a deal. A trailing unpaired round is left out.
+        """
+        deltas = self.rounds["deltas"][:, 0].astype(np.int64)
+        return deltas[: len(deltas) // 2 * 2].reshape(-1, 2).sum(axis=1)
+
+
+def _memmap(path: str, dtype: np.dtype) -> np.ndarray:
+    if os.path.getsize(path) == 0:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r")
@@ -0,0 +1,113 @@
+"""
+Per-bot action latency statistics.
+
+Each Client records how long every action request took, keyed by the street it
+was made on and the action the bot answered with, along with how many requests
+needed gRPC retries and how many timed out. At the end of a match the game logs
+the percentiles and writes them all to a JSON summary.
+"""
+
+from collections import defaultdict
+from typing import Dict, List
+
+import numpy as np
+
+from .actions import STREET_NAMES
+
+# Upper edges of the histogram buckets, in milliseconds; the last bucket is open-ended
+HISTOGRAM_EDGES_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000]
+PERCENTILES = [50, 90, 99]
+
+
+class LatencyStats:
+    """
+    Collects one bot's action request latencies.
+    """
+
+    def __init__(self) -> None:
+        self.samples: Dict[tuple, List[float]] = defaultdict(list)
+        self.requests = 0
+        self.retried = 0
+        self.retries = 0
+        self.timeouts = 0
+        self.errors = 0
+
+    def record(self, street: int, action: str, seconds: float, retries: int = 0) -> None:
+        """
+        Records one action request.
+
+        Args:
+            street (int): The street the request was made on.
+            action (str): The action the bot answered with, e.g. "Call", or "Error".
+            seconds (float): How long the request took, retries included.
+            retries (int): How many times gRPC retried the request.
+        """
+        self.samples[(street, action)].append(seconds)
+        self.requests += 1
+        self.retried += retries > 0
+        self.retries += retries
+
+    def record_timeout(self) -> None:
+        self.timeouts += 1
+
+    def record_error(self) -> None:
+        self.errors += 1
+
+    def summary(self) -> Dict:
+        """
+        Returns the statistics as a JSON-serializable dict: overall, per street, per
+        action and per (street, action) pair, with latencies in milliseconds.
+        """
+        streets: Dict[str, List[float]] = defaultdict(list)
+        actions: Dict[str, List[float]] = defaultdict(list)
+        by_street_and_action = {}
+        for (street, action), samples in sorted(self.samples.items()):
+            streets[STREET_NAMES[street]].extend(samples)
+            actions[action].extend(samples)
+            by_street_and_action[f"{STREET_NAMES[street]}/{action}"] = _describe(samples)
+        return {
+            "requests": self.requests,
+            "retried_requests": self.retried,
+            "retries": self.retries,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "overall": _describe([sample for samples in self.samples.values() for sample in samples]),
+            "by_street": {name: _describe(samples) for name, samples in streets.items()},
+            "by_action": {name: _describe(samples) for name, samples in actions.items()},
+            "by_street_and_action": by_street_and_action,
+            "histogram_edges_ms": HISTOGRAM_EDGES_MS,
+        }
+
+    def report(self, name: str) -> List[str]:
+        """
+        Returns human-readable log lines summarizing the bot's latencies.
+        """
+        summary = self.summary()
+        lines = [
+            f"{name} latency: {summary['requests']} requests, {summary['retried_requests']} retried "
+            f"({summary['retries']} retries), {summary['timeouts']} timeouts, {summary['errors']} errors"
+        ]
+        rows = [("all", summary["overall"])]
+        rows += [(street, stats) for street, stats in summary["by_street"].items()]
+        rows += [(action, stats) for action, stats in summary["by_action"].items()]
+        for label, stats in rows:
+            if stats["count"]:
+                lines.append(
+                    f"  {label:<8} n={stats['count']:<5} p50={stats['p50']:.2f}ms p90={stats['p90']:.2f}ms "
+                    f"p99={stats['p99']:.2f}ms max={stats['max']:.2f}ms"
+                )
+        return lines
+
+
+def _describe(samples: List[float]) -> Dict:
+    if not samples:
+        return {"count": 0}
+    ms = np.asarray(samples) * 1000
+    stats = {"count": len(samples), "mean": float(ms.mean())}
+    for percentile, value in zip(PERCENTILES, np.percentile(ms, PERCENTILES)):
+        stats[f"p{percentile}"] = float(value)
+    stats["max"] = float(ms.max())
+    stats["histogram"] = np.bincount(
+        np.searchsorted(HISTOGRAM_EDGES_MS, ms), minlength=len(HISTOGRAM_EDGES_MS) + 1
+    ).tolist()
+    return stats
@@ -0,0 +1,100 @@
+"""
+In-process transport: drives a pokerbot's servicer directly instead of over gRPC.
+
+The engine builds exactly the same protobuf requests, charges the same game clock
+and validates actions the same way; only the network hop is skipped.
+"""
+
+import importlib.util
+import itertools
+import os
+import sys
+import time
+from typing import Tuple
+
+import grpc
+
+from .client import Client, MessageCall
+from shared.pokerbot_pb2 import ActionRequest, ActionResponse
+
+_module_ids = itertools.count()
+
+
+class LocalRpcError(grpc.RpcError):
+    """
+    An exception raised by an in-process servicer, surfaced like a failed RPC.
+    """
+
+
+class LocalStub:
+    """
+    Has the same methods as PokerBotStub but calls a PokerBotServicer in this process.
+    """
+
+    def __init__(self, servicer) -> None:
+        self.servicer = servicer
+
+    def _call(self, method, request):
+        try:
+            return method(request, None)
+        except Exception as e:
+            raise LocalRpcError(f"{type(e).__name__}: {e}") from e
+
+    # deadlines are accepted for compatibility, but a call in this process cannot be cut short
+    def ReadyCheck(self, request, timeout=None):
+        return self._call(self.servicer.ReadyCheck, request)
+
+    def RequestAction(self, request, timeout=None):
+        return self._call(self.servicer.RequestAction, request)
+
+    def EndRound(self, request, timeout=None):
+        return self._call(self.servicer.EndRound, request)
+
+
+class LocalClient(Client):
+    """
+    A Client whose pokerbot runs in the engine's process.
+    """
+
+    def __init__(self, name: str, servicer) -> None:
+        """
+        Args:
+            name (str): The name of the player.
+            servicer: The pokerbot's PokerBotServicer, e.g. a skeleton Runner wrapping a Bot.
+        """
+        self.servicer = servicer
+        super().__init__(name, "in-process")
+        self.streaming = False
+
+    def _connect_with_retries(self) -> None:
+        self.stub = LocalStub(self.servicer)
+
+    def _send_action_request(self, request: ActionRequest) -> Tuple[ActionResponse, MessageCall]:
+        # with no network in between, the whole call is the bot's time
+        start_time = time.perf_counter()
+        response = self.stub.RequestAction(request)
+        return response, MessageCall(time.perf_counter() - start_time)
+
+
+def load_bot(bot_path: str, class_name: str = "Player"):
+    """
+    Imports a pokerbot file (e.g. python_skeleton/player.py) and wraps a new instance
+    of its bot class in the skeleton's Runner.
+
+    The bot file's directory is put on sys.path so it can import its skeleton package;
+    all bots loaded into one process share the first such package.
+
+    Returns:
+        Runner: The bot's servicer, ready to be passed to LocalClient.
+    """
+    bot_dir = os.path.dirname(os.path.abspath(bot_path))
+    if bot_dir not in sys.path:
+        sys.path.insert(0, bot_dir)
+    module_name = f"local_bot_{next(_module_ids)}"
+    spec = importlib.util.spec_from_file_location(module_name, bot_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    from skeleton.runner import Runner
+
+    return Runner(getattr(module, class_name)())
@@ -0,0 +1,118 @@
+"""
+Buffered, streaming writers for the game's logs.
+
+Each writer keeps the list-like append() the game already uses, but only holds
+entries until its buffer fills or the game flushes it at the end of a round. The
+text goes to a sink, a local file by default, so memory stays flat over a match and
+a crashed match still leaves its logs up to the last flush.
+"""
+
+import csv
+import os
+from abc import ABC, abstractmethod
+from io import StringIO
+from typing import List, Optional, Union
+
+
+class LogSink(ABC):
+    """
+    Destination of a streaming log. Subclasses implement write and may override close.
+    """
+
+    @abstractmethod
+    def write(self, text: Union[str, bytes]) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class FileSink(LogSink):
+    """
+    Writes to a local file, which is only created on the first write. The file is
+    binary if that write is bytes, as for the hand history, and text otherwise.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.file = None
+
+    def write(self, text: Union[str, bytes]) -> None:
+        if self.file is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            print(f"Writing {self.path}")
+            if isinstance(text, bytes):
+                self.file = open(self.path, "wb")
+            else:
+                self.file = open(self.path, "w", newline="")
+        self.file.write(text)
+        self.file.flush()
+
+    def close(self) -> None:
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+class StreamingLog:
+    """
+    A text log whose lines are joined by newlines, as in "\\n".join(lines).
+    """
+
+    def __init__(self, sink: LogSink, buffer_size: int = 64 * 1024, lines: Optional[List[str]] = None) -> None:
+        """
+        Args:
+            sink (LogSink): Where the log is written.
+            buffer_size (int): Buffered characters that trigger a flush between explicit flushes.
+            lines (Optional[List[str]]): Initial lines.
+        """
+        self.sink = sink
+        self.buffer_size = buffer_size
+        self.buffer: List[str] = []
+        self.buffered = 0
+        self.num_entries = 0
+        for line in lines or []:
+            self.append(line)
+
+    def _format(self, entry) -> str:
+        return entry if self.num_entries == 0 else "\n" + entry
+
+    def append(self, entry) -> None:
+        text = self._format(entry)
+        self.num_entries += 1
+        self.buffer.append(text)
+        self.buffered += len(text)
+        if self.buffered >= self.buffer_size:
+            self.flush()
+
+    def __len__(self) -> int:
+        return self.num_entries
+
+    def flush(self) -> None:
+        if self.buffer:
+            self.sink.write("".join(self.buffer))
+            self.buffer.clear()
+            self.buffered = 0
+
+    def close(self) -> None:
+        self.flush()
+        self.sink.close()
+
+
+class StreamingCSVLog(StreamingLog):
+    """
+    A CSV log, formatted exactly as csv.writer formats rows.
+    """
+
+    def __init__(self, sink: LogSink, buffer_size: int = 64 * 1024, rows: Optional[List[List]] = None) -> None:
+        self._text = StringIO()
+        self._writer = csv.writer(self._text)
+        super().__init__(sink, buffer_size, rows)
+
+    def _format(self, entry) -> str:
+        self._text.seek(0)
+        self._text.truncate()
+        self._writer.writerow(entry)
+        return self._text.getvalue()
@@ -0,0 +1,125 @@
+"""
+Opt-in timing of the phases of each round.
+
+Game times every phase of run_round with a PhaseProfiler: dealing, logging, action
+requests (split into the bot's own time, which the bot reports in trailing
+metadata, and the network and serialization time around it), validation, state
+transitions, showdowns, end-of-round notifications and log flushing. Totals are
+aggregated over the match and exported as JSON. When profiling is off Game uses a
+NullProfiler, whose methods do nothing.
+"""
+
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+PHASES = [
+    "deal",
+    "log_round_state",
+    "request_action",
+    "bot",
+    "network",
+    "validate_action",
+    "log_action",
+    "proceed",
+    "showdown",
+    "end_round",
+    "record_round",
+    "flush_logs",
+]
+
+
+class PhaseProfiler:
+    """
+    Accumulates the time spent in each phase over a match.
+    """
+
+    def __init__(self) -> None:
+        self.totals: Dict[str, float] = defaultdict(float)
+        self.counts: Dict[str, int] = defaultdict(int)
+        self.rounds = 0
+        self.match_start = time.perf_counter()
+
+    @staticmethod
+    def start() -> float:
+        return time.perf_counter()
+
+    def stop(self, phase: str, start: float) -> None:
+        """
+        Charges the time since start to a phase.
+        """
+        self.totals[phase] += time.perf_counter() - start
+        self.counts[phase] += 1
+
+    def stop_request(self, start: float, bot_time: Optional[float]) -> None:
+        """
+        Charges an action request, splitting it into bot and network time when the bot
+        reported how long it took.
+        """
+        duration = time.perf_counter() - start
+        self.totals["request_action"] += duration
+        self.counts["request_action"] += 1
+        if bot_time is not None:
+            self.totals["bot"] += bot_time
+            self.counts["bot"] += 1
+            self.totals["network"] += max(duration - bot_time, 0.0)
+            self.counts["network"] += 1
+
+    def end_round(self) -> None:
+        self.rounds += 1
+
+    def summary(self) -> Dict:
+        """
+        Returns the per-phase totals as a JSON-serializable dict.
+        """
+        elapsed = time.perf_counter() - self.match_start
+        phases = {}
+        for phase in PHASES + sorted(set(self.totals) - set(PHASES)):
+            if self.counts[phase]:
+                phases[phase] = {
+                    "total_s": self.totals[phase],
+                    "count": self.counts[phase],
+                    "mean_us": self.totals[phase] / self.counts[phase] * 1e6,
+                    "share": self.totals[phase] / elapsed if elapsed else 0.0,
+                }
+        return {
+            "rounds": self.rounds,
+            "elapsed_s": elapsed,
+            "rounds_per_s": self.rounds / elapsed if elapsed else 0.0,
+            "phases": phases,
+        }
+
+    def report(self) -> List[str]:
+        """
+        Returns human-readable log lines summarizing the profile.
+        """
+        summary = self.summary()
+        lines = [
+            f"Phase profile: {summary['rounds']} rounds in {summary['elapsed_s']:.2f}s "
+            f"({summary['rounds_per_s']:.1f} rounds/s)"
+        ]
+        for phase, stats in summary["phases"].items():
+            lines.append(
+                f"  {phase:<16} {stats['total_s']:>8.3f}s {stats['share']:>6.1%} "
+                f"n={stats['count']:<6} mean={stats['mean_us']:.1f}us"
+            )
+        return lines
+
+
+class NullProfiler:
+    """
+    Stands in for PhaseProfiler when profiling is off.
+    """
+
+    @staticmethod
+    def start() -> float:
+        return 0.0
+
+    def stop(self, phase: str, start: float) -> None:
+        pass
+
+    def stop_request(self, start: float, bot_time: Optional[float]) -> None:
+        pass
+
+    def end_round(self) -> None:
+        pass
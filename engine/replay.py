@@ -0,0 +1,172 @@
+"""
+Deterministic hand replay from (match seed, round number, action sequence).
+
+A round's cards depend only on the match seed and round number (see deal_order), so
+its action sequence is all that needs to be recorded to rebuild it. Actions are
+stored as short tokens: "F" fold, "C" call, "K" check and "R<amount>" raise.
+
+The game writes one replay line per round:
+    <round>\t<small blind player>\t<small blind delta>\t<space-separated tokens>
+after a "seed\t<match seed>" header, which ends in "\tduplicate" for duplicate
+matches (see deal_number).
+"""
+
+from collections import namedtuple
+from typing import Iterable, List, Union
+
+from .actions import (
+    ACTION_BITS,
+    RAISE_BIT,
+    Action,
+    ActionHistory,
+    CallAction,
+    CheckAction,
+    FoldAction,
+    RaiseAction,
+    TerminalState,
+)
+from .config import BIG_BLIND, SMALL_BLIND, STARTING_STACK
+from .evaluate import ShortDeck, deal_number, deal_order
+from .roundstate import RoundState
+
+ReplayRecord = namedtuple("ReplayRecord", ["round_num", "small_blind", "delta", "actions"])
+ReplayLog = namedtuple("ReplayLog", ["seed", "duplicate", "records"])
+
+_TOKENS = {FoldAction: "F", CallAction: "C", CheckAction: "K"}
+_ACTIONS = {"F": FoldAction(), "C": CallAction(), "K": CheckAction()}
+
+
+def encode_actions(actions: Iterable[Action]) -> str:
+    """
+    Encodes actions as space-separated replay tokens.
+    """
+    return " ".join(
+        f"R{action.amount}" if isinstance(action, RaiseAction) else _TOKENS[type(action)]
+        for action in actions
+    )
+
+
+def decode_actions(text: str) -> List[Action]:
+    """
+    Decodes space-separated replay tokens.
+
+    Raises:
+        ValueError: If a token is not a valid action.
+    """
+    actions = []
+    for token in text.split():
+        if token[0] == "R":
+            actions.append(RaiseAction(int(token[1:])))
+        elif token in _ACTIONS:
+            actions.append(_ACTIONS[token])
+        else:
+            raise ValueError(f"Unknown action token {token!r}")
+    return actions
+
+
+def new_round_state(seed: int, round_num: int, duplicate: bool = False) -> RoundState:
+    """
+    Deals a round exactly as Game.run_round does and returns its initial state.
+    """
+    deck = ShortDeck(deal_order(seed, deal_number(round_num, duplicate)))
+    hands = [deck.deal(2), deck.deal(2)]
+    pips = [SMALL_BLIND, BIG_BLIND]
+    stacks = [STARTING_STACK - SMALL_BLIND, STARTING_STACK - BIG_BLIND]
+    return RoundState(0, 0, pips, stacks, hands, [], deck, ActionHistory())
+
+
+def replay_hand(
+    seed: int, round_num: int, actions: Union[str, Iterable[Action]], duplicate: bool = False
+) -> Union[RoundState, TerminalState]:
+    """
+    Rebuilds a round by re-dealing it and applying its actions, without any bots.
+
+    Args:
+        seed (int): The match seed.
+        round_num (int): The round number, starting from 1.
+        actions (Union[str, Iterable[Action]]): The actions, or their replay tokens.
+        duplicate (bool): Whether the round is from a duplicate match.
+
+    Returns:
+        Union[RoundState, TerminalState]: The state after the last action, which is a
+        TerminalState with the round's deltas if the actions complete the round.
+
+    Raises:
+        ValueError: If an action is illegal or comes after the round has ended.
+    """
+    if isinstance(actions, str):
+        actions = decode_actions(actions)
+    round_state = new_round_state(seed, round_num, duplicate)
+    for index, action in enumerate(actions):
+        if isinstance(round_state, TerminalState):
+            raise ValueError(f"Action {index} comes after the end of round {round_num}")
+        legal = round_state.legal_mask & ACTION_BITS.get(type(action), 0)
+        if legal == RAISE_BIT:
+            min_raise, max_raise = round_state.raise_bounds()
+            legal = min_raise <= action.amount <= max_raise
+        if not legal:
+            raise ValueError(f"Action {index} ({action}) is illegal in round {round_num}")
+        round_state = round_state.proceed(action)
+    return round_state
+
+
+def format_replay_record(record: ReplayRecord) -> str:
+    return "\t".join(
+        [str(record.round_num), record.small_blind, str(record.delta), encode_actions(record.actions)]
+    )
+
+
+def format_replay_header(seed: int, duplicate: bool = False) -> str:
+    return f"seed\t{seed}\tduplicate" if duplicate else f"seed\t{seed}"
+
+
+def read_replay_log(lines: Iterable[str]) -> ReplayLog:
+    """
+    Parses a replay log written by the game.
+
+    Returns:
+        ReplayLog: The match seed, whether the match was duplicate and one record per round.
+    """
+    lines = iter(lines)
+    header = next(lines).rstrip("\n").split("\t")
+    seed, duplicate = int(header[1]), header[2:] == ["duplicate"]
+    records = []
+    for line in lines:
+        line = line.rstrip("\n")
+        if not line:
+            continue
+        round_num, small_blind, delta, tokens = line.split("\t")
+        records.append(ReplayRecord(int(round_num), small_blind, int(delta), decode_actions(tokens)))
+    return ReplayLog(seed, duplicate, records)
+
+
+def verify_replay_log(lines: Iterable[str]) -> List[int]:
+    """
+    Replays every round of a replay log and checks its recorded delta.
+
+    Returns:
+        List[int]: The round numbers whose replay is illegal, incomplete or disagrees
+        with the log.
+    """
+    seed, duplicate, records = read_replay_log(lines)
+    mismatches = []
+    for record in records:
+        try:
+            state = replay_hand(seed, record.round_num, record.actions, duplicate)
+        except ValueError:
+            mismatches.append(record.round_num)
+            continue
+        if not isinstance(state, TerminalState) or state.deltas[0] != record.delta:
+            mismatches.append(record.round_num)
+    return mismatches
+
+
+if __name__ == "__main__":
+    import sys
+
+    with open(sys.argv[1]) as file:
+        mismatches = verify_replay_log(file)
+    if mismatches:
+        print(f"{len(mismatches)} rounds do not replay: {mismatches}")
+        sys.exit(1)
+    print("All rounds replay to their logged deltas")
@@ -1,8 +1,13 @@
 from collections import namedtuple
-from typing import Set, Type
-from itertools import combinations
+from functools import cached_property
+from typing import FrozenSet, List, Optional, Tuple, Type
 
 from .actions import (
+    CALL_BIT,
+    CHECK_BIT,
+    FOLD_BIT,
+    LEGAL_ACTION_SETS,
+    RAISE_BIT,
     Action,
     CallAction,
     CheckAction,
@@ -10,10 +15,58 @@ from .actions import (
     RaiseAction,
     TerminalState,
 )
-from .config import BIG_BLIND, STARTING_STACK
+from .config import BIG_BLIND, SMALL_BLIND, STARTING_STACK
+from .equity import all_in_equity
 from .evaluate import evaluate
 
 
+def showdown_delta(hands: List[List[int]], board: List[int], stacks: List[int]) -> int:
+    """
+    Returns player 0's payoff at showdown, using the exact equity chop if the
+    players went all-in before the board was complete.
+    """
+    if len(board) < 2: #equity chop ALL IN!
+        p0Eq, comb = all_in_equity(hands[0], hands[1], board)
+        return round(2 * STARTING_STACK * p0Eq / comb) - STARTING_STACK
+    score0 = evaluate(hands[0], board)
+    score1 = evaluate(hands[1], board)
+    if score0 > score1:
+        return STARTING_STACK - stacks[1]
+    elif score0 < score1:
+        return stacks[0] - STARTING_STACK
+    else:  # split the pot
+        return (stacks[0] - stacks[1]) // 2
+
+
+def legal_action_mask(button: int, pips: List[int], stacks: List[int]) -> int:
+    """
+    Returns the active player's legal moves as a bitmask of FOLD_BIT, CALL_BIT,
+    CHECK_BIT and RAISE_BIT.
+    """
+    active = button % 2
+    continue_cost = pips[1 - active] - pips[active]
+
+    if continue_cost == 0:
+        # we can only raise the stakes if both players can afford it
+        bets_forbidden = stacks[0] == 0 or stacks[1] == 0
+        return CHECK_BIT if bets_forbidden else CHECK_BIT | RAISE_BIT
+
+    # If the active player must contribute more chips to continue
+    raises_forbidden = continue_cost >= stacks[active] or stacks[1 - active] == 0
+    return FOLD_BIT | CALL_BIT if raises_forbidden else FOLD_BIT | CALL_BIT | RAISE_BIT
+
+
+def raise_bounds(button: int, pips: List[int], stacks: List[int]) -> Tuple[int, int]:
+    """
+    Returns a tuple of the minimum and maximum legal raises of the active player.
+    """
+    active = button % 2
+    continue_cost = pips[1 - active] - pips[active]
+    max_contribution = min(stacks[active], stacks[1 - active] + continue_cost)
+    min_contribution = min(max_contribution, continue_cost + max(continue_cost, BIG_BLIND))
+    return (pips[active] + min_contribution, pips[active] + max_contribution)
+
+
 class RoundState(
     namedtuple(
         "_RoundState",
@@ -25,76 +78,44 @@ class RoundState(
             "hands",
             "board",
             "deck",
-            "previous_state",
+            "history",
         ],
     )
 ):
-    """Encodes the game tree for one round of poker."""
+    """
+    Encodes the game tree for one round of poker.
+    history is the hand's ActionHistory, so states do not link to their predecessors.
+    """
 
     def showdown(self) -> TerminalState:
         """
         Compares the player's hands and computes payoffs.
         """
-        if len(self.board) < 2: #equity chop ALL IN!
-            p0Eq = 0
-            comb = 0
-            for combo in combinations(self.deck.cards, 2 - len(self.board)):
-                board = self.board + list(combo)
-                score0 = evaluate(self.hands[0], board)
-                score1 = evaluate(self.hands[1], board)
-                if score0 > score1: p0Eq += 2
-                if score0 == score1: p0Eq += 1
-                comb += 2
-            delta = round(2 * STARTING_STACK * p0Eq / comb) - STARTING_STACK
-        else:
-            score0 = evaluate(self.hands[0], self.board)
-            score1 = evaluate(self.hands[1], self.board)
-            if score0 > score1:
-                delta = STARTING_STACK - self.stacks[1]
-            elif score0 < score1:
-                delta = self.stacks[0] - STARTING_STACK
-            else:  # split the pot
-                delta = (self.stacks[0] - self.stacks[1]) // 2
+        delta = showdown_delta(self.hands, self.board, self.stacks)
         return TerminalState([delta, -delta], self)
 
-    def legal_actions(self) -> Set[Type]:
+    @cached_property
+    def legal_mask(self) -> int:
         """
-        Returns a set which corresponds to the active player's legal moves.
+        The active player's legal moves as a bitmask of FOLD_BIT, CALL_BIT, CHECK_BIT and RAISE_BIT.
         """
-        active = self.button % 2
-        continue_cost = self.pips[1 - active] - self.pips[active]
+        return legal_action_mask(self.button, self.pips, self.stacks)
 
-        if continue_cost == 0:
-            # we can only raise the stakes if both players can afford it
-            bets_forbidden = self.stacks[0] == 0 or self.stacks[1] == 0
-            return {CheckAction} if bets_forbidden else {CheckAction, RaiseAction}
+    @cached_property
+    def _raise_bounds(self) -> Tuple[int, int]:
+        return raise_bounds(self.button, self.pips, self.stacks)
 
-        # If the active player must contribute more chips to continue
-        raises_forbidden = (
-            continue_cost >= self.stacks[active] or self.stacks[1 - active] == 0
-        )
-        return (
-            {FoldAction, CallAction}
-            if raises_forbidden
-            else {FoldAction, CallAction, RaiseAction}
-        )
+    def legal_actions(self) -> FrozenSet[Type]:
+        """
+        Returns a set which corresponds to the active player's legal moves.
+        """
+        return LEGAL_ACTION_SETS[self.legal_mask]
 
-    def raise_bounds(self) -> tuple[int, int]:
+    def raise_bounds(self) -> Tuple[int, int]:
         """
         Returns a tuple of the minimum and maximum legal raises.
         """
-        active = self.button % 2
-        continue_cost = self.pips[1 - active] - self.pips[active]
-        max_contribution = min(
-            self.stacks[active], self.stacks[1 - active] + continue_cost
-        )
-        min_contribution = min(
-            max_contribution, continue_cost + max(continue_cost, BIG_BLIND)
-        )
-        return (
-            self.pips[active] + min_contribution,
-            self.pips[active] + max_contribution,
-        )
+        return self._raise_bounds
 
     def proceed_street(self) -> "RoundState":
         """
@@ -116,7 +137,7 @@ class RoundState(
             hands=self.hands,
             board=self.board,
             deck=self.deck,
-            previous_state=self,
+            history=self.history.new_street(),
         )
 
     def proceed(self, action: Action) -> "RoundState":
@@ -124,13 +145,14 @@ class RoundState(
         Advances the game tree by one action performed by the active player.
         """
         active = self.button % 2
+        history = self.history.append(action)
         if isinstance(action, FoldAction):
             delta = (
                 self.stacks[0] - STARTING_STACK
                 if active == 0
                 else STARTING_STACK - self.stacks[1]
             )
-            return TerminalState([delta, -delta], self)
+            return TerminalState([delta, -delta], self._replace(history=history))
 
         new_pips = list(self.pips)
         new_stacks = list(self.stacks)
@@ -145,7 +167,7 @@ class RoundState(
                     hands=self.hands,
                     board=self.board,
                     deck=self.deck,
-                    previous_state=self,
+                    history=history,
                 )
             contribution = new_pips[1 - active] - new_pips[active]
             new_stacks[active] -= contribution
@@ -158,14 +180,14 @@ class RoundState(
                 hands=self.hands,
                 board=self.board,
                 deck=self.deck,
-                previous_state=self,
+                history=history,
             )
             return state.proceed_street()
 
         elif isinstance(action, CheckAction):
             if (self.street == 0 and self.button > 0) or self.button > 1:
                 # both players acted
-                return self.proceed_street()
+                return self._replace(history=history).proceed_street()
             return RoundState(
                 button=self.button + 1,
                 street=self.street,
@@ -174,7 +196,7 @@ class RoundState(
                 hands=self.hands,
                 board=self.board,
                 deck=self.deck,
-                previous_state=self,
+                history=history,
             )
 
         elif isinstance(action, RaiseAction):
@@ -189,5 +211,161 @@ class RoundState(
                 hands=self.hands,
                 board=self.board,
                 deck=self.deck,
-                previous_state=self,
+                history=history,
+            )
+
+
+class SearchState:
+    """
+    A mutable, slotted counterpart of RoundState for tree search.
+
+    apply() advances the state in place by one action and undo() reverts the
+    last one, following exactly the transitions of RoundState.proceed. Board
+    cards are revealed from a fixed runout instead of being dealt from a deck,
+    and each apply only pushes a few existing values onto an undo trail.
+    """
+
+    __slots__ = ("button", "street", "pips", "stacks", "hands", "runout", "num_board", "deltas", "_trail")
+
+    def __init__(
+        self,
+        hands: List[List[int]],
+        runout: List[int],
+        button: int = 0,
+        street: int = 0,
+        pips: Optional[List[int]] = None,
+        stacks: Optional[List[int]] = None,
+        num_board: int = 0,
+    ) -> None:
+        """
+        Args:
+            hands (List[List[int]]): Both players' hole cards.
+            runout (List[int]): The 2 board cards, in the order they are revealed.
+            button, street, pips, stacks, num_board: The starting state, which
+                defaults to the start of a hand with the blinds posted.
+        """
+        self.button = button
+        self.street = street
+        self.pips = [SMALL_BLIND, BIG_BLIND] if pips is None else list(pips)
+        self.stacks = (
+            [STARTING_STACK - SMALL_BLIND, STARTING_STACK - BIG_BLIND]
+            if stacks is None
+            else list(stacks)
+        )
+        self.hands = hands
+        self.runout = runout
+        self.num_board = num_board
+        self.deltas: Optional[Tuple[int, int]] = None
+        self._trail = []
+
+    @classmethod
+    def from_round_state(cls, round_state: RoundState, runout: List[int]) -> "SearchState":
+        """
+        Starts a search from a RoundState. runout must begin with the cards already on its board.
+        """
+        return cls(
+            round_state.hands,
+            runout,
+            round_state.button,
+            round_state.street,
+            round_state.pips,
+            round_state.stacks,
+            len(round_state.board),
+        )
+
+    @property
+    def board(self) -> List[int]:
+        return self.runout[: self.num_board]
+
+    @property
+    def is_terminal(self) -> bool:
+        return self.deltas is not None
+
+    @property
+    def depth(self) -> int:
+        """The number of actions that can be undone."""
+        return len(self._trail) // 8
+
+    @property
+    def legal_mask(self) -> int:
+        return legal_action_mask(self.button, self.pips, self.stacks)
+
+    def legal_actions(self) -> FrozenSet[Type]:
+        return LEGAL_ACTION_SETS[self.legal_mask]
+
+    def raise_bounds(self) -> Tuple[int, int]:
+        return raise_bounds(self.button, self.pips, self.stacks)
+
+    def apply(self, action: Action) -> None:
+        """
+        Advances the state in place by one action performed by the active player.
+        """
+        pips = self.pips
+        stacks = self.stacks
+        trail = self._trail
+        trail.append(self.button)
+        trail.append(self.street)
+        trail.append(pips[0])
+        trail.append(pips[1])
+        trail.append(stacks[0])
+        trail.append(stacks[1])
+        trail.append(self.num_board)
+        trail.append(self.deltas)
+
+        active = self.button % 2
+        if isinstance(action, FoldAction):
+            delta = (
+                stacks[0] - STARTING_STACK
+                if active == 0
+                else STARTING_STACK - stacks[1]
             )
+            self.deltas = (delta, -delta)
+
+        elif isinstance(action, CallAction):
+            if self.button == 0:  # sb calls bb preflop
+                self.button = 1
+                pips[0] = pips[1] = BIG_BLIND
+                stacks[0] = stacks[1] = STARTING_STACK - BIG_BLIND
+                return
+            contribution = pips[1 - active] - pips[active]
+            stacks[active] -= contribution
+            pips[active] += contribution
+            self.button += 1
+            self._proceed_street()
+
+        elif isinstance(action, CheckAction):
+            if (self.street == 0 and self.button > 0) or self.button > 1:
+                # both players acted
+                self._proceed_street()
+            else:
+                self.button += 1
+
+        elif isinstance(action, RaiseAction):
+            contribution = action.amount - pips[active]
+            stacks[active] -= contribution
+            pips[active] += contribution
+            self.button += 1
+
+    def undo(self) -> None:
+        """
+        Reverts the most recent apply().
+        """
+        trail = self._trail
+        self.deltas = trail.pop()
+        self.num_board = trail.pop()
+        self.stacks[1] = trail.pop()
+        self.stacks[0] = trail.pop()
+        self.pips[1] = trail.pop()
+        self.pips[0] = trail.pop()
+        self.street = trail.pop()
+        self.button = trail.pop()
+
+    def _proceed_street(self) -> None:
+        if self.street >= 2 or self.stacks[0] + self.stacks[1] == 0:
+            delta = showdown_delta(self.hands, self.board, self.stacks)
+            self.deltas = (delta, -delta)
+            return
+        self.street += 1
+        self.num_board += 1
+        self.button = 1
+        self.pips[0] = self.pips[1] = 0
@@ -0,0 +1,81 @@
+"""
+Sequential stopping rule for matches.
+
+Most matches are decided well before their last round. SequentialStopper follows
+one player's results and says when a match can end early: either the lead is
+bigger than anything the remaining rounds could swing, or the mean result is
+significantly different from zero. The significance test is a z-test repeated
+every check_every observations; its level is split evenly across all the looks
+it could take (a Bonferroni correction), so peeking repeatedly does not inflate
+the false-positive rate above 1 - confidence.
+"""
+
+from statistics import NormalDist
+from typing import Optional
+
+
+class SequentialStopper:
+    """
+    Tracks running statistics of one player's results and decides when to stop.
+    """
+
+    def __init__(
+        self,
+        max_observations: int,
+        max_delta: int,
+        confidence: float = 0.99,
+        check_every: int = 50,
+        min_observations: int = 100,
+    ) -> None:
+        """
+        Args:
+            max_observations (int): Observations in a full match, e.g. rounds (or deals in duplicate mode).
+            max_delta (int): The most one observation can change the player's bankroll by.
+            confidence (float): Confidence required to call the match on significance.
+            check_every (int): Observations between significance tests.
+            min_observations (int): Observations before the first significance test.
+        """
+        self.max_observations = max_observations
+        self.max_delta = max_delta
+        self.check_every = max(check_every, 1)
+        self.min_observations = max(min_observations, 2)
+        looks = max((max_observations - self.min_observations) // self.check_every + 1, 1)
+        self.critical_z = NormalDist().inv_cdf(1 - (1 - confidence) / (2 * looks))
+        self.count = 0
+        self.total = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, delta: int) -> None:
+        """
+        Records one observation (Welford's online update).
+        """
+        self.count += 1
+        self.total += delta
+        change = delta - self.mean
+        self.mean += change / self.count
+        self._m2 += change * (delta - self.mean)
+
+    @property
+    def variance(self) -> float:
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std_error(self) -> float:
+        return (self.variance / self.count) ** 0.5 if self.count else 0.0
+
+    def check(self) -> Optional[str]:
+        """
+        Returns why the match can stop now, or None if it should go on.
+        """
+        remaining = self.max_observations - self.count
+        if self.count and abs(self.total) > remaining * self.max_delta:
+            return f"a lead of {abs(self.total)} can no longer be overturned"
+        if self.count < self.min_observations or (self.count - self.min_observations) % self.check_every:
+            return None
+        if self.std_error == 0:
+            return None
+        z = self.mean / self.std_error
+        if abs(z) > self.critical_z:
+            return f"the mean result of {self.mean:+.2f} is significant (z = {z:.2f})"
+        return None
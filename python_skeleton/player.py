@@ -2,7 +2,6 @@
 Simple example pokerbot, written in Python.
 """
 
-import pickle
 import random
 from typing import Optional
 
@@ -10,6 +9,8 @@ import numpy as np
 
 from skeleton.actions import Action, CallAction, CheckAction, FoldAction, RaiseAction
 from skeleton.bot import Bot
+from skeleton.evaluate import cards_to_str, str_to_cards
+from skeleton.isomorphism import IsomorphicTable, class_sizes
 from skeleton.runner import parse_args, run_bot
 from skeleton.states import (
     BIG_BLIND,
@@ -22,10 +23,6 @@ from skeleton.states import (
 )
 
 
-def make_key(cards: list[str], board_cards: list[str]) -> str:
-    return "_".join(sorted(cards)) + "_" + "_".join(sorted(board_cards))
-
-
 class Player(Bot):
     """
     A pokerbot.
@@ -43,20 +40,17 @@ class Player(Bot):
         """
         self.version = "1608"
 
-        self.evalof2 = pickle.load(open("python_skeleton/evalof2.pkl", "rb"))
-        self.evalof3 = pickle.load(open("python_skeleton/evalof3.pkl", "rb"))
-        self.evalof4 = pickle.load(open("python_skeleton/evalof4.pkl", "rb"))
-
-        self.pre_all_in_eval = {}
-        for i in range(1, 11):
-            self.pre_all_in_eval[i] = pickle.load(
-                open(f"python_skeleton/skeleton/all_in_evals_{i}.pkl", "rb")
-            )
-
-        self.pre_computed_probs = pickle.load(
-            open("python_skeleton/skeleton/pre_computed_probs.pkl", "rb")
+        # Tables are stored once per suit-isomorphism class, see skeleton/isomorphism.py
+        self.evalof = IsomorphicTable.load("python_skeleton/evalof.npz")
+        self.pre_all_in_eval = IsomorphicTable.load(
+            "python_skeleton/skeleton/all_in_evals.npz"
+        )
+        self.pre_computed_probs = IsomorphicTable.load(
+            "python_skeleton/skeleton/pre_computed_probs.npz"
+        )
+        self.avg_eval = np.average(
+            self.evalof.values[(4, 0)], weights=class_sizes(4, 0)
         )
-        self.avg_eval = np.mean(np.array(list(self.evalof4.values())))
         self.n_round = 0
         self.n_fold = 0
 
@@ -112,7 +106,7 @@ class Player(Bot):
         self.log.append("game over")
         self.log.append(f"My delta: {terminal_state.deltas[active]}")
         previous_state = terminal_state.previous_state
-        self.log.append(f"Opponent cards: {previous_state.hands[1]}")
+        self.log.append(f"Opponent cards: {cards_to_str(previous_state.hands[1])}")
         self.log.append(f"\n")
         # self.log.append("================================\n")
 
@@ -158,11 +152,9 @@ class Player(Bot):
         self.log.append("My contribution: " + str(my_contribution))
         self.log.append("My bankroll: " + str(observation["my_bankroll"]))
 
-        prob = self.pre_computed_probs[
-            "_".join(sorted(observation["my_cards"]))
-            + "_"
-            + "_".join(sorted(observation["board_cards"]))
-        ]
+        my_cards = str_to_cards(observation["my_cards"])
+        board_cards = str_to_cards(observation["board_cards"])
+        prob = self.pre_computed_probs.lookup(my_cards, board_cards)
 
         # Handles all-in situations
         if observation["opp_stack"] == 0:
@@ -171,43 +163,7 @@ class Player(Bot):
 
         else:
 
-            if len(observation["board_cards"]) == 0:
-                temp_cards_list = observation["my_cards"]
-                temp_cards_list_s = sorted(
-                    temp_cards_list, key=lambda x: (int(x[0]), x[1])
-                )
-                key = temp_cards_list_s[0] + "_" + temp_cards_list_s[1]
-                equity = self.evalof2[key]
-
-            if len(observation["board_cards"]) == 1:
-                temp_cards_list = observation["my_cards"] + observation["board_cards"]
-                temp_cards_list_s = sorted(
-                    temp_cards_list, key=lambda x: (int(x[0]), x[1])
-                )
-                key = (
-                    temp_cards_list_s[0]
-                    + "_"
-                    + temp_cards_list_s[1]
-                    + "_"
-                    + temp_cards_list_s[2]
-                )
-                equity = self.evalof3[key]
-
-            if len(observation["board_cards"]) == 2:
-                temp_cards_list = observation["my_cards"] + observation["board_cards"]
-                temp_cards_list_s = sorted(
-                    temp_cards_list, key=lambda x: (int(x[0]), x[1])
-                )
-                key = (
-                    temp_cards_list_s[0]
-                    + "_"
-                    + temp_cards_list_s[1]
-                    + "_"
-                    + temp_cards_list_s[2]
-                    + "_"
-                    + temp_cards_list_s[3]
-                )
-                equity = self.evalof4[key]
+            equity = self.evalof.lookup(my_cards + board_cards, [])
 
             self.log.append("Eval: " + str(equity))
 
@@ -262,13 +218,15 @@ class Player(Bot):
     def get_action_all_in(self, observation: dict) -> Action:
 
         cur_return = observation["my_stack"]
-        my_cards_key = make_key(observation["my_cards"], observation["board_cards"])
         group = 10 - int(self.fold_rate * 10)
         if observation["street"] == 2:
             group -= 2
         if group <= 0:
             group = 1
-        all_return = 2 * STARTING_STACK * self.pre_all_in_eval[group][my_cards_key]
+        all_return = 2 * STARTING_STACK * self.pre_all_in_eval.lookup(
+            str_to_cards(observation["my_cards"]),
+            str_to_cards(observation["board_cards"]),
+        )[group - 1]
         self.log.append(f"All-in return: {all_return}")
         if cur_return < all_return:
             return CallAction()
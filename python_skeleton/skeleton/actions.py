@@ -2,8 +2,9 @@
 The actions that the player is allowed to take.
 """
 
+from array import array
 from collections import namedtuple
-from typing import Union
+from typing import Iterator, List, Union
 
 FoldAction = namedtuple("FoldAction", [])
 CallAction = namedtuple("CallAction", [])
@@ -11,3 +12,118 @@ CheckAction = namedtuple("CheckAction", [])
 # we coalesce BetAction and RaiseAction for convenience
 RaiseAction = namedtuple("RaiseAction", ["amount"])
 Action = Union[FoldAction, CallAction, CheckAction, RaiseAction]
+
+# Legal actions as a bitmask, one bit per action in gym observation order
+FOLD_BIT = 1
+CALL_BIT = 2
+CHECK_BIT = 4
+RAISE_BIT = 8
+ACTION_BITS = {FoldAction: FOLD_BIT, CallAction: CALL_BIT, CheckAction: CHECK_BIT, RaiseAction: RAISE_BIT}
+# mask -> the set of legal action classes it stands for
+LEGAL_ACTION_SETS = tuple(
+    frozenset(action for action, bit in ACTION_BITS.items() if mask & bit) for mask in range(16)
+)
+
+# Action kinds stored in an ActionHistory
+FOLD = 0
+CALL = 1
+CHECK = 2
+RAISE = 3
+ACTION_KINDS = {FoldAction: FOLD, CallAction: CALL, CheckAction: CHECK, RaiseAction: RAISE}
+_UNIT_ACTIONS = (FoldAction(), CallAction(), CheckAction())
+
+
+class ActionHistory:
+    """
+    The actions of one hand so far, as an append-only pair of arrays (action kind
+    and raise amount) plus the index where each street's betting starts.
+
+    Each history is a cheap view of a buffer shared by the whole hand: append()
+    and new_street() return a longer view and extend the buffer in place. Appending
+    to a view that is not the newest copies its prefix first, so older views never
+    change.
+    """
+
+    __slots__ = ("_kinds", "_amounts", "_street_starts", "_length", "_num_streets")
+
+    def __init__(self) -> None:
+        self._kinds = bytearray()
+        self._amounts = array("H")
+        self._street_starts = array("H", [0])
+        self._length = 0
+        self._num_streets = 1
+
+    def _extend(self) -> "ActionHistory":
+        history = ActionHistory.__new__(ActionHistory)
+        if len(self._kinds) == self._length and len(self._street_starts) == self._num_streets:
+            history._kinds = self._kinds
+            history._amounts = self._amounts
+            history._street_starts = self._street_starts
+        else:  # branching off an older view
+            history._kinds = self._kinds[: self._length]
+            history._amounts = self._amounts[: self._length]
+            history._street_starts = self._street_starts[: self._num_streets]
+        history._length = self._length
+        history._num_streets = self._num_streets
+        return history
+
+    def append(self, action: Action) -> "ActionHistory":
+        """
+        Returns this history followed by action.
+        """
+        history = self._extend()
+        history._kinds.append(ACTION_KINDS[type(action)])
+        history._amounts.append(action.amount if isinstance(action, RaiseAction) else 0)
+        history._length += 1
+        return history
+
+    def new_street(self) -> "ActionHistory":
+        """
+        Returns this history with a new street of betting started.
+        """
+        history = self._extend()
+        history._street_starts.append(self._length)
+        history._num_streets += 1
+        return history
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index: int) -> Action:
+        if not -self._length <= index < self._length:
+            raise IndexError("action index out of range")
+        index %= self._length
+        kind = self._kinds[index]
+        return RaiseAction(self._amounts[index]) if kind == RAISE else _UNIT_ACTIONS[kind]
+
+    def __iter__(self) -> Iterator[Action]:
+        return (self[index] for index in range(self._length))
+
+    @property
+    def kinds(self) -> bytes:
+        """The kind (FOLD, CALL, CHECK or RAISE) of every action."""
+        return bytes(self._kinds[: self._length])
+
+    @property
+    def amounts(self) -> List[int]:
+        """The raise-to amount of every action (0 for non-raises)."""
+        return self._amounts[: self._length].tolist()
+
+    @property
+    def num_streets(self) -> int:
+        return self._num_streets
+
+    def street_range(self, street: int) -> range:
+        """
+        Returns the indices of the actions taken on a street.
+        """
+        if not 0 <= street < self._num_streets:
+            return range(0)
+        end = self._street_starts[street + 1] if street + 1 < self._num_streets else self._length
+        return range(self._street_starts[street], end)
+
+    def street_actions(self, street: int) -> List[Action]:
+        """
+        Returns the actions taken on a street, in order.
+        """
+        return [self[index] for index in self.street_range(street)]
@@ -41,7 +41,8 @@ class Bot:
         is_match_over: last round in the match
 
         Returns:
-        Your logs.
+        Your log entries for this round. Only return entries not returned in an
+        earlier round; all of them are sent to the engine.
         """
         raise NotImplementedError("handle_round_over")
 
@@ -66,6 +67,7 @@ class Bot:
                 "my_bankroll": int, the number of chips you have won or lost from the beginning of the game to the start of this round
                 "min_raise": int, the smallest number of chips for a legal bet/raise
                 "max_raise": int, the largest number of chips for a legal bet/raise
+                "history": ActionHistory of every action so far this round (see skeleton.actions)
             }
 
         Returns:
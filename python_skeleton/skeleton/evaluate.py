@@ -19,91 +19,115 @@ high card (7020): everything else
 TOTAL: 17550 combos
 """
 
-from random import shuffle
-from typing import List
+from typing import Iterable, List
 from itertools import combinations
+from math import comb
 
+import numpy as np
 
-class ShortDeck:
-    """Custom deck for the poker variant with cards ranked 1 to 9 across 3 suits."""
+RANKS = "123456789"
+SUITS = "shd"
+NUM_CARDS = len(RANKS) * len(SUITS)
 
-    def __init__(self):
-        self.cards = [f"{rank}{suit}" for rank in "123456789" for suit in "shd"]
+# Cards are integers 0..26 in (rank, suit) order, so "1s" is 0, "1h" is 1 and "9d" is 26.
+# Strings are only produced at the edges (protos and human-readable logs).
+CARD_NAMES = tuple(f"{rank}{suit}" for rank in RANKS for suit in SUITS)
+CARD_INDEX = {name: card for card, name in enumerate(CARD_NAMES)}
 
-    def shuffle(self):
-        """Shuffles the deck."""
-        shuffle(self.cards)
 
-    def deal(self, n):
-        """Deals n cards from the deck."""
-        return [self.cards.pop() for _ in range(n)]
+def card_rank(card: int) -> int:
+    return card // 3 + 1
 
 
-def is_straight_flush(hand: List[str]) -> bool:
+def card_suit(card: int) -> int:
+    return card % 3
+
+
+def card_to_str(card: int) -> str:
+    return CARD_NAMES[card]
+
+
+def str_to_card(name: str) -> int:
+    return CARD_INDEX[name]
+
+
+def cards_to_str(cards: Iterable[int]) -> List[str]:
+    return [CARD_NAMES[card] for card in cards]
+
+
+def str_to_cards(names: Iterable[str]) -> List[int]:
+    return [CARD_INDEX[name] for name in names]
+
+
+def is_straight_flush(hand: List[int]) -> bool:
     return is_4flush(hand) and is_4straight(hand)
 
 
-def is_trips(hand: List[str]) -> bool:
+def is_trips(hand: List[int]) -> bool:
     return num_pairs(hand) == 3
 
 
-def is_two_pair(hand: List[str]) -> bool:
+def is_two_pair(hand: List[int]) -> bool:
     return num_pairs(hand) == 2
 
 
-def is_4flush(hand: List[str]) -> bool:
-    suits = [card[1] for card in hand]
+def is_4flush(hand: List[int]) -> bool:
+    suits = [card_suit(card) for card in hand]
     return len(set(suits)) == 1
 
 
-def is_4straight(hand: List[str]) -> bool:
-    ranks = [int(card[0]) for card in hand]
+def is_4straight(hand: List[int]) -> bool:
+    ranks = [card_rank(card) for card in hand]
     return max(ranks) - min(ranks) == 3 and len(set(ranks)) == 4
     
 
-def is_3straight(hand: List[str]) -> bool:
-    ranks = sorted(int(card[0]) for card in hand)
+def is_3straight(hand: List[int]) -> bool:
+    ranks = sorted(card_rank(card) for card in hand)
     for combo in combinations(ranks, 3):
         if combo[0] == combo[1] - 1 and combo[1] == combo[2] - 1:
             return True
     return False
 
 
-def is_pair(hand: List[str]) -> bool:
+def is_pair(hand: List[int]) -> bool:
     return num_pairs(hand) == 1
 
 
-def num_pairs(hand: List[str]) -> int:
+def num_pairs(hand: List[int]) -> int:
     ans = 0
     for combo in combinations(hand, 2):
-        if combo[0][0] == combo[1][0]:
+        if card_rank(combo[0]) == card_rank(combo[1]):
             ans += 1
     return ans
 
 
-def high_card_value(hand: List[str]) -> int:
-    return sum(int(card[0]) * (10**i) for i, card in enumerate(sorted(hand)))
+def high_card_value(hand: List[int]) -> int:
+    return sum(card_rank(card) * (10**i) for i, card in enumerate(sorted(hand)))
 
 
-def frequent_card_value(hand: List[str]) -> int:
-    ranks = [int(card[0]) for card in hand]
+def frequent_card_value(hand: List[int]) -> int:
+    ranks = [card_rank(card) for card in hand]
     counts = {x: ranks.count(x) for x in ranks}
     ranks.sort(key=lambda x: 10 * counts[x] + x)
     return sum(rank * (10**i) for i, rank in enumerate(ranks))
 
 
-def find_straight(hand: List[str]) -> List[str]:
+def find_straight(hand: List[int]) -> List[int]:
     s1 = list(sorted(hand))[1:4]
     s2 = list(sorted(hand))[0:3]
-    ranks = list(sorted([int(card[0]) for card in hand]))
+    ranks = list(sorted([card_rank(card) for card in hand]))
     if ranks[2] - ranks[0] == 2:
         return s1
     else:
         return s2
 
 
-def evaluate(hand: List[str], board: List[str]) -> int:
-    combined_hand = sorted(hand + board, key=lambda x: int(x[0]), reverse=True)
+def evaluate_reference(hand: List[int], board: List[int]) -> int:
+    """
+    Scores a hand by running the category predicates directly.
+    Slow, but defines the scores that the lookup table in `evaluate` reproduces.
+    """
+    combined_hand = sorted(hand + board, key=card_rank, reverse=True)
     if is_straight_flush(combined_hand):
         return 80000 + high_card_value(combined_hand)
     elif is_trips(combined_hand):
@@ -120,3 +144,61 @@ def evaluate(hand: List[str], board: List[str]) -> int:
         return 20000 + frequent_card_value(combined_hand)
     else:
         return 10000 + high_card_value(combined_hand)
+
+
+# _CHOOSE[k][n] == comb(n, k). The colex rank of a sorted 4-combination
+# a < b < c < d is a + C(b, 2) + C(c, 3) + C(d, 4), a perfect hash onto 0..17549.
+_CHOOSE = [[comb(n, k) for n in range(NUM_CARDS)] for k in range(5)]
+_CHOOSE2, _CHOOSE3, _CHOOSE4 = _CHOOSE[2], _CHOOSE[3], _CHOOSE[4]
+
+
+def _build_score_table() -> List[int]:
+    table = [0] * comb(NUM_CARDS, 4)
+    for a, b, c, d in combinations(range(NUM_CARDS), 4):
+        table[a + _CHOOSE2[b] + _CHOOSE3[c] + _CHOOSE4[d]] = evaluate_reference([a, b], [c, d])
+    return table
+
+
+HAND_SCORES = _build_score_table()
+
+
+def evaluate(hand: List[int], board: List[int]) -> int:
+    """
+    Scores the best 4-card holding made of hand and board with a single table lookup.
+    Returns exactly what `evaluate_reference` would.
+    """
+    cards = hand + board
+    if len(cards) != 4:
+        return evaluate_reference(hand, board)
+    a, b, c, d = sorted(cards)
+    return HAND_SCORES[a + _CHOOSE2[b] + _CHOOSE3[c] + _CHOOSE4[d]]
+
+
+_SCORE_ARRAY = np.array(HAND_SCORES, dtype=np.int32)
+_CHOOSE_ARRAY = np.array(_CHOOSE, dtype=np.intp)
+
+
+def evaluate_many(hands: np.ndarray, boards: np.ndarray) -> np.ndarray:
+    """
+    Vectorized `evaluate` over N independent deals.
+
+    Args:
+        hands (np.ndarray): (N, 2) array of integer cards.
+        boards (np.ndarray): (N, k) array of integer cards, with 2 + k == 4.
+
+    Returns:
+        np.ndarray: The N scores, as an int32 array.
+    """
+    cards = np.concatenate(
+        [np.asarray(hands, dtype=np.intp), np.asarray(boards, dtype=np.intp)], axis=1
+    )
+    if cards.shape[1] != 4:
+        raise ValueError(f"evaluate_many needs 4 cards per deal, got {cards.shape[1]}")
+    cards.sort(axis=1)
+    index = (
+        cards[:, 0]
+        + _CHOOSE_ARRAY[2][cards[:, 1]]
+        + _CHOOSE_ARRAY[3][cards[:, 2]]
+        + _CHOOSE_ARRAY[4][cards[:, 3]]
+    )
+    return _SCORE_ARRAY[index]
@@ -0,0 +1,188 @@
+"""
+Suit-isomorphism canonicalization for (hand, board) situations.
+
+Relabelling the 3 suits maps a situation onto up to 5 others with the same
+evaluations and equities. Tables indexed by isomorphism class store each of
+those situations once instead of once per card-string key.
+"""
+
+from functools import lru_cache
+from itertools import combinations, permutations
+from math import comb
+from typing import Callable, Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from skeleton.evaluate import NUM_CARDS, str_to_cards
+
+Shape = Tuple[int, int]  # (number of hand cards, number of board cards)
+
+# card -> card with its suit relabelled, one row per permutation of the 3 suits
+SUIT_PERMUTATIONS = np.array(
+    [
+        [card - card % 3 + perm[card % 3] for card in range(NUM_CARDS)]
+        for perm in permutations(range(3))
+    ],
+    dtype=np.intp,
+)
+
+_CHOOSE = [[comb(n, k) for n in range(NUM_CARDS)] for k in range(5)]
+_CHOOSE_ARRAY = np.array(_CHOOSE, dtype=np.intp)
+
+
+def _colex_rank(cards: List[int]) -> int:
+    return sum(_CHOOSE[i + 1][card] for i, card in enumerate(sorted(cards)))
+
+
+def _colex_ranks(cards: np.ndarray) -> np.ndarray:
+    cards = np.sort(cards, axis=1)
+    ranks = np.zeros(len(cards), dtype=np.intp)
+    for i in range(cards.shape[1]):
+        ranks += _CHOOSE_ARRAY[i + 1][cards[:, i]]
+    return ranks
+
+
+@lru_cache(maxsize=None)
+def _class_map(hand_size: int, board_size: int) -> Tuple[np.ndarray, int]:
+    """
+    Maps every raw (hand, board) index of a shape to its class index (-1 if the cards overlap).
+    Two situations share a class when some suit relabelling turns one into the other.
+    """
+    hands = np.array(list(combinations(range(NUM_CARDS), hand_size)), dtype=np.intp)
+    boards = np.array(
+        list(combinations(range(NUM_CARDS), board_size)), dtype=np.intp
+    ).reshape(comb(NUM_CARDS, board_size), board_size)
+    hand_masks = np.bitwise_or.reduce(np.left_shift(1, hands), axis=1)
+    board_masks = np.bitwise_or.reduce(np.left_shift(1, boards), axis=1, initial=0)
+    hand_idx, board_idx = np.nonzero((hand_masks[:, None] & board_masks[None, :]) == 0)
+
+    num_boards = len(boards)
+    raw = _colex_ranks(hands)[hand_idx] * num_boards + _colex_ranks(boards)[board_idx]
+    canonical = np.min(
+        [
+            _colex_ranks(perm[hands[hand_idx]]) * num_boards
+            + _colex_ranks(perm[boards[board_idx]])
+            for perm in SUIT_PERMUTATIONS
+        ],
+        axis=0,
+    )
+    classes, class_of = np.unique(canonical, return_inverse=True)
+
+    class_map = np.full(len(hands) * num_boards, -1, dtype=np.int32)
+    class_map[raw] = class_of
+    return class_map, len(classes)
+
+
+def num_classes(hand_size: int, board_size: int) -> int:
+    """
+    Returns the number of isomorphism classes of (hand, board) situations of a shape.
+    """
+    return _class_map(hand_size, board_size)[1]
+
+
+def class_sizes(hand_size: int, board_size: int) -> np.ndarray:
+    """
+    Returns how many situations of a shape fall into each isomorphism class.
+    """
+    class_map, _ = _class_map(hand_size, board_size)
+    return np.bincount(class_map[class_map >= 0])
+
+
+def canonical_index(hand: List[int], board: List[int]) -> int:
+    """
+    Returns the isomorphism class index of a situation, in 0..num_classes(len(hand), len(board)).
+    """
+    class_map, _ = _class_map(len(hand), len(board))
+    return int(class_map[_colex_rank(hand) * comb(NUM_CARDS, len(board)) + _colex_rank(board)])
+
+
+def parse_key(key: str, hand_size: int) -> Tuple[List[int], List[int]]:
+    """
+    Splits an "_"-joined card-name key (as built by make_key) into hand and board cards.
+    """
+    cards = str_to_cards(name for name in key.split("_") if name)
+    return cards[:hand_size], cards[hand_size:]
+
+
+def build_isomorphic_table(
+    table: Dict[str, float],
+    key_to_cards: Callable[[str], Tuple[List[int], List[int]]],
+    tolerance: float = 1e-9,
+) -> Dict[Shape, np.ndarray]:
+    """
+    Converts a card-string keyed table into one float array per (hand, board) shape,
+    indexed by isomorphism class.
+
+    Raises:
+        ValueError: If two situations in the same class have different values.
+    """
+    values: Dict[Shape, np.ndarray] = {}
+    for key, value in table.items():
+        hand, board = key_to_cards(key)
+        shape = (len(hand), len(board))
+        if shape not in values:
+            values[shape] = np.full(num_classes(*shape), np.nan)
+        index = canonical_index(hand, board)
+        stored = values[shape][index]
+        if np.isnan(stored):
+            values[shape][index] = value
+        elif abs(stored - value) > tolerance:
+            raise ValueError(f"{key} = {value} but an isomorphic situation has {stored}")
+    return values
+
+
+class IsomorphicTable:
+    """
+    A lookup table over (hand, board) situations, stored once per isomorphism class.
+
+    Each shape's values have the class index as their last axis, so several tables
+    of the same shape can be stacked and looked up together.
+    """
+
+    def __init__(self, values: Dict[Shape, np.ndarray]) -> None:
+        self.values = values
+
+    def lookup(self, hand: List[int], board: List[int]):
+        return self.values[(len(hand), len(board))][..., canonical_index(hand, board)]
+
+    @classmethod
+    def stack(cls, tables: Iterable["IsomorphicTable"]) -> "IsomorphicTable":
+        tables = list(tables)
+        return cls({shape: np.stack([t.values[shape] for t in tables]) for shape in tables[0].values})
+
+    def save(self, path: str) -> None:
+        np.savez(path, **{f"{h}_{b}": values for (h, b), values in self.values.items()})
+
+    @classmethod
+    def load(cls, path: str) -> "IsomorphicTable":
+        with np.load(path) as data:
+            return cls({tuple(map(int, name.split("_"))): data[name] for name in data.files})
+
+
+if __name__ == "__main__":
+    import pickle
+
+    def load_pickle(path: str) -> Dict[str, float]:
+        with open(path, "rb") as file:
+            return pickle.load(file)
+
+    def make_key_cards(key: str) -> Tuple[List[int], List[int]]:
+        # make_key keys are "<hand>_<board>", so the hand is always the first 2 cards
+        return parse_key(key, 2)
+
+    def card_set_cards(key: str) -> Tuple[List[int], List[int]]:
+        return parse_key(key, 4)
+
+    IsomorphicTable(
+        build_isomorphic_table(load_pickle("skeleton/pre_computed_probs.pkl"), make_key_cards)
+    ).save("skeleton/pre_computed_probs.npz")
+    IsomorphicTable.stack(
+        IsomorphicTable(
+            build_isomorphic_table(load_pickle(f"skeleton/all_in_evals_{i}.pkl"), make_key_cards)
+        )
+        for i in range(1, 11)
+    ).save("skeleton/all_in_evals.npz")
+    evalof = {}
+    for n in (2, 3, 4):
+        evalof.update(build_isomorphic_table(load_pickle(f"evalof{n}.pkl"), card_set_cards))
+    IsomorphicTable(evalof).save("evalof.npz")
@@ -0,0 +1,135 @@
+"""
+Range-vs-range equity over the 351 two-card starting hands.
+
+A range is a length-351 array of weights, one per combo in COMBOS order. For
+each board, the pairwise showdown equities of every combo against every other
+are computed once with the batch evaluator and cached, so equity against a
+weighted range is a couple of vector operations.
+"""
+
+from functools import lru_cache
+from itertools import combinations
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from skeleton.evaluate import NUM_CARDS, evaluate_many
+
+COMBOS = np.array(list(combinations(range(NUM_CARDS), 2)), dtype=np.intp)
+NUM_COMBOS = len(COMBOS)
+_COMBO_INDEX = {tuple(combo): i for i, combo in enumerate(COMBOS.tolist())}
+_COMBO_MASKS = np.bitwise_or.reduce(np.left_shift(1, COMBOS), axis=1)
+
+# _DISJOINT[i, j]: combos i and j share no card
+_DISJOINT = (_COMBO_MASKS[:, None] & _COMBO_MASKS[None, :]) == 0
+
+
+def combo_index(hand: Iterable[int]) -> int:
+    """
+    Returns the index of a two-card hand (or two-card board) in COMBOS.
+    """
+    return _COMBO_INDEX[tuple(sorted(hand))]
+
+
+def uniform_range() -> np.ndarray:
+    return np.ones(NUM_COMBOS)
+
+
+def range_from_hands(hands: Iterable[Iterable[int]], weights: Optional[Iterable[float]] = None) -> np.ndarray:
+    """
+    Builds a range holding the given hands, with weight 1 unless weights are given.
+    """
+    hands = list(hands)
+    weights = np.ones(len(hands)) if weights is None else np.asarray(list(weights), dtype=float)
+    opp_range = np.zeros(NUM_COMBOS)
+    np.add.at(opp_range, [combo_index(hand) for hand in hands], weights)
+    return opp_range
+
+
+@lru_cache(maxsize=1)
+def _full_board_scores() -> np.ndarray:
+    """
+    Scores every combo on every complete board, as a (351 hands, 351 boards) array.
+    Overlapping hand/board pairs score -1.
+    """
+    hand_idx, board_idx = np.nonzero(_DISJOINT)
+    scores = np.full((NUM_COMBOS, NUM_COMBOS), -1, dtype=np.int32)
+    scores[hand_idx, board_idx] = evaluate_many(COMBOS[hand_idx], COMBOS[board_idx])
+    return scores
+
+
+def _board_outcomes(board_index: int) -> Tuple[np.ndarray, np.ndarray]:
+    live = _DISJOINT[board_index]
+    scores = _full_board_scores()[:, board_index]
+    shares = (scores[:, None] > scores[None, :]) + 0.5 * (scores[:, None] == scores[None, :])
+    valid = _DISJOINT & live[:, None] & live[None, :]
+    return shares, valid
+
+
+@lru_cache(maxsize=64)
+def showdown_matrix(board: Tuple[int, ...]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Computes the pot share of every combo against every other on a board, averaged
+    over all runouts when the board is incomplete.
+
+    Args:
+        board (Tuple[int, ...]): The sorted board cards (0, 1 or 2 of them).
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The (351, 351) equity matrix, and the mask of
+        matchups that are possible on this board (no two of hand, opponent hand and
+        board share a card).
+    """
+    if len(board) == 2:
+        return _board_outcomes(combo_index(board))
+
+    if len(board) == 1:
+        runouts = [combo_index(board + (card,)) for card in range(NUM_CARDS) if card != board[0]]
+    else:
+        runouts = range(NUM_COMBOS)
+    total = np.zeros((NUM_COMBOS, NUM_COMBOS))
+    count = np.zeros((NUM_COMBOS, NUM_COMBOS))
+    for board_index in runouts:
+        shares, valid = _board_outcomes(board_index)
+        total += shares * valid
+        count += valid
+    valid = count > 0
+    return np.divide(total, count, out=np.zeros_like(total), where=valid), valid
+
+
+def _matrix(board: Iterable[int]) -> Tuple[np.ndarray, np.ndarray]:
+    return showdown_matrix(tuple(sorted(board)))
+
+
+def equity_vs_range(board: List[int], opp_range: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Returns the equity of each of the 351 combos against a weighted opponent range
+    (uniform if None). Combos that collide with the board get 0.
+    """
+    equity, valid = _matrix(board)
+    weights = valid * (uniform_range() if opp_range is None else opp_range)
+    totals = weights.sum(axis=1)
+    return np.divide((equity * weights).sum(axis=1), totals, out=np.zeros(NUM_COMBOS), where=totals > 0)
+
+
+def hand_vs_range(hand: List[int], board: List[int], opp_range: Optional[np.ndarray] = None) -> float:
+    """
+    Returns the equity of one hand against a weighted opponent range (uniform if None),
+    or 0 if no combo of the range is possible.
+    """
+    equity, valid = _matrix(board)
+    index = combo_index(hand)
+    weights = valid[index] * (uniform_range() if opp_range is None else opp_range)
+    total = weights.sum()
+    return float(equity[index] @ weights / total) if total > 0 else 0.0
+
+
+def range_vs_range(my_range: np.ndarray, opp_range: np.ndarray, board: List[int]) -> float:
+    """
+    Returns the equity of a weighted range against another, over all possible matchups,
+    or 0 if there are none.
+    """
+    equity, valid = _matrix(board)
+    weights = valid * np.outer(my_range, opp_range)
+    total = weights.sum()
+    return float((equity * weights).sum() / total) if total > 0 else 0.0
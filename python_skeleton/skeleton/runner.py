@@ -4,12 +4,16 @@ The infrastructure for interacting with the engine.
 
 from argparse import ArgumentParser
 from concurrent import futures
+import functools
 import grpc
 import os
 import sys
-from typing import List
+import threading
+import time
+import zlib
+from typing import Iterator, List, Union
 
-from skeleton.actions import Action, FoldAction, CallAction, CheckAction, RaiseAction
+from skeleton.actions import Action, ActionHistory, FoldAction, CallAction, CheckAction, RaiseAction
 from skeleton.states import (
     GameState,
     RoundState,
@@ -17,8 +21,10 @@ from skeleton.states import (
     STARTING_STACK,
     BIG_BLIND,
     SMALL_BLIND,
+    PLAYER_LOG_SIZE_LIMIT,
 )
 from skeleton.bot import Bot
+from skeleton.evaluate import str_to_cards
 
 shared_path = os.path.abspath(
     os.path.join(os.path.dirname(__file__), "..", "..", "shared")
@@ -33,10 +39,34 @@ from pokerbot_pb2 import (  # noqa: E402
     ActionRequest,
     ActionResponse,
     EndRoundMessage,
-    EndRoundResponse
+    EndRoundResponse,
+    EngineMessage,
+    BotMessage,
 )
 from pokerbot_pb2_grpc import PokerBotServicer, add_PokerBotServicer_to_server  # noqa: E402
 
+# Trailing metadata in which RequestAction reports how long the bot spent on it
+BOT_TIME_METADATA_KEY = "bot-time-us"
+# Trailing metadata in which RequestAction echoes how many times gRPC retried it,
+# which only the server sees in the grpc-previous-rpc-attempts request header
+PREVIOUS_ATTEMPTS_METADATA_KEY = "previous-rpc-attempts"
+
+LOG_LIMIT_MESSAGE = "Log size limit reached. No further entries will be added."
+
+
+def _one_at_a_time(method):
+    """
+    Runs a Runner method under its lock. The server has a spare worker, so a unary RPC
+    can arrive while a match stream the engine gave up on still runs the bot.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args):
+        with self.lock:
+            return method(self, *args)
+
+    return wrapper
+
 
 class Runner(PokerBotServicer):
     """
@@ -54,6 +84,8 @@ class Runner(PokerBotServicer):
         self.game_state = GameState(0, 0.0, 1)
         self.round_state = None
         self.round_flag = True
+        self.log_size = 0
+        self.lock = threading.Lock()
 
     def ReadyCheck(
         self, request: ReadyCheckRequest, context: grpc.ServicerContext
@@ -70,6 +102,7 @@ class Runner(PokerBotServicer):
         """
         return ReadyCheckResponse(ready=True)
 
+    @_one_at_a_time
     def RequestAction(
         self, request: ActionRequest, context: grpc.ServicerContext
     ) -> ActionResponse:
@@ -83,6 +116,7 @@ class Runner(PokerBotServicer):
         Returns:
             ActionResponse: The response containing the chosen action.
         """
+        start_time = time.perf_counter()
         self.game_state = GameState(
             self.game_state.bankroll,
             request.game_clock,
@@ -90,7 +124,7 @@ class Runner(PokerBotServicer):
         )
 
         if self.round_flag:  # new hand
-            self._new_round(list(request.player_hand), list(request.board_cards))
+            self._new_round(str_to_cards(request.player_hand), str_to_cards(request.board_cards))
         else:
             self.round_state = RoundState(  # update the board cards
                 self.round_state.button,
@@ -98,8 +132,8 @@ class Runner(PokerBotServicer):
                 self.round_state.pips,
                 self.round_state.stacks,
                 self.round_state.hands,
-                list(request.board_cards),
-                self.round_state.previous_state,
+                str_to_cards(request.board_cards),
+                self.round_state.history,
             )
 
         for proto_action in request.new_actions:
@@ -107,18 +141,20 @@ class Runner(PokerBotServicer):
             self.round_state = self.round_state.proceed(action)
 
         active = self.round_state.button % 2
+        min_raise, max_raise = self.round_state.raise_bounds()
         observation = {
             "legal_actions": self.round_state.legal_actions(),
             "street": self.round_state.street,
-            "my_cards": self.round_state.hands[0],
-            "board_cards": list(self.round_state.board),
+            "my_cards": list(request.player_hand),
+            "board_cards": list(request.board_cards),
             "my_pip": self.round_state.pips[active],
             "opp_pip": self.round_state.pips[1 - active],
             "my_stack": self.round_state.stacks[active],
             "opp_stack": self.round_state.stacks[1 - active],
             "my_bankroll": self.game_state.bankroll,
-            "min_raise": self.round_state.raise_bounds()[0],
-            "max_raise": self.round_state.raise_bounds()[1],
+            "min_raise": min_raise,
+            "max_raise": max_raise,
+            "history": self.round_state.history,
         }
         try:
             action = self.pokerbot.get_action(observation)
@@ -126,8 +162,18 @@ class Runner(PokerBotServicer):
             self.pokerbot.log.append(f"Error raised: {e}")
         self.round_state = self.round_state.proceed(action)
 
-        return self._convert_action_to_response(action)
-
+        response = self._convert_action_to_response(action)
+        if context is not None:
+            # lets the engine tell the bot's own time apart from the network's
+            bot_time_us = int((time.perf_counter() - start_time) * 1e6)
+            metadata = [(BOT_TIME_METADATA_KEY, str(bot_time_us))]
+            for key, value in context.invocation_metadata() or ():
+                if key == "grpc-previous-rpc-attempts":
+                    metadata.append((PREVIOUS_ATTEMPTS_METADATA_KEY, value))
+            context.set_trailing_metadata(tuple(metadata))
+        return response
+
+    @_one_at_a_time
     def EndRound(self, request: EndRoundMessage, context: grpc.ServicerContext) -> EndRoundResponse:
         """
         Handles the end of a round.
@@ -137,14 +183,14 @@ class Runner(PokerBotServicer):
             context (grpc.ServicerContext): The gRPC context.
         
         Returns:
-            EndRoundResponse: The response containing the pokerbot's logs.
+            EndRoundResponse: The response containing the pokerbot's new logs, compressed.
         """
         if self.round_flag:
-            self._new_round(list(request.player_hand), list(request.board_cards))
+            self._new_round(str_to_cards(request.player_hand), str_to_cards(request.board_cards))
         if isinstance(self.round_state, TerminalState):
             self.round_state = self.round_state.previous_state
         hands = self.round_state.hands
-        hands[1] = list(request.opponent_hand)
+        hands[1] = str_to_cards(request.opponent_hand)
         self.round_state = RoundState(
             button=self.round_state.button,
             street=self.round_state.street,
@@ -152,17 +198,19 @@ class Runner(PokerBotServicer):
             stacks=self.round_state.stacks,
             hands=hands,
             board=self.round_state.board,
-            previous_state=self.round_state.previous_state,
+            history=self.round_state.history,
         )
 
         for proto_action in request.new_actions:
             action = self._convert_proto_action(proto_action)
             self.round_state = self.round_state.proceed(action)
+        if isinstance(self.round_state, TerminalState):
+            self.round_state = self.round_state.previous_state
 
         deltas = [0, 0]
         deltas[self.active] = request.delta
         deltas[1 - self.active] = -request.delta
-        self.round_state = TerminalState(deltas, self.round_state.previous_state)
+        self.round_state = TerminalState(deltas, self.round_state)
 
         bot_logs = self.pokerbot.handle_round_over(
             self.game_state, self.round_state, self.active, request.is_match_over
@@ -176,7 +224,68 @@ class Runner(PokerBotServicer):
 
         self.round_flag = True
 
-        return EndRoundResponse(logs=bot_logs)
+        return EndRoundResponse(log_chunk=self._log_chunk(bot_logs))
+
+    def _log_chunk(self, bot_logs: Union[List[str], str, None]) -> bytes:
+        """
+        Compresses the log entries the bot returned for this round, up to the engine's
+        size limit.
+
+        handle_round_over returns only the entries it has not returned before, as
+        the skeleton bots do by starting a new list every round. Everything it
+        returns is sent, so a bot that reuses one list must clear it between rounds.
+
+        Args:
+            bot_logs (Union[List[str], str, None]): What handle_round_over returned.
+
+        Returns:
+            bytes: The entries, joined by newlines and zlib-compressed, or nothing.
+        """
+        if bot_logs is None:
+            bot_logs = []
+        elif isinstance(bot_logs, str):
+            bot_logs = [bot_logs]
+
+        # entries are counted with their newline, as the engine counts them, and room
+        # is kept for the limit message
+        entry_limit = PLAYER_LOG_SIZE_LIMIT - len(LOG_LIMIT_MESSAGE) - 1
+        entries = []
+        for entry in bot_logs:
+            if self.log_size >= PLAYER_LOG_SIZE_LIMIT:
+                break
+            entry = str(entry)
+            entry_size = len(entry.encode("utf-8")) + 1
+            if self.log_size + entry_size <= entry_limit:
+                entries.append(entry)
+                self.log_size += entry_size
+            else:
+                entries.append(LOG_LIMIT_MESSAGE)
+                self.log_size = PLAYER_LOG_SIZE_LIMIT
+        if not entries:
+            return b""
+        return zlib.compress("\n".join(entries).encode("utf-8"))
+
+    def PlayMatch(
+        self, request_iterator: Iterator[EngineMessage], context: grpc.ServicerContext
+    ) -> Iterator[BotMessage]:
+        """
+        Plays a match over one stream, answering each engine message in order.
+
+        Args:
+            request_iterator (Iterator[EngineMessage]): The engine's action requests and round ends.
+            context (grpc.ServicerContext): The gRPC context.
+
+        Yields:
+            BotMessage: The answer to each engine message.
+        """
+        for message in request_iterator:
+            start_time = time.perf_counter()
+            if message.WhichOneof("message") == "action_request":
+                reply = BotMessage(action_response=self.RequestAction(message.action_request, None))
+            else:
+                reply = BotMessage(end_round_response=self.EndRound(message.end_round, None))
+            reply.bot_time_us = int((time.perf_counter() - start_time) * 1e6)
+            yield reply
 
     def _convert_action_to_response(self, action: Action) -> ActionResponse:
         """
@@ -218,7 +327,7 @@ class Runner(PokerBotServicer):
         elif proto_action.action == ActionType.RAISE:
             return RaiseAction(proto_action.amount)
 
-    def _new_round(self, hand: List[str], board: List[str]) -> RoundState:
+    def _new_round(self, hand: List[int], board: List[int]) -> RoundState:
         self.round_state = RoundState(
             button=0,
             street=0,
@@ -226,7 +335,7 @@ class Runner(PokerBotServicer):
             stacks=[STARTING_STACK - SMALL_BLIND, STARTING_STACK - BIG_BLIND],
             hands=[hand, []],
             board=board,
-            previous_state=None,
+            history=ActionHistory(),
         )
         self.active = 0
         self.pokerbot.handle_new_round(self.game_state, self.round_state, self.active)
@@ -243,7 +352,8 @@ def run_bot(pokerbot, args):
     """
     Starts the gRPC server and runs the pokerbot.
     """
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=1))
+    # a second worker serves unary RPCs while an abandoned match stream winds down
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=2))
     add_PokerBotServicer_to_server(Runner(pokerbot), server)
     server.add_insecure_port(f"[::]:{args.port}")
     server.start()
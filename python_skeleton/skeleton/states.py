@@ -3,12 +3,25 @@ Encapsulates game and round state information for the player.
 """
 
 from collections import namedtuple
-from typing import List, Tuple
-
-from skeleton.actions import Action, FoldAction, CallAction, CheckAction, RaiseAction
+from functools import cached_property
+from typing import FrozenSet, Tuple, Type
+
+from skeleton.actions import (
+    CALL_BIT,
+    CHECK_BIT,
+    FOLD_BIT,
+    LEGAL_ACTION_SETS,
+    RAISE_BIT,
+    Action,
+    CallAction,
+    CheckAction,
+    FoldAction,
+    RaiseAction,
+)
 
 # Constants for game settings
 NUM_ROUNDS = 1000
+PLAYER_LOG_SIZE_LIMIT = 1000000  # bytes of logs the engine keeps per bot
 STARTING_STACK = 400
 BIG_BLIND = 2
 SMALL_BLIND = 1
@@ -23,11 +36,14 @@ TerminalState = namedtuple("TerminalState", ["deltas", "previous_state"])
 class RoundState(
     namedtuple(
         "_RoundState",
-        ["button", "street", "pips", "stacks", "hands", "board", "previous_state"],
+        ["button", "street", "pips", "stacks", "hands", "board", "history"],
     )
 ):
     """
     Encodes the game tree for one round of poker.
+    Cards in hands and board are integers 0..26 (see skeleton.evaluate.CARD_NAMES).
+    history is the hand's ActionHistory (see skeleton.actions), e.g.
+    history.street_actions(1) lists the actions taken on the flop.
     """
 
     def showdown(self) -> TerminalState:
@@ -36,9 +52,10 @@ class RoundState(
         """
         return TerminalState([0, 0], self)
 
-    def legal_actions(self) -> List[Action]:
+    @cached_property
+    def legal_mask(self) -> int:
         """
-        Returns a list which corresponds to the active player's legal moves.
+        The active player's legal moves as a bitmask of FOLD_BIT, CALL_BIT, CHECK_BIT and RAISE_BIT.
         """
         active = self.button % 2
         continue_cost = self.pips[1 - active] - self.pips[active]
@@ -46,22 +63,20 @@ class RoundState(
         if continue_cost == 0:
             # we can only raise the stakes if both players can afford it
             bets_forbidden = self.stacks[0] == 0 or self.stacks[1] == 0
-            return {CheckAction} if bets_forbidden else {CheckAction, RaiseAction}
+            return CHECK_BIT if bets_forbidden else CHECK_BIT | RAISE_BIT
 
         # If the active player must contribute more chips to continue
         raises_forbidden = (
             continue_cost >= self.stacks[active] or self.stacks[1 - active] == 0
         )
         return (
-            {FoldAction, CallAction}
+            FOLD_BIT | CALL_BIT
             if raises_forbidden
-            else {FoldAction, CallAction, RaiseAction}
+            else FOLD_BIT | CALL_BIT | RAISE_BIT
         )
 
-    def raise_bounds(self) -> Tuple[int, int]:
-        """
-        Returns a tuple of the minimum and maximum legal raises.
-        """
+    @cached_property
+    def _raise_bounds(self) -> Tuple[int, int]:
         active = self.button % 2
         continue_cost = self.pips[1 - active] - self.pips[active]
         max_contribution = min(
@@ -76,6 +91,18 @@ class RoundState(
             self.pips[active] + max_contribution,
         )
 
+    def legal_actions(self) -> FrozenSet[Type]:
+        """
+        Returns a set which corresponds to the active player's legal moves.
+        """
+        return LEGAL_ACTION_SETS[self.legal_mask]
+
+    def raise_bounds(self) -> Tuple[int, int]:
+        """
+        Returns a tuple of the minimum and maximum legal raises.
+        """
+        return self._raise_bounds
+
     def proceed_street(self) -> "RoundState":
         """
         Advances the game tree to the next round of betting.
@@ -93,7 +120,7 @@ class RoundState(
             stacks=self.stacks,
             hands=self.hands,
             board=self.board,
-            previous_state=self,
+            history=self.history.new_street(),
         )
 
     def proceed(self, action: Action) -> "RoundState":
@@ -101,13 +128,14 @@ class RoundState(
         Advances the game tree by one action performed by the active player.
         """
         active = self.button % 2
+        history = self.history.append(action)
         if isinstance(action, FoldAction):
             delta = (
                 self.stacks[0] - STARTING_STACK
                 if active == 0
                 else STARTING_STACK - self.stacks[1]
             )
-            return TerminalState([delta, -delta], self)
+            return TerminalState([delta, -delta], self._replace(history=history))
 
         new_pips = list(self.pips)
         new_stacks = list(self.stacks)
@@ -121,7 +149,7 @@ class RoundState(
                     stacks=[STARTING_STACK - BIG_BLIND] * 2,
                     hands=self.hands,
                     board=self.board,
-                    previous_state=self,
+                    history=history,
                 )
             contribution = new_pips[1 - active] - new_pips[active]
             new_stacks[active] -= contribution
@@ -133,14 +161,14 @@ class RoundState(
                 stacks=new_stacks,
                 hands=self.hands,
                 board=self.board,
-                previous_state=self,
+                history=history,
             )
             return state.proceed_street()
 
         elif isinstance(action, CheckAction):
             if (self.street == 0 and self.button > 0) or self.button > 1:
                 # both players acted
-                return self.proceed_street()
+                return self._replace(history=history).proceed_street()
             return RoundState(
                 button=self.button + 1,
                 street=self.street,
@@ -148,7 +176,7 @@ class RoundState(
                 stacks=self.stacks,
                 hands=self.hands,
                 board=self.board,
-                previous_state=self,
+                history=history,
             )
 
         elif isinstance(action, RaiseAction):
@@ -162,5 +190,5 @@ class RoundState(
                 stacks=new_stacks,
                 hands=self.hands,
                 board=self.board,
-                previous_state=self,
+                history=history,
             )
@@ -2,38 +2,73 @@ import subprocess
 from argparse import ArgumentParser
 from multiprocessing import Process
 
+from engine.config import PLAYER_1_NAME, PLAYER_2_NAME
 from engine.engine import Game
 
 
 def parse_args():
     parser = ArgumentParser()
     parser.add_argument("--docker", action="store_true", help="Running in containers")
+    parser.add_argument(
+        "--in-process",
+        action="store_true",
+        help="Load both bots into the engine's process instead of talking to them over gRPC",
+    )
+    parser.add_argument(
+        "--aio",
+        action="store_true",
+        help="Run the engine on asyncio, overlapping the bots' end-of-round calls",
+    )
+    parser.add_argument("--bot1", default="python_skeleton/player.py", help="First bot file")
+    parser.add_argument("--bot2", default="python_skeleton/all_in_bot.py", help="Second bot file")
     return parser.parse_args()
 
 
-def run_game_engine() -> None:
+def run_game_engine(aio: bool = False) -> None:
     """
     Runs the game engine process.
     """
+    if aio:
+        import asyncio
+
+        from engine.aio_engine import AsyncGame
+
+        asyncio.run(AsyncGame().run_match())
+        return
     game = Game()
     game.run_match()
 
 
+def run_in_process(bot1: str, bot2: str) -> None:
+    """
+    Runs a match with both bots loaded into this process.
+    """
+    from engine.local_client import LocalClient, load_bot
+
+    players = [
+        LocalClient(PLAYER_1_NAME, load_bot(bot1)),
+        LocalClient(PLAYER_2_NAME, load_bot(bot2)),
+    ]
+    Game(players).run_match()
+
+
 if __name__ == "__main__":
     args = parse_args()
 
     if args.docker:
-        game_engine_process = Process(target=run_game_engine)
+        game_engine_process = Process(target=run_game_engine, args=(args.aio,))
         game_engine_process.start()
         game_engine_process.join()
+    elif args.in_process:
+        run_in_process(args.bot1, args.bot2)
     else:
         player1_process = subprocess.Popen(
-            ["python", "python_skeleton/player.py", "--port", "50051"]
+            ["python", args.bot1, "--port", "50051"]
         )
         player2_process = subprocess.Popen(
-            ["python", "python_skeleton/all_in_bot.py", "--port", "50052"]
+            ["python", args.bot2, "--port", "50052"]
         )
-        game_engine_process = Process(target=run_game_engine)
+        game_engine_process = Process(target=run_game_engine, args=(args.aio,))
         game_engine_process.start()
         game_engine_process.join()
         player1_process.terminate()
@@ -29,6 +29,11 @@ class PokerBotStub(object):
                 request_serializer=pokerbot__pb2.EndRoundMessage.SerializeToString,
                 response_deserializer=pokerbot__pb2.EndRoundResponse.FromString,
                 )
+        self.PlayMatch = channel.stream_stream(
+                '/poker.PokerBot/PlayMatch',
+                request_serializer=pokerbot__pb2.EngineMessage.SerializeToString,
+                response_deserializer=pokerbot__pb2.BotMessage.FromString,
+                )
 
 
 class PokerBotServicer(object):
@@ -55,6 +60,14 @@ class PokerBotServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def PlayMatch(self, request_iterator, context):
+        """Plays a whole match over one stream. The engine sends action requests and round
+        ends, and the bot answers each message, in order, with exactly one message.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_PokerBotServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -73,6 +86,11 @@ def add_PokerBotServicer_to_server(servicer, server):
                     request_deserializer=pokerbot__pb2.EndRoundMessage.FromString,
                     response_serializer=pokerbot__pb2.EndRoundResponse.SerializeToString,
             ),
+            'PlayMatch': grpc.stream_stream_rpc_method_handler(
+                    servicer.PlayMatch,
+                    request_deserializer=pokerbot__pb2.EngineMessage.FromString,
+                    response_serializer=pokerbot__pb2.BotMessage.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'poker.PokerBot', rpc_method_handlers)
@@ -133,3 +151,20 @@ class PokerBot(object):
             pokerbot__pb2.EndRoundResponse.FromString,
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def PlayMatch(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(request_iterator, target, '/poker.PokerBot/PlayMatch',
+            pokerbot__pb2.EngineMessage.SerializeToString,
+            pokerbot__pb2.BotMessage.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
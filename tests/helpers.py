@@ -0,0 +1,39 @@
+"""
+Random legal play, shared by the tests that compare implementations hand by hand.
+"""
+
+import random
+from typing import Iterable, List, Tuple, Type
+
+from engine.actions import Action, RaiseAction, TerminalState
+from engine.replay import new_round_state
+
+
+def random_action(rng: random.Random, legal_actions: Iterable[Type], raise_bounds: Tuple[int, int]) -> Action:
+    """
+    Picks a uniformly random legal action, raising to the minimum, the maximum or
+    anything in between.
+    """
+    action_class = rng.choice(sorted(legal_actions, key=lambda action: action.__name__))
+    if action_class is not RaiseAction:
+        return action_class()
+    min_raise, max_raise = raise_bounds
+    return RaiseAction(rng.choice([min_raise, max_raise, rng.randint(min_raise, max_raise)]))
+
+
+def play_random_hand(
+    rng: random.Random, seed: int, round_num: int, duplicate: bool = False
+) -> Tuple[List[Action], TerminalState]:
+    """
+    Plays one round of a seeded match with random legal actions.
+
+    Returns:
+        Tuple[List[Action], TerminalState]: The actions taken and the final state.
+    """
+    round_state = new_round_state(seed, round_num, duplicate)
+    actions = []
+    while not isinstance(round_state, TerminalState):
+        action = random_action(rng, round_state.legal_actions(), round_state.raise_bounds())
+        actions.append(action)
+        round_state = round_state.proceed(action)
+    return actions, round_state
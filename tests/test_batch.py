@@ -0,0 +1,47 @@
+import random
+
+import numpy as np
+
+from engine.actions import ACTION_KINDS, RaiseAction, TerminalState
+from engine.batch import BatchRoundState
+from engine.evaluate import deal_stream
+from engine.replay import new_round_state
+
+from tests.helpers import random_action
+
+SEED = 11
+NUM_HANDS = 300
+
+
+def test_step_follows_round_state_hand_by_hand():
+    rng = random.Random(0)
+    batch = BatchRoundState.from_orders(deal_stream(SEED, NUM_HANDS))
+    states = [new_round_state(SEED, round_num) for round_num in range(1, NUM_HANDS + 1)]
+    assert batch.hands.tolist() == [state.hands for state in states]
+
+    while not batch.is_done():
+        masks = batch.legal_masks()
+        min_raises, max_raises = batch.raise_bounds()
+        kinds = np.zeros(NUM_HANDS, dtype=np.int32)
+        amounts = np.zeros(NUM_HANDS, dtype=np.int32)
+        for i, state in enumerate(states):
+            if isinstance(state, TerminalState):
+                assert masks[i] == 0
+                continue
+            assert masks[i] == state.legal_mask
+            assert (min_raises[i], max_raises[i]) == state.raise_bounds()
+            action = random_action(rng, state.legal_actions(), state.raise_bounds())
+            kinds[i] = ACTION_KINDS[type(action)]
+            amounts[i] = action.amount if isinstance(action, RaiseAction) else 0
+            states[i] = state.proceed(action)
+        batch.step(kinds, amounts)
+
+        for i, state in enumerate(states):
+            assert batch.terminal[i] == isinstance(state, TerminalState)
+            if isinstance(state, TerminalState):
+                assert batch.deltas[i].tolist() == state.deltas
+            else:
+                assert (batch.button[i], batch.street[i]) == (state.button, state.street)
+                assert batch.pips[i].tolist() == state.pips
+                assert batch.stacks[i].tolist() == state.stacks
+                assert batch.runout[i, : batch.num_board[i]].tolist() == state.board
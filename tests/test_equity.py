@@ -0,0 +1,65 @@
+import pickle
+import random
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+from engine.equity import (
+    UNKNOWN_SHARE,
+    all_in_equity,
+    load_equity_table,
+    num_runouts,
+    save_equity_table,
+)
+from engine.evaluate import NUM_CARDS, evaluate_reference
+
+
+def brute_force_share(hand0, hand1, board):
+    live = [card for card in range(NUM_CARDS) if card not in hand0 + hand1 + board]
+    share = 0
+    for runout in combinations(live, 2 - len(board)):
+        score0 = evaluate_reference(hand0, board + list(runout))
+        score1 = evaluate_reference(hand1, board + list(runout))
+        share += 2 if score0 > score1 else 1 if score0 == score1 else 0
+    return share
+
+
+def random_matchups(board_size, count, seed):
+    rng = random.Random(seed)
+    for _ in range(count):
+        cards = rng.sample(range(NUM_CARDS), 4 + board_size)
+        yield cards[:2], cards[2:4], cards[4:]
+
+
+@pytest.mark.parametrize("board_size", [0, 1])
+def test_all_in_equity_matches_brute_force(board_size):
+    for hand0, hand1, board in random_matchups(board_size, 25, board_size):
+        share, total = all_in_equity(hand0, hand1, board)
+        assert total == 2 * num_runouts(board)
+        assert share == brute_force_share(hand0, hand1, board)
+
+
+def test_all_in_equity_is_invariant_under_suit_relabelling_and_seat_swap():
+    relabel = {0: 2, 1: 0, 2: 1}
+    for hand0, hand1, board in random_matchups(1, 25, 2):
+        share, total = all_in_equity(hand0, hand1, board)
+        assert all_in_equity(hand1, hand0, board) == (total - share, total)
+        relabelled = [[card - card % 3 + relabel[card % 3] for card in cards] for cards in (hand0, hand1, board)]
+        assert all_in_equity(*relabelled) == (share, total)
+
+
+def test_saved_equity_table_loads_without_pickle(tmp_path):
+    hand0, hand1, board = [0, 4], [9, 13], [20]
+    expected = all_in_equity(hand0, hand1, board)
+    path = str(tmp_path / "equity.npz")
+    save_equity_table(path)
+
+    with np.load(path, allow_pickle=False) as saved:
+        assert np.count_nonzero(saved["shares"] != UNKNOWN_SHARE) > 0
+    assert load_equity_table(path)
+    assert all_in_equity(hand0, hand1, board) == expected
+
+    (tmp_path / "equity.pkl").write_bytes(pickle.dumps({((0, 4), (9, 13), (20,)): 0}))
+    assert not load_equity_table(str(tmp_path / "equity.pkl"))
+    assert not load_equity_table(str(tmp_path / "missing.npz"))
@@ -0,0 +1,134 @@
+import random
+
+import numpy as np
+
+from engine.actions import ACTION_KINDS, RaiseAction
+from engine.engine import Game
+from engine.hand_history import NO_CARD, HandHistory, HandHistoryWriter, history_files
+from engine.local_client import LocalClient, load_bot
+from engine.log_writer import FileSink
+from engine.replay import new_round_state
+
+from tests.helpers import play_random_hand
+
+SEED = 21
+PLAYERS = ["alice", "bob"]
+
+
+def expected_actions(round_num, small_blind, actions, duplicate=False):
+    """
+    Returns (street, player, kind, amount) of each action, found by replaying the round.
+    """
+    seats = [small_blind, 1 - small_blind]
+    state = new_round_state(SEED, round_num, duplicate)
+    rows = []
+    for action in actions:
+        amount = action.amount if isinstance(action, RaiseAction) else 0
+        rows.append((state.street, seats[state.button % 2], ACTION_KINDS[type(action)], amount))
+        state = state.proceed(action)
+    return rows
+
+
+def write_random_history(prefix, num_rounds, duplicate=False):
+    """
+    Writes a hand history of random rounds, flushed every few rounds as the game does.
+
+    Returns:
+        list: (round_num, small_blind, actions, terminal) of each round.
+    """
+    rng = random.Random(0)
+    writer = HandHistoryWriter([FileSink(path) for path in history_files(prefix)], SEED, PLAYERS, duplicate)
+    rounds = []
+    for round_num in range(1, num_rounds + 1):
+        small_blind = (round_num + 1) % 2
+        actions, terminal = play_random_hand(rng, SEED, round_num, duplicate)
+        final = terminal.previous_state
+        writer.add_round(round_num, small_blind, final.hands, final.board, terminal.deltas, final.history)
+        rounds.append((round_num, small_blind, actions, terminal))
+        if round_num % 7 == 0:
+            writer.flush()
+    writer.close()
+    return rounds
+
+
+def test_hand_history_reads_back_every_round_and_action(tmp_path):
+    prefix = str(tmp_path / "hand_history")
+    rounds = write_random_history(prefix, 200)
+    history = HandHistory(prefix)
+
+    assert (history.seed, history.players, history.duplicate) == (SEED, PLAYERS, False)
+    assert len(history) == len(rounds)
+    bankrolls = np.zeros(2, dtype=np.int64)
+    for index, (round_num, small_blind, actions, terminal) in enumerate(rounds):
+        final = terminal.previous_state
+        seats = [small_blind, 1 - small_blind]
+        record = history.rounds[index]
+        assert (record["round"], record["small_blind"]) == (round_num, small_blind)
+        for seat, player in enumerate(seats):
+            assert record["hands"][player].tolist() == final.hands[seat]
+            assert record["deltas"][player] == terminal.deltas[seat]
+            bankrolls[player] += terminal.deltas[seat]
+        assert record["board"].tolist() == final.board + [NO_CARD] * (2 - len(final.board))
+
+        recorded = history.round_actions(index)
+        assert set(recorded["round"].tolist()) <= {round_num}
+        assert list(zip(*(recorded[field].tolist() for field in ("street", "player", "kind", "amount")))) == (
+            expected_actions(round_num, small_blind, actions)
+        )
+        assert history.bankrolls()[index].tolist() == bankrolls.tolist()
+
+
+def test_game_writes_the_hand_history_through_its_sink_factory(tmp_path):
+    bot = "python_skeleton/player_baseline.py"
+    players = [LocalClient("bot1", load_bot(bot)), LocalClient("bot2", load_bot(bot))]
+    sink_directory = tmp_path / "sinks"
+    game = Game(
+        players,
+        seed=SEED,
+        logs_directory=str(tmp_path / "unused"),
+        publish=False,
+        sink_factory=lambda filename: FileSink(str(sink_directory / filename)),
+    )
+    game.run_match()
+
+    assert {filename for filename, _ in game.sinks} >= set(history_files("hand_history"))
+    history = HandHistory(str(sink_directory / "hand_history"))
+    assert np.array_equal(history.bankrolls()[-1], [players[0].bankroll, players[1].bankroll])
+    assert not (tmp_path / "unused").exists()
+
+
+def test_pair_scores_sum_each_deal_of_a_duplicate_match(tmp_path):
+    prefix = str(tmp_path / "hand_history")
+    rounds = write_random_history(prefix, 101, duplicate=True)
+    history = HandHistory(prefix)
+
+    assert history.duplicate
+    player0_deltas = [
+        terminal.deltas[0] if small_blind == 0 else terminal.deltas[1]
+        for _, small_blind, _, terminal in rounds
+    ]
+    expected = [player0_deltas[i] + player0_deltas[i + 1] for i in range(0, 100, 2)]
+    assert history.pair_scores().tolist() == expected
+
+
+def test_duplicate_game_scores_match_its_hand_history(tmp_path):
+    bot = "python_skeleton/player_baseline.py"
+    players = [LocalClient("bot1", load_bot(bot)), LocalClient("bot2", load_bot(bot))]
+    game = Game(players, seed=SEED, logs_directory=str(tmp_path), publish=False, duplicate=True)
+    game.run_match()
+
+    history = HandHistory(str(tmp_path / "hand_history"))
+    assert game.pair_scores == history.pair_scores().tolist()
+    assert sum(game.pair_scores) == players[0].bankroll
+
+
+def test_game_numbers_log_files_that_already_exist_in_its_logs_directory(tmp_path):
+    (tmp_path / "engine_log.txt").write_text("")
+    (tmp_path / "hand_history_rounds.bin").write_bytes(b"")
+    bot = "python_skeleton/player_baseline.py"
+    players = [LocalClient("bot1", load_bot(bot)), LocalClient("bot2", load_bot(bot))]
+    game = Game(players, seed=SEED, logs_directory=str(tmp_path), publish=False)
+
+    filenames = {filename for filename, _ in game.sinks}
+    assert {"engine_log_1.txt", "engine_log.csv"} <= filenames
+    assert set(history_files("hand_history_1")) <= filenames
@@ -0,0 +1,84 @@
+import numpy as np
+
+from engine.engine import Game
+from engine.hand_history import HandHistory
+from engine.local_client import LocalClient, load_bot
+from engine.replay import verify_replay_log
+
+BOT = "python_skeleton/player_baseline.py"
+
+
+class FailingServicer:
+    """
+    A bot whose every action request raises.
+    """
+
+    def __init__(self, servicer) -> None:
+        self.servicer = servicer
+
+    def ReadyCheck(self, request, context):
+        return self.servicer.ReadyCheck(request, context)
+
+    def RequestAction(self, request, context):
+        raise RuntimeError("no action")
+
+    def EndRound(self, request, context):
+        return self.servicer.EndRound(request, context)
+
+
+class ReusedLogBot:
+    """
+    A bot that returns the same log list every round, cleared and refilled.
+    """
+
+    def __init__(self, bot) -> None:
+        self.bot = bot
+        self.log = []
+
+    def __getattr__(self, name):
+        return getattr(self.bot, name)
+
+    def handle_round_over(self, *args):
+        self.bot.handle_round_over(*args)
+        self.log.clear()
+        self.log.append("round over")
+        return self.log
+
+
+def play(tmp_path, players):
+    game = Game(players, seed=5, logs_directory=str(tmp_path), publish=False)
+    game.run_match()
+    return game
+
+
+def test_in_process_match_replays_to_its_bankrolls(tmp_path):
+    players = [LocalClient("bot1", load_bot(BOT)), LocalClient("bot2", load_bot(BOT))]
+    game = play(tmp_path, players)
+
+    assert players[0].bankroll == -players[1].bankroll
+    with open(tmp_path / "replay_log.txt") as file:
+        assert verify_replay_log(file) == []
+    history = HandHistory(str(tmp_path / "hand_history"))
+    assert len(history) == game.round_num
+    assert np.array_equal(history.bankrolls()[-1], [players[0].bankroll, players[1].bankroll])
+    assert (tmp_path / "bot1" / "debug_log.txt").exists()
+
+
+def test_failed_action_requests_fall_back_to_a_legal_action(tmp_path):
+    players = [LocalClient("bot1", load_bot(BOT)), LocalClient("failing", FailingServicer(load_bot(BOT)))]
+    play(tmp_path, players)
+
+    log = (tmp_path / "engine_log.txt").read_text()
+    assert "failing attempted illegal NoneType" in log
+    with open(tmp_path / "replay_log.txt") as file:
+        assert verify_replay_log(file) == []
+
+
+def test_bot_logs_from_a_reused_list_are_sent_every_round(tmp_path):
+    runner = load_bot(BOT)
+    reusing = type(runner)(ReusedLogBot(runner.pokerbot))
+    players = [LocalClient("bot1", load_bot(BOT)), LocalClient("reusing", reusing)]
+    game = play(tmp_path, players)
+
+    log = (tmp_path / "reusing" / "debug_log.txt").read_text()
+    assert log.split("\n").count("round over") == game.round_num
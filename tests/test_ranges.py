@@ -0,0 +1,14 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "python_skeleton")))
+
+from skeleton.ranges import hand_vs_range, range_from_hands, range_vs_range  # noqa: E402
+
+
+def test_equity_against_a_range_blocked_by_the_board_is_zero():
+    board = [0, 1]
+    blocked = range_from_hands([[0, 5]])
+
+    assert hand_vs_range([10, 11], board, blocked) == 0.0
+    assert range_vs_range(range_from_hands([[10, 11]]), blocked, board) == 0.0
@@ -0,0 +1,86 @@
+import random
+
+import pytest
+
+from engine.actions import CallAction, CheckAction, FoldAction, RaiseAction, TerminalState
+from engine.evaluate import ShortDeck, deal_number
+from engine.replay import (
+    ReplayRecord,
+    decode_actions,
+    encode_actions,
+    format_replay_header,
+    format_replay_record,
+    new_round_state,
+    replay_hand,
+    verify_replay_log,
+)
+
+from tests.helpers import play_random_hand
+
+SEED = 3
+
+
+def random_replay_log(num_rounds, duplicate=False):
+    rng = random.Random(0)
+    lines = [format_replay_header(SEED, duplicate)]
+    for round_num in range(1, num_rounds + 1):
+        actions, terminal = play_random_hand(rng, SEED, round_num, duplicate)
+        lines.append(format_replay_record(ReplayRecord(round_num, "A", terminal.deltas[0], actions)))
+    return lines
+
+
+def test_action_tokens_round_trip():
+    actions = [RaiseAction(6), CallAction(), CheckAction(), RaiseAction(400), FoldAction()]
+    assert encode_actions(actions) == "R6 C K R400 F"
+    assert decode_actions("R6 C K R400 F") == actions
+    with pytest.raises(ValueError):
+        decode_actions("C X")
+
+
+def test_replay_hand_reproduces_the_played_round():
+    rng = random.Random(1)
+    for round_num in range(1, 201):
+        actions, terminal = play_random_hand(rng, SEED, round_num)
+        for replay_actions in (actions, encode_actions(actions)):
+            replayed = replay_hand(SEED, round_num, replay_actions)
+            assert isinstance(replayed, TerminalState)
+            assert replayed.deltas == terminal.deltas
+            assert replayed.previous_state.hands == terminal.previous_state.hands
+            assert replayed.previous_state.board == terminal.previous_state.board
+
+
+def test_replay_hand_rejects_illegal_and_extra_actions():
+    with pytest.raises(ValueError):
+        replay_hand(SEED, 1, [CheckAction()])  # the small blind faces the big blind
+    with pytest.raises(ValueError):
+        replay_hand(SEED, 1, [RaiseAction(3)])  # below the minimum raise
+    with pytest.raises(ValueError):
+        replay_hand(SEED, 1, [FoldAction(), CallAction()])
+
+
+def test_verify_replay_log_flags_rounds_that_disagree():
+    lines = random_replay_log(100)
+    assert verify_replay_log(lines) == []
+
+    round_num, small_blind, delta, tokens = lines[10].split("\t")
+    lines[10] = "\t".join([round_num, small_blind, str(int(delta) + 1), tokens])
+    lines[20] = "\t".join(lines[20].split("\t")[:3] + ["K"])
+    assert verify_replay_log(lines) == [10, 20]
+
+
+def test_duplicate_rounds_share_their_deal():
+    assert [deal_number(round_num, True) for round_num in range(1, 7)] == [1, 1, 2, 2, 3, 3]
+    assert [deal_number(round_num) for round_num in range(1, 7)] == [1, 2, 3, 4, 5, 6]
+    for deal in range(1, 51):
+        first, second = new_round_state(SEED, 2 * deal - 1, True), new_round_state(SEED, 2 * deal, True)
+        assert first.hands == second.hands
+        assert ShortDeck(first.deck.order).cards == ShortDeck(second.deck.order).cards
+        assert first.hands == new_round_state(SEED, deal).hands
+
+
+def test_verify_replay_log_deals_duplicate_logs_by_deal():
+    lines = random_replay_log(100, duplicate=True)
+    assert verify_replay_log(lines) == []
+    # read as a regular match, the even rounds are dealt different cards
+    lines[0] = format_replay_header(SEED)
+    assert verify_replay_log(lines)
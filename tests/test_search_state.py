@@ -0,0 +1,48 @@
+import random
+
+from engine.actions import TerminalState
+from engine.evaluate import ShortDeck
+from engine.replay import new_round_state
+from engine.roundstate import SearchState
+
+from tests.helpers import random_action
+
+
+def upcoming_runout(round_state):
+    deck = round_state.deck
+    return ShortDeck(deck.order[: deck.top]).deal(2)
+
+
+def snapshot(state):
+    return state.button, state.street, list(state.pips), list(state.stacks), state.num_board, state.deltas
+
+
+def test_apply_follows_round_state_and_undo_restores_it():
+    rng = random.Random(0)
+    for round_num in range(1, 301):
+        round_state = new_round_state(7, round_num)
+        search = SearchState.from_round_state(round_state, upcoming_runout(round_state))
+        trail = [snapshot(search)]
+
+        while not isinstance(round_state, TerminalState):
+            assert search.legal_mask == round_state.legal_mask
+            assert search.legal_actions() == round_state.legal_actions()
+            assert search.raise_bounds() == round_state.raise_bounds()
+            action = random_action(rng, round_state.legal_actions(), round_state.raise_bounds())
+            round_state = round_state.proceed(action)
+            search.apply(action)
+            trail.append(snapshot(search))
+            if isinstance(round_state, TerminalState):
+                assert search.is_terminal
+                assert search.deltas == tuple(round_state.deltas)
+            else:
+                assert not search.is_terminal
+                assert (search.button, search.street) == (round_state.button, round_state.street)
+                assert (search.pips, search.stacks) == (round_state.pips, round_state.stacks)
+                assert search.board == round_state.board
+
+        assert search.depth == len(trail) - 1
+        while search.depth:
+            trail.pop()
+            search.undo()
+            assert snapshot(search) == trail[-1]
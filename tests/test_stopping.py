@@ -0,0 +1,71 @@
+import random
+import statistics
+from statistics import NormalDist
+
+from engine.stopping import SequentialStopper
+
+
+def reference_check(deltas, max_observations, max_delta, critical_z, check_every, min_observations):
+    """
+    The stopping rule, recomputed from scratch over all observations so far.
+    """
+    count, total = len(deltas), sum(deltas)
+    if abs(total) > (max_observations - count) * max_delta:
+        return "lead"
+    if count < min_observations or (count - min_observations) % check_every:
+        return None
+    std_error = (statistics.variance(deltas) / count) ** 0.5
+    if std_error and abs(statistics.fmean(deltas) / std_error) > critical_z:
+        return "significant"
+    return None
+
+
+def test_running_statistics_match_a_direct_computation():
+    rng = random.Random(0)
+    stopper = SequentialStopper(1000, 400)
+    deltas = []
+    for _ in range(500):
+        deltas.append(rng.randint(-400, 400))
+        stopper.add(deltas[-1])
+        if len(deltas) > 1:
+            assert abs(stopper.mean - statistics.fmean(deltas)) < 1e-9
+            assert abs(stopper.variance - statistics.variance(deltas)) < 1e-6 * statistics.variance(deltas)
+            assert abs(stopper.std_error - (statistics.variance(deltas) / len(deltas)) ** 0.5) < 1e-9
+    assert stopper.total == sum(deltas)
+
+
+def test_significance_level_is_split_across_every_look():
+    stopper = SequentialStopper(1000, 400, confidence=0.99, check_every=50, min_observations=200)
+    looks = (1000 - 200) // 50 + 1
+    assert stopper.critical_z == NormalDist().inv_cdf(1 - 0.01 / (2 * looks))
+
+
+def test_check_matches_the_stopping_rule():
+    rng = random.Random(1)
+    for edge in (0, 2, 5, 20):
+        stopper = SequentialStopper(1000, 400, check_every=25, min_observations=100)
+        deltas = []
+        while len(deltas) < 1000:
+            deltas.append(rng.randint(-20, 20 + edge))
+            stopper.add(deltas[-1])
+            expected = reference_check(deltas, 1000, 400, stopper.critical_z, 25, 100)
+            reason = stopper.check()
+            if expected is None:
+                assert reason is None
+            else:
+                assert reason is not None and (expected == "lead") == ("overturned" in reason)
+                break
+
+
+def test_even_matches_are_rarely_called_significant():
+    rng = random.Random(2)
+    significant = 0
+    for _ in range(200):
+        stopper = SequentialStopper(1000, 400, confidence=0.99)
+        for _ in range(1000):
+            stopper.add(rng.choice((-1, 1)) * rng.randint(0, 50))
+            reason = stopper.check()
+            if reason:
+                significant += "significant" in reason
+                break
+    assert significant <= 4
@@ -0,0 +1,46 @@
+import numpy as np
+
+from engine.hand_history import HandHistory
+from engine.replay import verify_replay_log
+from tournament import Match, MatchResult, play_match, schedule, standings
+
+BOT = "python_skeleton/player_baseline.py"
+
+
+def test_schedule_plays_every_pair_once_per_seed():
+    matches = schedule(["a.py", "b.py", "c.py"], [0, 1])
+    assert len(matches) == 6
+    assert {(match.bot1, match.bot2) for match in matches} == {("a.py", "b.py"), ("a.py", "c.py"), ("b.py", "c.py")}
+
+
+def test_standings_total_each_bot_and_skip_failed_matches():
+    results = [
+        MatchResult("a.py", "b.py", 0, 30, -30, 1000, None),
+        MatchResult("a.py", "c.py", 0, -10, 10, 1000, None),
+        MatchResult("b.py", "c.py", 0, 0, 0, 0, "RuntimeError: boom"),
+    ]
+    rows = {row["bot"]: row for row in standings(results)}
+    assert (rows["a"]["matches"], rows["a"]["wins"], rows["a"]["losses"], rows["a"]["bankroll"]) == (2, 1, 1, 20)
+    assert (rows["b"]["matches"], rows["b"]["errors"], rows["b"]["bankroll"]) == (1, 1, -30)
+    assert rows["c"]["mean_bankroll"] == 10.0
+
+
+def test_play_match_reports_the_logged_result(tmp_path):
+    result = play_match(Match(BOT, BOT, 9), str(tmp_path))
+    assert result.error is None
+    assert result.bankroll1 == -result.bankroll2
+
+    with open(tmp_path / "player_baseline_vs_player_baseline_seed9" / "replay_log.txt") as file:
+        assert next(file).split() == ["seed", "9"]
+        file.seek(0)
+        assert verify_replay_log(file) == []
+    history = HandHistory(str(tmp_path / "player_baseline_vs_player_baseline_seed9" / "hand_history"))
+    assert history.seed == 9
+    assert len(history) == result.rounds
+    assert np.array_equal(history.bankrolls()[-1], [result.bankroll1, result.bankroll2])
+
+
+def test_play_match_reports_failures_instead_of_raising(tmp_path):
+    result = play_match(Match(BOT, "python_skeleton/no_such_bot.py", 0), str(tmp_path))
+    assert result.error is not None
+    assert (result.bankroll1, result.bankroll2, result.rounds) == (0, 0, 0)
@@ -0,0 +1,182 @@
+"""
+Round-robin tournament between pokerbots.
+
+Every pair of bots plays one match per seed. Matches run in-process (see
+engine.local_client), one per worker process, across a pool that defaults to one
+worker per core. Each match writes its logs to its own directory under --logs-dir.
+
+Run from the repository root:
+    python tournament.py --seeds 4 [--bots python_skeleton/player.py ...] [--csv results.csv]
+"""
+
+import contextlib
+import csv
+import io
+import os
+from argparse import ArgumentParser
+from collections import namedtuple
+from itertools import combinations
+from multiprocessing import Pool
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_BOTS = [
+    "python_skeleton/player.py",
+    "python_skeleton/prob_bot.py",
+    "python_skeleton/all_in_bot.py",
+    "python_skeleton/player_baseline.py",
+    "python_skeleton/player_mixed.py",
+    "python_skeleton/calculated_player.py",
+]
+
+Match = namedtuple("Match", ["bot1", "bot2", "seed"])
+MatchResult = namedtuple("MatchResult", ["bot1", "bot2", "seed", "bankroll1", "bankroll2", "rounds", "error"])
+
+
+def bot_name(bot_path: str) -> str:
+    return os.path.splitext(os.path.basename(bot_path))[0]
+
+
+def schedule(bots: List[str], seeds: List[int]) -> List[Match]:
+    """
+    Returns one match per pair of bots per seed.
+    """
+    return [Match(bot1, bot2, seed) for bot1, bot2 in combinations(bots, 2) for seed in seeds]
+
+
+def play_match(match: Match, logs_root: str, duplicate: bool = False, early_stop: bool = False) -> MatchResult:
+    """
+    Plays one in-process match. Meant to run in a pool worker: the bots' output is
+    discarded and any failure is reported in the result instead of raised.
+    """
+    from engine.engine import Game
+    from engine.local_client import LocalClient, load_bot
+
+    name1, name2 = bot_name(match.bot1), bot_name(match.bot2)
+    logs_directory = os.path.join(logs_root, f"{name1}_vs_{name2}_seed{match.seed}")
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            players = [
+                LocalClient(name1, load_bot(match.bot1)),
+                LocalClient(name2, load_bot(match.bot2)),
+            ]
+            game = Game(
+                players,
+                seed=match.seed,
+                logs_directory=logs_directory,
+                publish=False,
+                duplicate=duplicate,
+                early_stop=early_stop,
+            )
+            game.run_match()
+        return MatchResult(*match, players[0].bankroll, players[1].bankroll, game.round_num, None)
+    except Exception as e:
+        return MatchResult(*match, 0, 0, 0, f"{type(e).__name__}: {e}")
+
+
+def _play_match(args: Tuple[Match, str, bool, bool]) -> MatchResult:
+    return play_match(*args)
+
+
+def run_tournament(
+    bots: List[str],
+    seeds: List[int],
+    processes: Optional[int] = None,
+    logs_root: str = "logs/tournament",
+    duplicate: bool = False,
+    early_stop: bool = False,
+) -> List[MatchResult]:
+    """
+    Plays every scheduled match across a process pool, printing each result as it finishes.
+
+    Args:
+        bots (List[str]): Paths of the bot files.
+        seeds (List[int]): Match seeds; every pair of bots plays once per seed.
+        processes (Optional[int]): Number of worker processes (default: one per core).
+        logs_root (str): Directory holding one log directory per match.
+        duplicate (bool): Whether every match is played in duplicate.
+        early_stop (bool): Whether matches may end early once their result is settled.
+
+    Returns:
+        List[MatchResult]: The results, in schedule order.
+    """
+    matches = schedule(bots, seeds)
+    results = []
+    # a fresh worker per match, so bots cannot leak module state into each other
+    with Pool(processes, maxtasksperchild=1) as pool:
+        for result in pool.imap(_play_match, [(match, logs_root, duplicate, early_stop) for match in matches]):
+            status = result.error or f"{result.bankroll1:+d} / {result.bankroll2:+d} in {result.rounds} rounds"
+            print(
+                f"[{len(results) + 1}/{len(matches)}] {bot_name(result.bot1)} vs "
+                f"{bot_name(result.bot2)} seed {result.seed}: {status}"
+            )
+            results.append(result)
+    return results
+
+
+def standings(results: List[MatchResult]) -> List[Dict]:
+    """
+    Aggregates match results per bot, sorted by total bankroll. Failed matches only
+    count towards "errors".
+    """
+    table: Dict[str, Dict] = {}
+    for result in results:
+        for bot, bankroll, opp_bankroll in (
+            (result.bot1, result.bankroll1, result.bankroll2),
+            (result.bot2, result.bankroll2, result.bankroll1),
+        ):
+            row = table.setdefault(
+                bot_name(bot),
+                {"bot": bot_name(bot), "matches": 0, "wins": 0, "losses": 0, "errors": 0, "bankroll": 0},
+            )
+            if result.error:
+                row["errors"] += 1
+                continue
+            row["matches"] += 1
+            row["wins"] += bankroll > opp_bankroll
+            row["losses"] += bankroll < opp_bankroll
+            row["bankroll"] += bankroll
+    for row in table.values():
+        row["mean_bankroll"] = row["bankroll"] / row["matches"] if row["matches"] else 0.0
+    return sorted(table.values(), key=lambda row: row["bankroll"], reverse=True)
+
+
+def print_standings(rows: List[Dict]) -> None:
+    print(f"\n{'bot':<20} {'matches':>7} {'wins':>5} {'losses':>6} {'errors':>6} {'bankroll':>10} {'mean':>10}")
+    for row in rows:
+        print(
+            f"{row['bot']:<20} {row['matches']:>7} {row['wins']:>5} {row['losses']:>6} "
+            f"{row['errors']:>6} {row['bankroll']:>10} {row['mean_bankroll']:>10.1f}"
+        )
+
+
+def write_results_csv(results: List[MatchResult], path: str) -> None:
+    with open(path, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(MatchResult._fields)
+        writer.writerows(results)
+
+
+def parse_args():
+    parser = ArgumentParser()
+    parser.add_argument("--bots", nargs="+", default=DEFAULT_BOTS, help="Bot files to enter")
+    parser.add_argument("--seeds", type=int, default=1, help="Matches per pair of bots")
+    parser.add_argument("--base-seed", type=int, default=0, help="Seed of the first match of each pair")
+    parser.add_argument("--processes", type=int, help="Worker processes (default: one per core)")
+    parser.add_argument("--logs-dir", default="logs/tournament", help="Where match logs are written")
+    parser.add_argument("--csv", help="Also write every match result to this file")
+    parser.add_argument(
+        "--duplicate", action="store_true", help="Play each deal twice with the seats swapped"
+    )
+    parser.add_argument(
+        "--early-stop", action="store_true", help="End each match once its result is settled"
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    seeds = list(range(args.base_seed, args.base_seed + args.seeds))
+    results = run_tournament(args.bots, seeds, args.processes, args.logs_dir, args.duplicate, args.early_stop)
+    print_standings(standings(results))
+    if args.csv:
+        write_results_csv(results, args.csv)
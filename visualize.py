@@ -1,5 +1,7 @@
 import streamlit as st
 import ast
+import glob
+import os
 from PIL import Image, ImageDraw, ImageFont
 
 
@@ -9,7 +11,9 @@ def renew_action_num():
 
 def use_default_logs():
     st.session_state.use_default_logs = True
-    with open("logs/engine_log.txt", "r") as log_file:
+    # the engine numbers its log when one already exists, so show the newest
+    log_path = max(glob.glob("logs/engine_log*.txt"), key=os.path.getmtime)
+    with open(log_path, "r") as log_file:
         # Split the logs by empty lines
         log = log_file.read().split("\n\n")
     st.session_state.uploaded_log = log